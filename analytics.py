@@ -0,0 +1,270 @@
+# analytics.py - Node-wide metric distributions with mergeable DDSketch quantile sketches
+import math
+import time
+import threading
+
+# Configuration
+RELATIVE_ACCURACY = 0.01       # quantiles are within 1% of the true value
+MAX_BINS = 2048                # per sign; the smallest-magnitude bins merge beyond this
+MIN_INDEXABLE = 1e-9           # magnitudes below this count as zero
+DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _parse_count(value):
+    if not _is_number(value) or not math.isfinite(value) or value < 0:
+        raise ValueError("counts must be non-negative numbers")
+    return value
+
+
+def _parse_bins(bins):
+    """Validated {bin index: count} from a to_dict() store"""
+    if not isinstance(bins, dict):
+        raise ValueError("bins must be an object")
+    if len(bins) > MAX_BINS:
+        raise ValueError(f"at most {MAX_BINS} bins per sign")
+    parsed = {}
+    for key, count in bins.items():
+        try:
+            index = int(key)
+        except (TypeError, ValueError):
+            raise ValueError(f"bin index {key!r} is not an integer") from None
+        parsed[index] = _parse_count(count)
+    return parsed
+
+
+class DDSketch:
+    """
+    Quantile sketch with relative-error guarantees (Masson et al., 2019).
+
+    Values fall into logarithmic bins: bin k holds magnitudes in
+    (gamma^(k-1), gamma^k] with gamma = (1 + a) / (1 - a), so any quantile
+    is returned within relative error a. Negative values and zero have
+    their own stores. Adding is O(1), and two sketches with the same
+    accuracy merge exactly by adding bin counts.
+    """
+
+    __slots__ = ("alpha", "gamma", "log_gamma", "positive", "negative", "zero", "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.alpha = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, magnitude):
+        return math.ceil(math.log(magnitude) / self.log_gamma)
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value, weight=1):
+        value = float(value)
+        if value > MIN_INDEXABLE:
+            store = self.positive
+        elif value < -MIN_INDEXABLE:
+            store = self.negative
+        else:
+            self.zero += weight
+            store = None
+        if store is not None:
+            key = self._key(abs(value))
+            store[key] = store.get(key, 0) + weight
+            if len(store) > MAX_BINS:
+                self._collapse(store)
+        self.count += weight
+        self.sum += value * weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self, store):
+        # Fold the smallest-magnitude bins together; values nearest zero lose accuracy
+        keys = sorted(store)
+        excess = keys[:len(keys) - MAX_BINS + 1]
+        store[excess[-1]] = sum(store.pop(key) for key in excess[:-1]) + store[excess[-1]]
+
+    def quantile(self, q):
+        """Value at quantile q in [0, 1] (None when empty)"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return max(self.min, -self._value(key))
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(self.max, self._value(key))
+        return self.max
+
+    def merge(self, other):
+        """Add another sketch's counts into this one"""
+        if other.alpha != self.alpha:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+            if len(mine) > MAX_BINS:
+                self._collapse(mine)
+        self.zero += other.zero
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self):
+        """Plain-data form, e.g. for merging sketches from other processes"""
+        return {
+            "alpha": self.alpha,
+            "positive": {str(k): v for k, v in self.positive.items()},
+            "negative": {str(k): v for k, v in self.negative.items()},
+            "zero": self.zero,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a sketch from to_dict() output, e.g. received from another process
+
+        Raises:
+            ValueError: If the data is not a consistent sketch
+        """
+        if not isinstance(data, dict):
+            raise ValueError("sketch must be an object")
+        alpha = data.get("alpha")
+        if not _is_number(alpha) or not 0 < alpha < 1:
+            raise ValueError("alpha must be between 0 and 1")
+        sketch = cls(alpha)
+        sketch.positive = _parse_bins(data.get("positive"))
+        sketch.negative = _parse_bins(data.get("negative"))
+        sketch.zero = _parse_count(data.get("zero"))
+        sketch.count = _parse_count(data.get("count"))
+        binned = sketch.zero + sum(sketch.positive.values()) + sum(sketch.negative.values())
+        if not math.isclose(sketch.count, binned, rel_tol=1e-9, abs_tol=1e-9):
+            raise ValueError("count does not match the bin counts")
+        if sketch.count:
+            for field in ("sum", "min", "max"):
+                if not _is_number(data.get(field)) or not math.isfinite(data[field]):
+                    raise ValueError(f"{field} must be a finite number")
+            sketch.sum, sketch.min, sketch.max = float(data["sum"]), float(data["min"]), float(data["max"])
+        return sketch
+
+    def copy(self):
+        sketch = DDSketch(self.alpha)
+        sketch.positive = dict(self.positive)
+        sketch.negative = dict(self.negative)
+        sketch.zero, sketch.count, sketch.sum = self.zero, self.count, self.sum
+        sketch.min, sketch.max = self.min, self.max
+        return sketch
+
+    def summary(self, quantiles=DEFAULT_QUANTILES):
+        result = {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = self.quantile(q)
+        return result
+
+
+class FleetAnalytics:
+    """
+    One DDSketch per metric (attention, engagement, sentiment, caption
+    latency, network stats) over every room on this node. Room handlers
+    call record(); readers get quantile summaries. Other workers' export()
+    is stored per worker id by merge(), replacing that worker's previous
+    export, and folded into the local sketches only when read, so pushing
+    the same export twice does not count it twice.
+    """
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.sketches = {}
+        self.remote = {}       # worker id -> {metric: DDSketch}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, metric, value):
+        with self._lock:
+            sketch = self.sketches.get(metric)
+            if sketch is None:
+                sketch = self.sketches[metric] = DDSketch(self.relative_accuracy)
+            sketch.add(value)
+
+    def _combined(self):
+        combined = {metric: sketch.copy() for metric, sketch in self.sketches.items()}
+        for sketches in self.remote.values():
+            for metric, sketch in sketches.items():
+                if metric in combined:
+                    combined[metric].merge(sketch)
+                else:
+                    combined[metric] = sketch.copy()
+        return combined
+
+    def metrics(self):
+        with self._lock:
+            return sorted(set(self.sketches).union(*self.remote.values()))
+
+    def summary(self, quantiles=DEFAULT_QUANTILES):
+        """Metric name -> count, mean, min, max and the requested quantiles, across all workers"""
+        with self._lock:
+            return {metric: sketch.summary(quantiles) for metric, sketch in self._combined().items()}
+
+    def export(self):
+        """This worker's own sketches (merged remote ones are not re-exported)"""
+        with self._lock:
+            return {metric: sketch.to_dict() for metric, sketch in self.sketches.items()}
+
+    def merge(self, worker_id, exported):
+        """
+        Store another worker's export(), replacing its previous one
+
+        Raises:
+            ValueError: If the worker id or any sketch is invalid; nothing is stored then
+        """
+        if not isinstance(worker_id, str) or not worker_id:
+            raise ValueError("worker id is required")
+        if not isinstance(exported, dict):
+            raise ValueError("sketches must be an object")
+        sketches = {}
+        for metric, data in exported.items():
+            sketch = DDSketch.from_dict(data)
+            if sketch.alpha != self.relative_accuracy:
+                raise ValueError(f"{metric}: relative accuracy {sketch.alpha} does not match {self.relative_accuracy}")
+            sketches[str(metric)] = sketch
+        with self._lock:
+            self.remote[worker_id] = sketches
+
+
+def parse_quantiles(value):
+    """Validate a quantiles= query value such as "0.5,0.95" (defaults when absent)"""
+    if not value:
+        return DEFAULT_QUANTILES
+    quantiles = tuple(float(part) for part in value.split(","))
+    if not all(0 <= q <= 1 for q in quantiles):
+        raise ValueError("quantiles must be between 0 and 1")
+    return quantiles
+
+
+# Process-wide instance shared by the server and the transcription worker
+fleet = FleetAnalytics()
@@ -0,0 +1,114 @@
+# attention_window.py - Fixed-size attention windows with running aggregates
+import math
+
+ATTENTION_WINDOW_SIZE = 20     # samples kept per participant
+RESUM_INTERVAL = 1000          # recompute running sums this often to shed float drift
+
+
+class AttentionWindow:
+    """
+    Last ATTENTION_WINDOW_SIZE attention samples of one participant.
+
+    A running sum and sum of squares are updated as samples enter and
+    leave, so the mean and variance are O(1) to read.
+    """
+
+    __slots__ = ("size", "samples", "next", "sum", "sum_sq", "updates")
+
+    def __init__(self, size=ATTENTION_WINDOW_SIZE):
+        self.size = size
+        self.samples = []
+        self.next = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.updates = 0
+
+    def add(self, score):
+        """Add a sample; returns (sum delta, sum of squares delta, count delta)"""
+        if len(self.samples) < self.size:
+            self.samples.append(score)
+            evicted, count_delta = 0.0, 1
+        else:
+            evicted = self.samples[self.next]
+            self.samples[self.next] = score
+            self.next = (self.next + 1) % self.size
+            count_delta = 0
+
+        old_sum, old_sum_sq = self.sum, self.sum_sq
+        self.updates += 1
+        if self.updates % RESUM_INTERVAL == 0:
+            self.sum = math.fsum(self.samples)
+            self.sum_sq = math.fsum(s * s for s in self.samples)
+        else:
+            self.sum += score - evicted
+            self.sum_sq += score * score - evicted * evicted
+        return self.sum - old_sum, self.sum_sq - old_sum_sq, count_delta
+
+    def __len__(self):
+        return len(self.samples)
+
+    @property
+    def mean(self):
+        return self.sum / len(self.samples) if self.samples else 0.0
+
+    @property
+    def variance(self):
+        if not self.samples:
+            return 0.0
+        mean = self.mean
+        return max(0.0, self.sum_sq / len(self.samples) - mean * mean)
+
+    def scores(self):
+        """Samples oldest first"""
+        return self.samples[self.next:] + self.samples[:self.next]
+
+
+class RoomAttention:
+    """
+    Attention windows for a room's participants plus room-wide totals over
+    every sample currently in any window, kept in step with each add.
+    """
+
+    def __init__(self, size=ATTENTION_WINDOW_SIZE):
+        self.size = size
+        self.windows = {}
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.count = 0
+
+    def add(self, sid, score):
+        """Record an attention sample; returns the participant's window"""
+        window = self.windows.get(sid)
+        if window is None:
+            window = self.windows[sid] = AttentionWindow(self.size)
+        sum_delta, sum_sq_delta, count_delta = window.add(float(score))
+        self.sum += sum_delta
+        self.sum_sq += sum_sq_delta
+        self.count += count_delta
+        return window
+
+    def remove(self, sid):
+        """Drop a departed participant's window from the room totals"""
+        window = self.windows.pop(sid, None)
+        if window is not None:
+            self.sum -= window.sum
+            self.sum_sq -= window.sum_sq
+            self.count -= len(window)
+            if not self.windows:
+                self.sum = self.sum_sq = 0.0
+
+    def mean(self, sid):
+        """A participant's average attention (0 without samples)"""
+        window = self.windows.get(sid)
+        return window.mean if window else 0.0
+
+    @property
+    def room_mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    @property
+    def room_variance(self):
+        if not self.count:
+            return 0.0
+        mean = self.room_mean
+        return max(0.0, self.sum_sq / self.count - mean * mean)
@@ -0,0 +1,204 @@
+# backend_clients.py - Long-lived pooled clients for remote transcription backends
+import io
+import os
+import json
+import time
+import wave
+import random
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+from voice_activity import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+MAX_IN_FLIGHT = int(os.environ.get("TRANSCRIPTION_MAX_IN_FLIGHT", 4))  # per backend
+MAX_RETRIES = int(os.environ.get("TRANSCRIPTION_MAX_RETRIES", 3))
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_CAP_SECONDS = 4.0
+REQUEST_TIMEOUT = 30
+
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL")
+GOOGLE_SPEECH_URL = os.environ.get("GOOGLE_SPEECH_URL", "https://www.google.com/speech-api/v2/recognize")
+GOOGLE_SPEECH_KEY = os.environ.get("GOOGLE_SPEECH_KEY")  # the Google backend is unavailable without it
+GOOGLE_SPEECH_LANGUAGE = os.environ.get("GOOGLE_SPEECH_LANGUAGE", "en-US")
+
+
+class RetryableError(Exception):
+    """A transient backend failure worth retrying (timeouts, 429, 5xx)"""
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE_SECONDS, cap=BACKOFF_CAP_SECONDS):
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def pcm_to_wav(pcm, sample_rate=SAMPLE_RATE):
+    """Wrap raw 16-bit mono PCM in a WAV container (already-wrapped audio passes through)"""
+    if pcm[:4] == b"RIFF":
+        return pcm
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buf.getvalue()
+
+
+class BackendClient:
+    """
+    Base class for a remote backend: bounded concurrency plus jittered retries.
+
+    Subclasses keep their connection pool on the instance, and a single
+    instance per backend is shared by every room worker.
+    """
+
+    name = "base"
+
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, max_retries=MAX_RETRIES):
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "in_flight": 0}
+
+    def transcribe(self, audio_data):
+        """Transcribe one segment, retrying transient failures"""
+        with self._slots:
+            self._count("in_flight", 1)
+            try:
+                for attempt in range(self.max_retries + 1):
+                    self._count("requests", 1)
+                    try:
+                        return self._transcribe(audio_data)
+                    except RetryableError as e:
+                        if attempt == self.max_retries:
+                            self._count("failures", 1)
+                            raise
+                        self._count("retries", 1)
+                        delay = backoff_delay(attempt)
+                        logger.warning(f"{self.name} request failed ({e}), retrying in {delay:.2f}s")
+                        time.sleep(delay)
+                    except Exception:
+                        self._count("failures", 1)
+                        raise
+            finally:
+                self._count("in_flight", -1)
+
+    def _transcribe(self, audio_data):
+        raise NotImplementedError
+
+    def _count(self, key, delta):
+        with self._lock:
+            self.stats[key] += delta
+
+
+class OpenAIClient(BackendClient):
+    """Whisper API through one shared openai.OpenAI client (and its HTTP pool)"""
+
+    name = "openai"
+
+    def __init__(self, api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, model="whisper-1", **kwargs):
+        super().__init__(**kwargs)
+        # Retries are handled here so they share the concurrency budget
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url,
+                                    max_retries=0, timeout=REQUEST_TIMEOUT)
+        self.model = model
+
+    def _transcribe(self, audio_data):
+        try:
+            transcript = self.client.audio.transcriptions.create(
+                model=self.model,
+                file=("audio.wav", pcm_to_wav(audio_data)),
+                response_format="text"
+            )
+        except (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError) as e:
+            raise RetryableError(str(e)) from e
+        return transcript.strip() if transcript else None
+
+
+class GoogleSpeechClient(BackendClient):
+    """
+    Google web speech API (the endpoint behind speech_recognition.recognize_google)
+    over a keep-alive requests.Session. Raw PCM is sent as audio/l16, so no
+    per-call FLAC encoding is needed.
+    """
+
+    name = "speech_recognition"
+
+    def __init__(self, url=GOOGLE_SPEECH_URL, key=GOOGLE_SPEECH_KEY,
+                 language=GOOGLE_SPEECH_LANGUAGE, sample_rate=SAMPLE_RATE, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.params = {"client": "chromium", "lang": language, "key": key}
+        self.sample_rate = sample_rate
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _transcribe(self, audio_data):
+        try:
+            response = self.session.post(
+                self.url,
+                params=self.params,
+                data=audio_data,
+                headers={"Content-Type": f"audio/l16; rate={self.sample_rate}"},
+                timeout=REQUEST_TIMEOUT
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise RetryableError(str(e)) from e
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RetryableError(f"HTTP {response.status_code}")
+        response.raise_for_status()
+        return self._parse(response.text)
+
+    @staticmethod
+    def _parse(body):
+        """The response is one JSON object per line; the first is usually an empty result"""
+        for line in body.split("\n"):
+            if not line.strip():
+                continue
+            results = json.loads(line).get("result", [])
+            for result in results:
+                alternatives = result.get("alternative", [])
+                if alternatives and alternatives[0].get("transcript"):
+                    return alternatives[0]["transcript"].strip()
+        return None
+
+
+_CLIENT_FACTORIES = {
+    "openai": OpenAIClient,
+    "speech_recognition": GoogleSpeechClient
+}
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_backend_client(name):
+    """Return the process-wide client for a backend, creating it on first use"""
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = _CLIENT_FACTORIES[name]()
+    return client
+
+
+def get_backend_client_stats():
+    """Request counters for every client created so far"""
+    return {name: dict(client.stats) for name, client in _clients.items()}
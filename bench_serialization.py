@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark Socket.IO packet serialization: JSON text packets vs msgpack
+
+Encodes and decodes the packets of the hottest event paths (signaling and
+telemetry) in both wire formats and reports the size and the time per
+packet. JSON uses the configured serialization backend (JSON_BACKEND).
+
+Usage: python bench_serialization.py [--iterations N]
+"""
+
+import argparse
+import time
+
+from socketio import packet
+
+import serialization
+from msgpack_packets import HybridPacket, MSGPACK_AVAILABLE
+
+
+def sample_sdp():
+    """An SDP offer shaped like a browser's: one audio and one video section"""
+    lines = ["v=0", "o=- 4611731400430051336 2 IN IP4 127.0.0.1", "s=-", "t=0 0",
+             "a=group:BUNDLE 0 1", "a=extmap-allow-mixed", "a=msid-semantic: WMS stream"]
+    for mid, kind, codecs in ((0, "audio", (111, 63, 9, 0, 8, 13, 110, 126)),
+                              (1, "video", (96, 97, 98, 99, 100, 101, 102, 103, 104, 105, 106, 107))):
+        lines += [f"m={kind} 9 UDP/TLS/RTP/SAVPF {' '.join(map(str, codecs))}", "c=IN IP4 0.0.0.0",
+                  "a=rtcp:9 IN IP4 0.0.0.0", "a=ice-ufrag:8hhY", "a=ice-pwd:asd88fgpdd777uzjYhagZg",
+                  "a=ice-options:trickle",
+                  "a=fingerprint:sha-256 7B:8B:F0:65:5F:78:E2:51:3B:AC:6F:F3:3F:46:1B:35:DC:B8:5F:64:1A:24:C2:43:F0:A1:58:D0:A1:2C:19:08",
+                  "a=setup:actpass", f"a=mid:{mid}", "a=sendrecv", "a=rtcp-mux", "a=rtcp-rsize"]
+        for pt in codecs:
+            lines += [f"a=rtpmap:{pt} {'opus/48000/2' if kind == 'audio' else 'VP8/90000'}",
+                      f"a=rtcp-fb:{pt} transport-cc", f"a=fmtp:{pt} minptime=10;useinbandfec=1"]
+        lines += [f"a=ssrc:{1000 + mid} cname:4TOk42mSjXCkVIa6", f"a=ssrc:{1000 + mid} msid:stream track{mid}"]
+    return "\r\n".join(lines) + "\r\n"
+
+
+def sample_events():
+    sdp = {"type": "offer", "sdp": sample_sdp()}
+    candidate = {"candidate": "candidate:842163049 1 udp 1677729535 203.0.113.7 46154 typ srflx "
+                              "raddr 10.0.0.12 rport 46154 generation 0 ufrag 8hhY network-cost 999",
+                 "sdpMid": "0", "sdpMLineIndex": 0}
+    return {
+        "offer": ["offer", {"to": "zXv2b9q1LmYtQ7pAAAAB", "sdp": sdp}],
+        "ice-candidate": ["ice-candidate", {"to": "zXv2b9q1LmYtQ7pAAAAB", "candidate": candidate}],
+        "attention": ["attention", {"room": "standup", "score": 0.8734}],
+        "network-stats": ["network-stats", {"room": "standup",
+                                            "stats": {"rtt": 48.5, "packet_loss": 0.012, "bandwidth": 1850}}],
+        "room-updates": ["room-updates", {"updates": [
+            {"event": "attention-update", "data": {"sid": f"participant-{i:02d}", "score": 0.5 + i / 40}}
+            for i in range(12)]}]
+    }
+
+
+def measure(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bench(name, data, iterations):
+    pkt = HybridPacket(packet.EVENT, data=data, namespace="/")
+    text = pkt.encode()
+    binary = pkt.encode_msgpack()
+    return {
+        "event": name,
+        "json_bytes": len(text.encode("utf-8")),
+        "msgpack_bytes": len(binary),
+        "json_encode_us": measure(pkt.encode, iterations),
+        "msgpack_encode_us": measure(pkt.encode_msgpack, iterations),
+        "json_decode_us": measure(lambda: HybridPacket(encoded_packet=text), iterations),
+        "msgpack_decode_us": measure(lambda: HybridPacket(encoded_packet=binary), iterations)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    if not MSGPACK_AVAILABLE:
+        raise SystemExit("msgpack is not installed (pip install msgpack)")
+    HybridPacket.json = serialization
+
+    print(f"JSON backend: {serialization.JSON_BACKEND}, {args.iterations} iterations per measurement\n")
+    header = f"{'event':<15}{'json B':>9}{'msgpack B':>11}{'size':>7}{'enc json':>10}{'enc mp':>9}{'dec json':>10}{'dec mp':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, data in sample_events().items():
+        r = bench(name, data, args.iterations)
+        print(f"{name:<15}{r['json_bytes']:>9}{r['msgpack_bytes']:>11}{r['msgpack_bytes'] / r['json_bytes']:>7.0%}"
+              f"{r['json_encode_us']:>10.2f}{r['msgpack_encode_us']:>9.2f}"
+              f"{r['json_decode_us']:>10.2f}{r['msgpack_decode_us']:>9.2f}")
+    print("\nTimes are microseconds per packet; size is msgpack relative to JSON.")
+
+
+if __name__ == "__main__":
+    main()
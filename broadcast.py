@@ -0,0 +1,117 @@
+# broadcast.py - Coalesced per-room broadcasts for high-rate, last-value-wins events
+import os
+import time
+import logging
+import threading
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+BROADCAST_INTERVAL = int(os.environ.get("BROADCAST_INTERVAL_MS", 1000)) / 1000
+ACK_TIMEOUT_SECONDS = 10   # resend to a client whose last batch was never acknowledged
+BATCH_EVENT = "room-updates"
+
+
+class RoomBroadcaster:
+    """
+    Buffers events such as attention updates and flushes them once per tick.
+
+    Events are keyed (event name, key) and the latest payload wins, so a
+    room sends at most one value per key per tick however often clients
+    report. Each client has an outbound queue with the same last-value-wins
+    rule. A client gets a new batch only after acknowledging the previous
+    one. Until then its queue keeps coalescing, so a slow consumer receives
+    fewer, fresher values instead of a growing backlog.
+    """
+
+    def __init__(self, socketio, members, interval=BROADCAST_INTERVAL):
+        """
+        Args:
+            socketio: Flask-SocketIO server
+            members: Callable returning the sids currently in a room
+            interval: Seconds between flushes
+        """
+        self.socketio = socketio
+        self.members = members
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._dirty = {}    # room -> {(event, key): (payload, exclude_sid)}
+        self._queues = {}   # sid -> {"pending": {(room, event, key): payload}, "sent_at": ts or None}
+        self._started = False
+        self.stats = {"published": 0, "batches": 0, "delivered": 0, "superseded": 0}
+
+    def publish(self, room, event, key, payload, exclude=None):
+        """Buffer an event for the room; a later payload with the same key replaces it"""
+        with self._lock:
+            updates = self._dirty.setdefault(room, {})
+            if (event, key) in updates:
+                self.stats["superseded"] += 1
+            updates[(event, key)] = (payload, exclude)
+            self.stats["published"] += 1
+            if not self._started:
+                self._started = True
+                self.socketio.start_background_task(self._run)
+
+    def forget(self, sid):
+        """Drop a disconnected client's queue"""
+        with self._lock:
+            self._queues.pop(sid, None)
+
+    def leave(self, room, sid):
+        """Drop a client's queued updates for a room it left (it stays connected)"""
+        with self._lock:
+            queue = self._queues.get(sid)
+            if queue is not None:
+                for key in [key for key in queue["pending"] if key[0] == room]:
+                    del queue["pending"][key]
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Broadcast flush error: {e}")
+
+    def flush(self, now=None):
+        """Move buffered room events into client queues and send what clients can take"""
+        now = time.time() if now is None else now
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            for room, updates in dirty.items():
+                for sid in list(self.members(room)):
+                    pending = self._queues.setdefault(sid, {"pending": {}, "sent_at": None})["pending"]
+                    for (event, key), (payload, exclude) in updates.items():
+                        if sid == exclude:
+                            continue
+                        if (room, event, key) in pending:
+                            self.stats["superseded"] += 1
+                        pending[(room, event, key)] = payload
+
+            ready = []
+            for sid, queue in self._queues.items():
+                if not queue["pending"]:
+                    continue
+                if queue["sent_at"] is not None and now - queue["sent_at"] < ACK_TIMEOUT_SECONDS:
+                    continue  # still waiting for the previous batch to be acknowledged
+                ready.append((sid, queue["pending"]))
+                self.stats["batches"] += 1
+                self.stats["delivered"] += len(queue["pending"])
+                queue["pending"] = {}
+                queue["sent_at"] = now
+
+        for sid, pending in ready:
+            updates = [{"event": event, "data": payload} for (_, event, _), payload in pending.items()]
+            self.socketio.emit(BATCH_EVENT, {"updates": updates}, to=sid, callback=partial(self._acked, sid))
+
+    def _acked(self, sid, *args):
+        with self._lock:
+            queue = self._queues.get(sid)
+            if queue is not None:
+                queue["sent_at"] = None
+
+    def get_stats(self):
+        with self._lock:
+            backlog = sum(len(queue["pending"]) for queue in self._queues.values())
+            return dict(self.stats, clients=len(self._queues), backlog=backlog, interval=self.interval)
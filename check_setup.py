@@ -3,6 +3,7 @@
 Setup checker for AgamAI Meeting Platform
 """
 
+import os
 import sys
 import importlib
 
@@ -25,13 +26,14 @@ def main():
         ("flask", "Web framework"),
         ("flask_socketio", "Real-time communication"),
         ("eventlet", "Async server"),
+        ("numpy", "Voice activity detection"),
         ("google.generativeai", "Gemini AI for summarization"),
     ]
     
     # Check optional dependencies
     optional_deps = [
         ("openai", "OpenAI API for advanced transcription"),
-        ("speech_recognition", "Speech recognition library"),
+        ("transformers", "Local CPU transcription engine"),
         ("opencv", "Computer vision for attention detection"),
         ("mediapipe", "Face detection and analysis"),
     ]
@@ -45,6 +47,13 @@ def main():
     print("\n📦 Optional Dependencies:")
     for module, desc in optional_deps:
         check_import(module, desc)
+
+    print("\n🔑 Transcription Keys:")
+    for var, desc in (("OPENAI_API_KEY", "OpenAI Whisper backend"),
+                      ("GOOGLE_SPEECH_KEY", "Google web speech backend (no longer has a built-in key)")):
+        print(f"{'✅' if os.environ.get(var) else '⚠️ '} {var} - {desc}")
+    if not (os.environ.get("OPENAI_API_KEY") or os.environ.get("GOOGLE_SPEECH_KEY")):
+        print("💡 Without a key live captions use the mock backend (or set TRANSCRIPTION_BACKEND=local)")
     
     print("\n🔧 Custom Modules:")
     custom_modules = [
@@ -53,6 +62,29 @@ def main():
         ("engagement", "Participant engagement tracking"),
         ("sentiment_analysis", "Sentiment analysis"),
         ("network_adaptation", "Network quality adaptation"),
+        ("voice_activity", "Voice activity detection"),
+        ("uploader_election", "Audio uploader election"),
+        ("backend_clients", "Transcription backend clients"),
+        ("transcription_backends", "Transcription backend registry"),
+        ("meeting_archive", "Meeting archive"),
+        ("meeting_recorder", "Meeting recording"),
+        ("sentiment_engine", "Sentiment scoring engine"),
+        ("lexicons", "Sentiment lexicon packs"),
+        ("sentiment_history", "Sentiment history buffer"),
+        ("timeseries", "Metric history store"),
+        ("downsampling", "Chart downsampling"),
+        ("attention_window", "Attention windows"),
+        ("broadcast", "Room broadcast ticker"),
+        ("participant_store", "Columnar participant store"),
+        ("nudge_scheduler", "Nudge timer wheel"),
+        ("engagement_log", "Engagement event log"),
+        ("transcript_stats", "Transcript statistics"),
+        ("transcript_search", "Transcript search index"),
+        ("transcript_export", "Transcript export"),
+        ("analytics", "Fleet analytics"),
+        ("records", "Participant and transcript records"),
+        ("serialization", "JSON serialization"),
+        ("msgpack_packets", "msgpack Socket.IO packets"),
     ]
     
     for module, desc in custom_modules:
@@ -0,0 +1,78 @@
+# downsampling.py - Largest-Triangle-Three-Buckets downsampling for chart series
+import numpy as np
+
+MAX_POINTS = 2000  # upper bound for a client-requested points= target
+
+
+def lttb_indices(x, y, points):
+    """
+    Indices of the points kept by LTTB
+
+    The first and last points are always kept; every bucket in between
+    keeps the point forming the largest triangle with the previously kept
+    point and the average of the next bucket. One Python step per output
+    point, NumPy within each bucket.
+
+    Args:
+        x: Sequence of x values (e.g. timestamps), ascending
+        y: Sequence of y values
+        points: Target number of points
+
+    Returns:
+        NumPy array of indices into x/y, ascending
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    # Bucket edges for the n - 2 interior points
+    edges = (np.arange(points - 1) * (n - 2) / (points - 2)).astype(np.intp) + 1
+    edges[-1] = n - 1
+
+    kept = np.empty(points, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < points - 1 else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        kept[i + 1] = a
+    return kept
+
+
+def downsample_columns(columns, x_key, y_key, points):
+    """
+    Downsample a columnar series, keeping every column aligned
+
+    Args:
+        columns: Dictionary of equal-length lists (other values pass through)
+        x_key, y_key: Columns the triangles are measured on
+        points: Target number of points
+
+    Returns:
+        New dictionary with every list column reduced to the kept points
+    """
+    length = len(columns[x_key])
+    if points >= length:
+        return dict(columns)
+    kept = lttb_indices(columns[x_key], columns[y_key], points)
+    return {
+        key: [value[i] for i in kept] if isinstance(value, list) and len(value) == length else value
+        for key, value in columns.items()
+    }
+
+
+def parse_points(value):
+    """Validate a points= query value (None when absent)"""
+    if value is None:
+        return None
+    points = int(value)
+    if points < 3:
+        raise ValueError("points must be at least 3")
+    return min(points, MAX_POINTS)
@@ -2,6 +2,8 @@
 import time
 from collections import defaultdict
 
+from engagement_log import EngagementLog, engagement_score
+
 def update_engagement(room_data, participant_id, activity_type, value=None):
     """
     Update engagement metrics for a participant
@@ -21,22 +23,14 @@ def update_engagement(room_data, participant_id, activity_type, value=None):
     # Update last activity time
     participant["last_activity"] = current_time
     
-    # Update engagement based on activity type
+    # Engagement is scored from the event log when read
+    log = participant.get("engagement")
+    if log is None:
+        log = participant["engagement"] = EngagementLog()
+    log.add(activity_type, current_time, value)
+    
     if activity_type == "speaking":
-        # Increase engagement for speaking
-        words_count = value or 1
-        engagement_boost = min(0.1, words_count / 50)
-        participant["engagement_score"] = min(1.0, participant["engagement_score"] + engagement_boost)
-        participant["speaking_time"] += words_count * 0.5  # Estimate speaking time
-        
-    elif activity_type == "attention":
-        # Update engagement based on attention score
-        attention_score = value or 0.5
-        participant["engagement_score"] = (participant["engagement_score"] * 0.8) + (attention_score * 0.2)
-        
-    elif activity_type == "interaction":
-        # Boost engagement for interactions (reactions, chat, etc.)
-        participant["engagement_score"] = min(1.0, participant["engagement_score"] + 0.05)
+        participant["speaking_time"] += (value or 1) * 0.5  # Estimate speaking time
 
 def get_room_leaderboard(room_data):
     """
@@ -49,15 +43,15 @@ def get_room_leaderboard(room_data):
         List of participants sorted by engagement score
     """
     participants = []
+    now = time.time()
     
     for sid, participant_data in room_data["participants"].items():
-        attention_scores = room_data["attention_scores"].get(sid, [])
-        avg_attention = sum(attention_scores) / len(attention_scores) if attention_scores else 0
+        avg_attention = room_data["attention"].mean(sid)
         
         participants.append({
             "sid": sid,
             "name": participant_data.get("name", f"User {sid[:8]}"),
-            "engagement_score": participant_data.get("engagement_score", 0.5),
+            "engagement_score": engagement_score(participant_data, now),
             "speaking_time": participant_data.get("speaking_time", 0),
             "avg_attention": avg_attention,
             "last_activity": participant_data.get("last_activity", time.time())
@@ -123,11 +117,11 @@ def should_nudge_participant(room_data, participant_id, threshold_minutes=5):
     participant = room_data["participants"][participant_id]
     current_time = time.time()
     last_activity = participant.get("last_activity", current_time)
-    engagement_score = participant.get("engagement_score", 0.5)
+    score = engagement_score(participant, current_time)
     
     # Nudge if inactive for more than threshold and low engagement
     inactive_time = current_time - last_activity
-    return (inactive_time > threshold_minutes * 60) and engagement_score < 0.3
+    return (inactive_time > threshold_minutes * 60) and score < 0.3
 
 def calculate_meeting_insights(room_data):
     """
@@ -153,16 +147,12 @@ def calculate_meeting_insights(room_data):
         }
     
     # Calculate averages
-    engagement_scores = [p.get("engagement_score", 0.5) for p in participants.values()]
+    now = time.time()
+    engagement_scores = [engagement_score(p, now) for p in participants.values()]
     avg_engagement = sum(engagement_scores) / len(engagement_scores)
     
-    attention_scores = []
-    for sid in participants.keys():
-        scores = room_data["attention_scores"].get(sid, [])
-        if scores:
-            attention_scores.extend(scores)
-    
-    avg_attention = sum(attention_scores) / len(attention_scores) if attention_scores else 0
+    # Maintained incrementally over every participant's attention window
+    avg_attention = room_data["attention"].room_mean
     
     # Find most and least engaged
     leaderboard = get_room_leaderboard(room_data)
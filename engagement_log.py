@@ -0,0 +1,120 @@
+# engagement_log.py - Per-participant engagement events with a time-decayed score
+import math
+import time
+from collections import deque
+
+# Configuration
+ENGAGEMENT_DECAY_SECONDS = 300   # time constant: an event's weight falls to 1/e after this long
+PRIOR_WEIGHT = 5.0               # weight of the baseline, in attention-sample equivalents
+DEFAULT_BASELINE = 0.5           # score of a participant without recent activity
+EVENT_LOG_SIZE = 256             # recent events kept per participant
+SCORE_QUANTUM = 1.0              # cached scores are reused within this many seconds
+
+# Event type -> weight per unit; attention weighs one per sample, speaking one
+# per word (capped per utterance), interactions count like ten samples
+EVENT_WEIGHTS = {"attention": 1.0, "speaking": 1.0, "interaction": 10.0}
+MAX_SPEAKING_WEIGHT = 50.0
+EVENT_TYPES = tuple(EVENT_WEIGHTS)
+
+
+def event_weight(activity, value=None):
+    """
+    Weight and value an event contributes to the score
+
+    Args:
+        activity: Type of activity ('speaking', 'attention', 'interaction')
+        value: Attention score for 'attention', word count for 'speaking'
+
+    Returns:
+        Tuple of (weight, value in [0, 1])
+    """
+    if activity == "attention":
+        value = 0.5 if value is None else min(1.0, max(0.0, float(value)))
+        return EVENT_WEIGHTS["attention"], value
+    if activity == "speaking":
+        words = 1 if value is None else value
+        return min(MAX_SPEAKING_WEIGHT, EVENT_WEIGHTS["speaking"] * words), 1.0
+    if activity == "interaction":
+        return EVENT_WEIGHTS["interaction"], 1.0
+    raise ValueError(f"Unknown activity type: {activity}")
+
+
+class EngagementLog:
+    """
+    A participant's engagement events and their exponentially decayed score.
+
+    Every event (type, ts, value) carries a weight w and a value v in [0, 1].
+    The score at time t is the decayed weighted mean of all events, pulled
+    towards the baseline by PRIOR_WEIGHT:
+
+        score(t) = (sum w*v*d + P*baseline) / (sum w*d + P),  d = exp(-(t - ts) / tau)
+
+    Both sums are kept decayed to the newest event's time, so adding an
+    event is O(1) and the result does not depend on the order events
+    arrive in. Without recent activity the score returns to the baseline.
+    Scores are evaluated on read and cached per (version, time quantum).
+    """
+
+    __slots__ = ("baseline", "events", "version", "weighted", "weight", "ref_ts", "_cache_key", "_cache")
+
+    def __init__(self, baseline=DEFAULT_BASELINE, size=EVENT_LOG_SIZE):
+        self.baseline = baseline
+        self.events = deque(maxlen=size)   # (type index, ts, value)
+        self.version = 0
+        self.weighted = 0.0                # sum of w*v decayed to ref_ts
+        self.weight = 0.0                  # sum of w decayed to ref_ts
+        self.ref_ts = None
+        self._cache_key = None
+        self._cache = baseline
+
+    def __len__(self):
+        return len(self.events)
+
+    def add(self, activity, ts=None, value=None):
+        """Append an event; returns the new version"""
+        ts = time.time() if ts is None else ts
+        weight, value = event_weight(activity, value)
+        self.events.append((EVENT_TYPES.index(activity), ts, value))
+
+        if self.ref_ts is None or ts >= self.ref_ts:
+            if self.ref_ts is not None:
+                decay = math.exp(-(ts - self.ref_ts) / ENGAGEMENT_DECAY_SECONDS)
+                self.weighted *= decay
+                self.weight *= decay
+            self.ref_ts = ts
+        else:
+            # Late event: decay it to the reference time instead
+            weight *= math.exp(-(self.ref_ts - ts) / ENGAGEMENT_DECAY_SECONDS)
+        self.weighted += weight * value
+        self.weight += weight
+        self.version += 1
+        return self.version
+
+    def score(self, now=None):
+        """Engagement score in [0, 1] at time now"""
+        now = time.time() if now is None else now
+        key = (self.version, int(now // SCORE_QUANTUM))
+        if key != self._cache_key:
+            self._cache_key = key
+            self._cache = self._evaluate(now)
+        return self._cache
+
+    def _evaluate(self, now):
+        if self.ref_ts is None:
+            return self.baseline
+        decay = math.exp(-max(0.0, now - self.ref_ts) / ENGAGEMENT_DECAY_SECONDS)
+        return ((self.weighted * decay + PRIOR_WEIGHT * self.baseline)
+                / (self.weight * decay + PRIOR_WEIGHT))
+
+    def recent(self, limit=None):
+        """Logged events oldest first as dictionaries"""
+        events = list(self.events)[-limit:] if limit else self.events
+        return [{"type": EVENT_TYPES[kind], "ts": ts, "value": value} for kind, ts, value in events]
+
+
+def engagement_score(participant, now=None):
+    """A participant's current engagement score (0.5 without an event log)"""
+    log = participant.get("engagement")
+    if log is None:
+        return DEFAULT_BASELINE
+    return log.score(now)
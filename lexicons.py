@@ -0,0 +1,40 @@
+# lexicons.py - Sentiment lexicon packs stored as JSON data files
+import os
+import json
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# One file per language: data/lexicons/<language>.json with "sentiment"
+# (word or phrase -> signed weight), "intensifiers" (-> multiplier) and "negations"
+LEXICON_DIR = os.environ.get(
+    "LEXICON_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "lexicons"))
+DEFAULT_LANGUAGE = os.environ.get("SENTIMENT_LANGUAGE", "en")
+
+
+def available_languages():
+    """Languages with a lexicon pack"""
+    if not os.path.isdir(LEXICON_DIR):
+        return []
+    return sorted(name[:-5] for name in os.listdir(LEXICON_DIR) if name.endswith(".json"))
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(language=DEFAULT_LANGUAGE):
+    """
+    Load a language's lexicon pack (cached; treat the result as read-only)
+
+    Args:
+        language: Language code, e.g. "en"
+
+    Returns:
+        Dictionary with "sentiment", "intensifiers" and "negations"
+    """
+    path = os.path.join(LEXICON_DIR, f"{language}.json")
+    with open(path, encoding="utf-8") as f:
+        lexicon = json.load(f)
+    lexicon.setdefault("intensifiers", {})
+    lexicon.setdefault("negations", [])
+    logger.info(f"Loaded {language} lexicon: {len(lexicon['sentiment'])} sentiment entries")
+    return lexicon
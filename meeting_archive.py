@@ -0,0 +1,159 @@
+# meeting_archive.py - On-disk archive of finished meetings
+import os
+import re
+import json
+import time
+import logging
+import tempfile
+
+from records import as_dict
+
+logger = logging.getLogger(__name__)
+
+# Layout: ARCHIVE_DIR/<meeting_id>/meta.json, transcript.ndjson (one entry per line)
+# and metrics.json (metric history, when the room kept one)
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", "archive")
+
+
+def meeting_id_for(room, meeting_start):
+    """Filesystem-safe id for one meeting in a room"""
+    safe_room = re.sub(r"[^A-Za-z0-9_-]", "_", room)[:64] or "room"
+    return f"{safe_room}-{int(meeting_start)}"
+
+
+def meeting_path(meeting_id, *parts):
+    """Path inside a meeting's archive directory"""
+    if not re.fullmatch(r"[A-Za-z0-9_-]+", meeting_id):
+        raise ValueError(f"Invalid meeting id: {meeting_id!r}")
+    return os.path.join(ARCHIVE_DIR, meeting_id, *parts)
+
+
+def _write_atomic(path, write):
+    """Write via a temp file in the same directory so readers never see partial files"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def _write_transcript(meeting_id, entries):
+    def write(f):
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False, default=as_dict))
+            f.write("\n")
+    _write_atomic(meeting_path(meeting_id, "transcript.ndjson"), write)
+
+
+def participant_names(data, entries):
+    """Speaker names by sid; participants have usually left by the time a meeting is archived"""
+    names = {e["sid"]: e["speaker"] for e in entries if e.get("sid") and e.get("speaker")}
+    names.update({sid: p.get("name", f"User {sid[:8]}") for sid, p in data["participants"].items()})
+    return names
+
+
+def archive_meeting(room, data, extra_entries=()):
+    """
+    Write a finished meeting to the archive
+
+    Args:
+        room: Room name
+        data: Room data dictionary
+        extra_entries: Additional transcript entries (e.g. server-side transcription)
+
+    Returns:
+        The meeting id
+    """
+    meeting_id = meeting_id_for(room, data["meeting_start"])
+    entries = sorted(list(data["transcript"]) + list(extra_entries), key=lambda e: e.get("ts", 0))
+    meta = {
+        "meeting_id": meeting_id,
+        "room": room,
+        "meeting_start": data["meeting_start"],
+        "ended_at": time.time(),
+        "participants": participant_names(data, entries),
+        "transcript_entries": len(entries),
+        "transcript_source": "live"
+    }
+    _write_transcript(meeting_id, entries)
+    if data.get("metrics") is not None:
+        metrics = data["metrics"].export()
+        _write_atomic(meeting_path(meeting_id, "metrics.json"), lambda f: json.dump(metrics, f))
+    _write_atomic(meeting_path(meeting_id, "meta.json"), lambda f: json.dump(meta, f))
+    logger.info(f"Archived meeting {meeting_id} ({len(entries)} transcript entries)")
+    return meeting_id
+
+
+def load_meeting_meta(meeting_id):
+    """Return a meeting's metadata, or None if it is not archived"""
+    try:
+        with open(meeting_path(meeting_id, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def load_meeting_metrics(meeting_id):
+    """Return a meeting's archived metric history, or None"""
+    try:
+        with open(meeting_path(meeting_id, "metrics.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def update_meeting_meta(meeting_id, **fields):
+    """Merge fields into a meeting's metadata"""
+    meta = load_meeting_meta(meeting_id) or {"meeting_id": meeting_id}
+    meta.update(fields)
+    _write_atomic(meeting_path(meeting_id, "meta.json"), lambda f: json.dump(meta, f))
+    return meta
+
+
+def iter_transcript(meeting_id):
+    """Yield archived transcript entries one at a time"""
+    try:
+        with open(meeting_path(meeting_id, "transcript.ndjson"), encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    except FileNotFoundError:
+        return
+
+
+def replace_transcript(meeting_id, entries, source):
+    """
+    Swap in a new transcript for an archived meeting (e.g. a batch re-transcription)
+
+    Args:
+        meeting_id: Archived meeting id
+        entries: Iterable of transcript entries, in time order
+        source: Label recorded as the meta's transcript_source
+    """
+    entries = list(entries)
+    _write_transcript(meeting_id, entries)
+    update_meeting_meta(meeting_id, transcript_entries=len(entries), transcript_source=source,
+                        transcript_updated_at=time.time())
+    logger.info(f"Replaced transcript for {meeting_id} with {len(entries)} {source} entries")
+
+
+def list_meetings():
+    """Ids of all archived meetings, oldest first"""
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    ids = [name for name in os.listdir(ARCHIVE_DIR)
+           if os.path.isfile(os.path.join(ARCHIVE_DIR, name, "meta.json"))]
+    return sorted(ids, key=lambda name: int(name.rsplit("-", 1)[-1]) if name.rsplit("-", 1)[-1].isdigit() else 0)
+
+
+def latest_meeting(room):
+    """Id of a room's most recently started archived meeting (None if there is none)"""
+    prefix = meeting_id_for(room, 0)[:-1]
+    ids = [meeting_id for meeting_id in list_meetings()
+           if meeting_id.startswith(prefix) and meeting_id[len(prefix):].isdigit()]
+    return ids[-1] if ids else None
@@ -0,0 +1,299 @@
+# meeting_recorder.py - Opt-in meeting audio recording and deferred batch transcription
+import os
+import re
+import sys
+import json
+import bisect
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from voice_activity import SpeechSegmenter, SAMPLE_RATE
+from transcription_backends import available_backends, get_backend, select_backend_name
+from meeting_archive import iter_transcript, load_meeting_meta, replace_transcript
+from transcript_search import get_index as get_search_index
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RECORDINGS_DIR = os.environ.get("RECORDINGS_DIR", "recordings")
+RECORD_MEETINGS = os.environ.get("RECORD_MEETINGS", "").lower() in ("1", "true", "yes")
+RECORDING_CHUNK_SECONDS = 60          # audio per chunk file
+BATCH_WINDOW_SECONDS = 30             # larger windows than live (VAD max segment) for context
+BATCH_WORKERS = int(os.environ.get("BATCH_TRANSCRIPTION_WORKERS", os.cpu_count() or 2))
+BATCH_TRANSCRIPTION_BACKEND = os.environ.get("BATCH_TRANSCRIPTION_BACKEND")
+
+# Layout: RECORDINGS_DIR/<meeting_id>/<speaker>/00000.pcm ... plus index.ndjson,
+# where each index line is {"file", "offset", "bytes", "ts"} for one write
+_recorders = {}
+_recorders_lock = threading.Lock()
+
+
+class SpeakerRecording:
+    """
+    Append-only chunked PCM files for one speaker. Reopening a directory
+    (recording stopped and started again) continues in a fresh chunk file,
+    so offsets in the index stay valid.
+    """
+
+    def __init__(self, directory, sample_rate=SAMPLE_RATE):
+        self.directory = directory
+        self.chunk_bytes = RECORDING_CHUNK_SECONDS * sample_rate * 2
+        os.makedirs(directory, exist_ok=True)
+        existing = [int(name[:-4]) for name in os.listdir(directory) if re.fullmatch(r"\d+\.pcm", name)]
+        self.chunk_no = max(existing) + 1 if existing else 0
+        self.chunk_size = 0
+        self._chunk = None
+        self._index = open(os.path.join(directory, "index.ndjson"), "a", encoding="utf-8")
+
+    def write(self, pcm, ts):
+        if self._chunk is None or self.chunk_size >= self.chunk_bytes:
+            self._roll()
+        name = os.path.basename(self._chunk.name)
+        self._chunk.write(pcm)
+        self._index.write(json.dumps({"file": name, "offset": self.chunk_size, "bytes": len(pcm), "ts": ts}) + "\n")
+        self.chunk_size += len(pcm)
+
+    def close(self):
+        if self._chunk is not None:
+            self._chunk.close()
+        self._index.close()
+
+    def _roll(self):
+        if self._chunk is not None:
+            self._chunk.close()
+            self.chunk_no += 1
+        self._chunk = open(os.path.join(self.directory, f"{self.chunk_no:05d}.pcm"), "ab")
+        self.chunk_size = 0
+
+
+class MeetingRecorder:
+    """Recording of one meeting, one SpeakerRecording per speaker"""
+
+    def __init__(self, meeting_id):
+        self.meeting_id = meeting_id
+        self.directory = os.path.join(RECORDINGS_DIR, meeting_id)
+        self.speakers = {}
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def write(self, speaker, pcm, ts):
+        with self.lock:
+            if self.closed:
+                return  # raced with stop_recording
+            recording = self.speakers.get(speaker)
+            if recording is None:
+                safe = re.sub(r"[^A-Za-z0-9_-]", "_", speaker or "unknown")
+                recording = self.speakers[speaker] = SpeakerRecording(os.path.join(self.directory, safe))
+                with open(os.path.join(recording.directory, "speaker.json"), "w", encoding="utf-8") as f:
+                    json.dump({"sid": speaker}, f)
+            recording.write(pcm, ts)
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            for recording in self.speakers.values():
+                recording.close()
+
+
+def start_recording(room, meeting_id):
+    """Start recording a room's ingested audio"""
+    with _recorders_lock:
+        if room not in _recorders:
+            _recorders[room] = MeetingRecorder(meeting_id)
+            logger.info(f"Recording room {room} as {meeting_id}")
+    return _recorders[room]
+
+
+def stop_recording(room):
+    """Stop recording a room; returns the meeting id, or None if it was not recording"""
+    with _recorders_lock:
+        recorder = _recorders.pop(room, None)
+    if recorder is None:
+        return None
+    recorder.close()
+    return recorder.meeting_id
+
+
+def is_recording(room):
+    return room in _recorders
+
+
+def record_audio(room, speaker, pcm, ts):
+    """Append ingested audio for a speaker if the room is being recorded"""
+    recorder = _recorders.get(room)
+    if recorder is not None:
+        recorder.write(speaker, pcm, ts)
+
+
+def _read_speaker(directory):
+    """Yield (pcm, ts) for each write of a speaker recording, in order"""
+    with open(os.path.join(directory, "index.ndjson"), encoding="utf-8") as f:
+        index = [json.loads(line) for line in f if line.strip()]
+    handles = {}
+    try:
+        for item in index:
+            handle = handles.get(item["file"])
+            if handle is None:
+                handle = handles[item["file"]] = open(os.path.join(directory, item["file"]), "rb")
+            handle.seek(item["offset"])
+            yield handle.read(item["bytes"]), item["ts"]
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+
+def _speaker_segments(directory):
+    """Run VAD with batch-sized windows over a speaker recording; yields (ts, pcm)"""
+    segmenter = SpeechSegmenter(max_segment_seconds=BATCH_WINDOW_SECONDS)
+    write_starts, write_ts = [], []  # sample offset and wall time of each write
+    position = 0
+
+    def timestamp(offset):
+        i = max(0, bisect.bisect_right(write_starts, offset) - 1)
+        return write_ts[i] + (offset - write_starts[i]) / SAMPLE_RATE
+
+    for pcm, ts in _read_speaker(directory):
+        write_starts.append(position)
+        write_ts.append(ts)
+        position += len(pcm) // 2
+        for segment in segmenter.push(pcm):
+            yield timestamp(segment.offset), segment.audio
+    segment = segmenter.flush()
+    if segment:
+        yield timestamp(segment.offset), segment.audio
+
+
+def _speaker_dirs(meeting_id):
+    """Yield (sid, directory) for each speaker recorded in a meeting"""
+    directory = os.path.join(RECORDINGS_DIR, meeting_id)
+    if not os.path.isdir(directory):
+        return
+    for speaker_dir in sorted(os.listdir(directory)):
+        path = os.path.join(directory, speaker_dir)
+        if not os.path.isfile(os.path.join(path, "index.ndjson")):
+            continue
+        with open(os.path.join(path, "speaker.json"), encoding="utf-8") as f:
+            yield json.load(f)["sid"], path
+
+
+def _transcribe_window(job):
+    """Process pool entry point: (backend, pcm) -> text"""
+    backend, pcm = job
+    return get_backend(backend).transcribe(pcm)
+
+
+def batch_backend(backend=None):
+    """
+    Backend name for a batch job, or None when no real engine is usable
+
+    The mock is only used when passed by name (tests): resolving to it by
+    default would replace the archived transcript with canned text.
+    """
+    if not backend:
+        backend = BATCH_TRANSCRIPTION_BACKEND or select_backend_name()
+        if backend == "mock":
+            return None
+    return backend if backend in available_backends() else None
+
+
+def batch_transcribe_recording(meeting_id, backend=None, workers=BATCH_WORKERS):
+    """
+    Re-transcribe a whole recording with a process pool
+
+    Args:
+        meeting_id: Id of a recorded (and archived) meeting
+        backend: Transcription backend name (defaults to BATCH_TRANSCRIPTION_BACKEND)
+        workers: Number of worker processes
+
+    Returns:
+        List of transcript entries in time order
+
+    Raises:
+        ValueError: If no transcription backend is usable (see batch_backend)
+    """
+    name = batch_backend(backend)
+    if name is None:
+        raise ValueError(f"No usable transcription backend for batch jobs ({backend or 'auto'})")
+    backend = name
+    meta = load_meeting_meta(meeting_id) or {}
+    names = meta.get("participants", {})
+
+    entries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for sid, path in _speaker_dirs(meeting_id):
+            # Submit in bounded waves so a long recording is never fully in memory
+            pending = []
+            for ts, pcm in _speaker_segments(path):
+                pending.append((ts, pool.submit(_transcribe_window, (backend, pcm))))
+                if len(pending) >= workers * 2:
+                    entries.extend(_collect(pending, sid, names, backend))
+                    pending = []
+            entries.extend(_collect(pending, sid, names, backend))
+
+    entries.sort(key=lambda e: e["ts"])
+    return entries
+
+
+def _collect(pending, sid, names, backend):
+    entries = []
+    for ts, future in pending:
+        try:
+            text = future.result()
+        except Exception as e:
+            logger.error(f"Batch transcription window failed: {e}")
+            continue
+        if text and text.strip():
+            entries.append({
+                "ts": int(ts),
+                "text": text.strip(),
+                "sid": sid,
+                "speaker": names.get(sid, f"User {sid[:8]}" if sid else "Unknown"),
+                "backend": backend,
+                "source": "batch"
+            })
+    return entries
+
+
+def run_batch_job(meeting_id, backend=None):
+    """
+    Batch re-transcribe a recorded meeting into its archived transcript
+
+    Only the entries of recorded speakers are replaced; entries of anyone
+    without a recording (e.g. client-side Web Speech captions) are kept and
+    merged with the batch entries by ts.
+    """
+    name = batch_backend(backend)
+    if name is None:
+        logger.warning(f"Not batch transcribing {meeting_id}: no usable transcription backend "
+                       f"({backend or 'auto'}); keeping the live transcript")
+        return None
+    try:
+        batch_entries = batch_transcribe_recording(meeting_id, name)
+        recorded = {sid for sid, _ in _speaker_dirs(meeting_id)}
+        kept = [entry for entry in iter_transcript(meeting_id) if entry.get("sid") not in recorded]
+        entries = sorted(kept + batch_entries, key=lambda e: e.get("ts", 0))
+        replace_transcript(meeting_id, entries, source="batch")
+        search_index = get_search_index()
+        if search_index is not None:
+            search_index.replace_meeting(meeting_id, (load_meeting_meta(meeting_id) or {}).get("room", ""), entries)
+        return entries
+    except Exception as e:
+        logger.error(f"Batch transcription failed for {meeting_id}: {e}")
+        return None
+
+
+def start_batch_job(meeting_id, backend=None):
+    """Run the batch job in a background thread (the pool itself uses processes)"""
+    thread = threading.Thread(target=run_batch_job, args=(meeting_id, backend), daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) < 2:
+        print("Usage: python meeting_recorder.py <meeting_id> [backend]")
+        sys.exit(1)
+    result = run_batch_job(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"Transcribed {len(result or [])} entries")
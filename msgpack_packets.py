@@ -0,0 +1,159 @@
+# msgpack_packets.py - Opt-in binary (msgpack) Socket.IO packets, negotiated per client
+#
+# NegotiatingServer and NegotiatingManager extend python-socketio internals
+# (Server._send_packet, Server._send_eio_packet, Manager.emit), so
+# python-socketio is pinned in requirements.txt; test_msgpack_packets.py
+# fails if those internals change.
+import logging
+from urllib.parse import parse_qs
+
+import socketio
+from engineio import packet as eio_packet
+from socketio import Manager, packet
+
+from serialization import default as encode_default
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Clients opt in with ?serializer=msgpack on the Socket.IO connection URL
+SERIALIZER_PARAM = "serializer"
+MSGPACK = "msgpack"
+
+# msgpack carries bytes natively, so there are no binary attachment packets
+_PLAIN_TYPES = {packet.BINARY_EVENT: packet.EVENT, packet.BINARY_ACK: packet.ACK}
+
+
+def wants_msgpack(environ):
+    """Whether a connecting client asked for msgpack packets"""
+    query = parse_qs(environ.get("QUERY_STRING", "")) if environ else {}
+    return query.get(SERIALIZER_PARAM, [""])[0] == MSGPACK
+
+
+class HybridPacket(packet.Packet):
+    """
+    Socket.IO packet readable in both wire formats.
+
+    Text packets decode as JSON and binary ones as msgpack. In JSON mode
+    the only binary messages are attachments, which the server collects
+    before a packet is decoded, so the message type alone tells the
+    formats apart. encode() produces JSON; encode_msgpack() produces the
+    binary form used by socket.io-msgpack-parser clients.
+    """
+
+    def decode(self, encoded_packet):
+        if isinstance(encoded_packet, (bytes, bytearray)):
+            decoded = msgpack.unpackb(encoded_packet)
+            self.packet_type = decoded["type"]
+            self.data = decoded.get("data")
+            self.id = decoded.get("id")
+            self.namespace = decoded.get("nsp", "/")
+            return 0
+        return super().decode(encoded_packet)
+
+    def encode_msgpack(self):
+        message = {"type": _PLAIN_TYPES.get(self.packet_type, self.packet_type), "nsp": self.namespace or "/"}
+        if self.data is not None:
+            message["data"] = self.data
+        if self.id is not None:
+            message["id"] = self.id
+        return msgpack.packb(message, default=encode_default)
+
+
+class NegotiatingServer(socketio.Server):
+    """
+    Server that sends single-client packets (connect, disconnect, acks and
+    emits with callbacks) in the format the client chose.
+
+    Flask-SocketIO constructs a plain socketio.Server itself, so server.py
+    adopts that instance once at startup with adopt(); no method of the
+    live instance is replaced.
+    """
+
+    def _send_packet(self, eio_sid, pkt):
+        if eio_sid in getattr(self.manager, "binary_clients", ()):
+            self.eio.send(eio_sid, pkt.encode_msgpack())
+        else:
+            super()._send_packet(eio_sid, pkt)
+
+    @classmethod
+    def adopt(cls, server):
+        """
+        Turn an existing socketio.Server into a NegotiatingServer
+
+        Raises:
+            TypeError: If server is not a plain socketio.Server
+        """
+        if type(server) is not socketio.Server:
+            raise TypeError(f"Cannot adopt {type(server).__name__}")
+        server.__class__ = cls
+        return server
+
+
+class NegotiatingManager(Manager):
+    """
+    Client manager that sends each client packets in the format it chose.
+
+    A room emit is encoded at most twice, once per format in use among
+    its recipients, and the same encoded packet goes to everyone sharing
+    a format. Use together with serializer=HybridPacket and
+    NegotiatingServer, which encodes the packets sent to a single client.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.binary_clients = set()   # eio sids of msgpack clients
+
+    def connect(self, eio_sid, namespace):
+        sid = super().connect(eio_sid, namespace)
+        if wants_msgpack(self.server.get_environ(sid, namespace)):
+            self.binary_clients.add(eio_sid)
+        return sid
+
+    def disconnect(self, sid, namespace, **kwargs):
+        eio_sid = self.eio_sid_from_sid(sid, namespace)
+        if namespace == "/":
+            self.binary_clients.discard(eio_sid)
+        return super().disconnect(sid, namespace, **kwargs)
+
+    def emit(self, event, data, namespace, room=None, skip_sid=None, callback=None, to=None, **kwargs):
+        if callback or not self.binary_clients:
+            return super().emit(event, data, namespace, room=room, skip_sid=skip_sid,
+                                callback=callback, to=to, **kwargs)
+        room = to or room
+        if namespace not in self.rooms:
+            return
+        if isinstance(data, tuple):
+            data = list(data)
+        elif data is not None:
+            data = [data]
+        else:
+            data = []
+        if not isinstance(skip_sid, list):
+            skip_sid = [skip_sid]
+
+        pkt = self.server.packet_class(packet.EVENT, namespace=namespace, data=[event] + data)
+        encoded = {}   # binary -> engine.io packets
+        for sid, eio_sid in self.get_participants(namespace, room):
+            if sid in skip_sid:
+                continue
+            binary = eio_sid in self.binary_clients
+            if binary not in encoded:
+                encoded[binary] = self._eio_packets(pkt, binary)
+            for eio_pkt in encoded[binary]:
+                self.server._send_eio_packet(eio_sid, eio_pkt)
+
+    @staticmethod
+    def _eio_packets(pkt, binary):
+        payload = pkt.encode_msgpack() if binary else pkt.encode()
+        if not isinstance(payload, list):
+            payload = [payload]
+        return [eio_packet.Packet(eio_packet.MESSAGE, part) for part in payload]
+
+    def get_stats(self):
+        return {"msgpack_clients": len(self.binary_clients)}
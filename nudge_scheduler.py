@@ -0,0 +1,199 @@
+# nudge_scheduler.py - Hierarchical timer wheel for automatic inactivity nudges
+import math
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+NUDGE_IDLE_SECONDS = 300          # inactivity before a participant is checked for a nudge
+NUDGE_ENGAGEMENT_THRESHOLD = 0.3
+NUDGE_COOLDOWN_SECONDS = 600      # re-check interval after a nudge was sent
+WHEEL_TICK_SECONDS = 1.0
+WHEEL_SLOTS = 64
+WHEEL_LEVELS = 3                  # 64 s, ~68 min and ~73 h of range at 1 s ticks
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel keyed by arbitrary hashable keys.
+
+    Level 0 has one slot per tick; each higher level has slots
+    WHEEL_SLOTS times wider. A timer sits in the lowest level whose range
+    reaches its deadline and is moved down ("cascaded") when the level
+    below wraps around. Scheduling, rescheduling and cancelling are O(1);
+    advancing costs one step per elapsed tick plus the timers that fire.
+    """
+
+    def __init__(self, tick=WHEEL_TICK_SECONDS, slots=WHEEL_SLOTS, levels=WHEEL_LEVELS, now=None):
+        self.tick = tick
+        self.slots = slots
+        self.levels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self.current = self._to_tick(time.time() if now is None else now)
+        self.timers = {}   # key -> (deadline tick, bucket)
+
+    def _to_tick(self, ts):
+        return math.ceil(ts / self.tick)
+
+    def __len__(self):
+        return len(self.timers)
+
+    def __contains__(self, key):
+        return key in self.timers
+
+    def _place(self, key, due):
+        delta = due - self.current
+        for level, wheel in enumerate(self.levels):
+            span = self.slots ** (level + 1)
+            if delta < span or level == len(self.levels) - 1:
+                if delta >= span:
+                    # Beyond the wheel's range: park in the farthest top-level slot
+                    due_slot = (self.current // self.slots ** level + self.slots - 1) % self.slots
+                else:
+                    due_slot = (due // self.slots ** level) % self.slots
+                bucket = wheel[due_slot]
+                bucket.add(key)
+                self.timers[key] = (due, bucket)
+                return
+
+    def schedule(self, key, deadline):
+        """Schedule (or move) the timer for key to fire at timestamp deadline"""
+        self.cancel(key)
+        self._place(key, max(self._to_tick(deadline), self.current + 1))
+
+    def cancel(self, key):
+        entry = self.timers.pop(key, None)
+        if entry is not None:
+            entry[1].discard(key)
+
+    def deadline(self, key):
+        """Timestamp a key's timer fires at (None if not scheduled)"""
+        entry = self.timers.get(key)
+        return entry[0] * self.tick if entry else None
+
+    def advance(self, now=None):
+        """
+        Move the wheel forward to now
+
+        Returns:
+            List of keys whose deadlines passed, in deadline order
+        """
+        target = self._to_tick(time.time() if now is None else now)
+        expired = []
+        while self.current < target:
+            if not self.timers:
+                self.current = target
+                break
+            self.current += 1
+            self._cascade()
+            bucket = self.levels[0][self.current % self.slots]
+            for key in list(bucket):
+                due, _ = self.timers[key]
+                if due <= self.current:
+                    bucket.discard(key)
+                    del self.timers[key]
+                    expired.append(key)
+        return expired
+
+    def _cascade(self):
+        # Each time a level wraps, the next level's current slot moves down
+        for level in range(1, len(self.levels)):
+            if self.current % self.slots ** level:
+                break
+            bucket = self.levels[level][(self.current // self.slots ** level) % self.slots]
+            keys = list(bucket)
+            bucket.clear()
+            for key in keys:
+                due, _ = self.timers.pop(key)
+                self._place(key, due)
+
+
+class NudgeScheduler:
+    """
+    Inactivity deadline per (room, participant) on a timer wheel.
+
+    Activity pushes the participant's deadline out by NUDGE_IDLE_SECONDS.
+    When a deadline passes, check(room, sid) decides whether to nudge;
+    the participant is then re-checked after NUDGE_COOLDOWN_SECONDS if
+    nudged or NUDGE_IDLE_SECONDS if not, until new activity arrives.
+    """
+
+    def __init__(self, socketio, check, notify, idle_seconds=NUDGE_IDLE_SECONDS):
+        """
+        Args:
+            socketio: Flask-SocketIO server (runs the background ticker)
+            check: Callable (room, sid) -> True to nudge now, False to check
+                again later, None when the participant has left
+            notify: Callable (room, sid) sending the nudge
+            idle_seconds: Inactivity before the first check
+        """
+        self.socketio = socketio
+        self.check = check
+        self.notify = notify
+        self.idle_seconds = idle_seconds
+        self.wheel = TimerWheel()
+        self._lock = threading.Lock()
+        self._started = False
+        self.stats = {"scheduled": 0, "fired": 0, "nudged": 0}
+
+    def touch(self, room, sid, ts=None):
+        """Record activity: the participant's deadline moves to ts + idle_seconds"""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self.wheel.schedule((room, sid), ts + self.idle_seconds)
+            self.stats["scheduled"] += 1
+            if not self._started:
+                self._started = True
+                self.socketio.start_background_task(self._run)
+
+    def remove(self, room, sid):
+        with self._lock:
+            self.wheel.cancel((room, sid))
+
+    def deadline(self, room, sid):
+        with self._lock:
+            return self.wheel.deadline((room, sid))
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.wheel.tick)
+            try:
+                self.run_due()
+            except Exception as e:
+                logger.error(f"Nudge scheduler error: {e}")
+
+    def run_due(self, now=None):
+        """
+        Fire every deadline that has passed
+
+        Returns:
+            List of (room, sid) that were nudged
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = self.wheel.advance(now)
+        nudged = []
+        for room, sid in expired:
+            self.stats["fired"] += 1
+            decision = self.check(room, sid)
+            if decision is None:
+                continue
+            if not decision:
+                self._rearm(room, sid, now + self.idle_seconds)
+                continue
+            self.notify(room, sid)
+            self.stats["nudged"] += 1
+            nudged.append((room, sid))
+            self._rearm(room, sid, now + NUDGE_COOLDOWN_SECONDS)
+        return nudged
+
+    def _rearm(self, room, sid, deadline):
+        with self._lock:
+            # Activity during the check already scheduled a newer deadline
+            if (room, sid) not in self.wheel:
+                self.wheel.schedule((room, sid), deadline)
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, pending=len(self.wheel))
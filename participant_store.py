@@ -0,0 +1,147 @@
+# participant_store.py - Columnar participant engagement state with a vectorized tick
+import os
+import time
+
+import numpy as np
+
+from engagement_log import ENGAGEMENT_DECAY_SECONDS, PRIOR_WEIGHT, DEFAULT_BASELINE
+
+# Configuration
+ENGAGEMENT_TICK_SECONDS = float(os.environ.get("ENGAGEMENT_TICK_SECONDS", 5))
+
+
+class ParticipantStore:
+    """
+    Participant engagement state for every room on this node as parallel NumPy columns.
+
+    Each participant owns a slot (row) shared by all columns. Freed slots
+    are reused and the columns double when full; a room's id is freed for
+    reuse when its last participant is removed. Handlers write single
+    fields in O(1). Rows hold each participant's decayed engagement sums
+    (see EngagementLog), so tick() evaluates every score at the same
+    instant and orders every room's leaderboard in one vectorized pass.
+    """
+
+    COLUMNS = ("engagement", "weighted", "weight", "ref_ts", "baseline")
+
+    def __init__(self, capacity=64):
+        self.capacity = 0
+        self.room_index = np.zeros(0, dtype=np.intp)
+        self.active = np.zeros(0, dtype=bool)
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(0))
+        self.keys = []          # slot -> (room, sid)
+        self.slots = {}         # (room, sid) -> slot
+        self.room_ids = {}      # room -> int
+        self.room_names = []    # room id -> room (None once freed)
+        self.room_sizes = {}    # room -> participants holding a slot
+        self._free = []
+        self._free_room_ids = []
+        self.last_tick = None
+        self.leaderboards = {}
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        extra = capacity - self.capacity
+        self.room_index = np.concatenate([self.room_index, np.full(extra, -1, dtype=np.intp)])
+        self.active = np.concatenate([self.active, np.zeros(extra, dtype=bool)])
+        for name in self.COLUMNS:
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra)]))
+        self.keys.extend([None] * extra)
+        self._free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self.slots)
+
+    def slot(self, room, sid):
+        """Slot for a participant, allocating one on first use"""
+        key = (room, sid)
+        slot = self.slots.get(key)
+        if slot is not None:
+            return slot
+        if not self._free:
+            self._grow(self.capacity * 2)
+        slot = self._free.pop()
+        room_id = self.room_ids.get(room)
+        if room_id is None:
+            if self._free_room_ids:
+                room_id = self._free_room_ids.pop()
+                self.room_names[room_id] = room
+            else:
+                room_id = len(self.room_names)
+                self.room_names.append(room)
+            self.room_ids[room] = room_id
+        self.room_sizes[room] = self.room_sizes.get(room, 0) + 1
+
+        self.slots[key] = slot
+        self.keys[slot] = key
+        self.room_index[slot] = room_id
+        self.active[slot] = True
+        for name in self.COLUMNS:
+            getattr(self, name)[slot] = 0.0
+        return slot
+
+    def remove(self, room, sid):
+        slot = self.slots.pop((room, sid), None)
+        if slot is None:
+            return
+        self.active[slot] = False
+        self.keys[slot] = None
+        self.room_index[slot] = -1
+        self._free.append(slot)
+        self.room_sizes[room] -= 1
+        if not self.room_sizes[room]:
+            del self.room_sizes[room]
+            room_id = self.room_ids.pop(room)
+            self.room_names[room_id] = None
+            self._free_room_ids.append(room_id)
+            self.leaderboards.pop(room, None)
+
+    def remove_room(self, room):
+        for key in [key for key in self.slots if key[0] == room]:
+            self.remove(*key)
+
+    def update(self, room, sid, **fields):
+        """Write some columns of a participant's row"""
+        slot = self.slot(room, sid)
+        for name, value in fields.items():
+            getattr(self, name)[slot] = value
+
+    def sync(self, room, sid, participant):
+        """Copy a participant's engagement sums into its row"""
+        fields = {"baseline": DEFAULT_BASELINE}
+        log = participant.get("engagement")
+        if log is not None:
+            fields.update(weighted=log.weighted, weight=log.weight,
+                          ref_ts=log.ref_ts or 0.0, baseline=log.baseline)
+        self.update(room, sid, **fields)
+
+    def tick(self, now=None):
+        """
+        One vectorized pass over every participant on the node
+
+        Returns:
+            Dictionary with "leaderboards" {room: [(sid, engagement)]}
+            ordered by engagement
+        """
+        now = time.time() if now is None else now
+        self.last_tick = now
+
+        # Same closed form as EngagementLog.score, for all rows at once
+        active = self.active
+        decay = np.exp(-np.maximum(0.0, now - self.ref_ts) / ENGAGEMENT_DECAY_SECONDS)
+        self.engagement = ((self.weighted * decay + PRIOR_WEIGHT * self.baseline)
+                           / (self.weight * decay + PRIOR_WEIGHT))
+
+        # Leaderboards for all rooms: sort by room, then engagement descending
+        rows = np.flatnonzero(active)
+        order = rows[np.lexsort((-self.engagement[rows], self.room_index[rows]))]
+        boundaries = np.flatnonzero(np.diff(self.room_index[order])) + 1
+        leaderboards = {}
+        for group in np.split(order, boundaries) if order.size else []:
+            room = self.room_names[self.room_index[group[0]]]
+            leaderboards[room] = [(self.keys[slot][1], float(self.engagement[slot])) for slot in group]
+        self.leaderboards = leaderboards
+
+        return {"leaderboards": leaderboards}
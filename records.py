@@ -0,0 +1,109 @@
+# records.py - Compact slotted records for participants and transcript entries
+import sys
+
+
+def intern_id(value):
+    """Share one string object per sid or speaker name across every record"""
+    return sys.intern(value) if type(value) is str else value
+
+
+class Record:
+    """
+    Base for slotted records that replace free-form dicts.
+
+    Fields live in __slots__, so a record has no per-instance dict and
+    optional fields that were never set take no more than a pointer.
+    Records still read and write like the dicts they replace (entry["text"],
+    participant.get("name"), "sentiment" in entry), so code that only
+    reads them does not change. They become plain dicts again at the
+    edges: to_dict() for jsonify and Socket.IO payloads, or as_dict as the
+    json.dumps default for files and streams.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key, default)
+
+    def keys(self):
+        return [key for key in self.__slots__ if hasattr(self, key)]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def to_dict(self):
+        """The fields that are set, in the JSON shape of the dict this record replaces"""
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class TranscriptEntry(Record):
+    """One transcript line; sentiment, backend and segment_id are optional"""
+
+    __slots__ = ("ts", "text", "sid", "speaker", "sentiment", "backend", "segment_id")
+
+    def __init__(self, ts, text, sid=None, speaker=None, **optional):
+        self.ts = ts
+        self.text = text
+        self.sid = intern_id(sid)
+        self.speaker = intern_id(speaker)
+        for key, value in optional.items():
+            setattr(self, key, value)
+
+
+class Participant(Record):
+    """
+    A participant of a live room. engagement holds the EngagementLog and
+    is not JSON data; the network fields are set once the client reports
+    its connection quality.
+    """
+
+    __slots__ = ("name", "joined_at", "last_activity", "speaking_time", "engagement",
+                 "network_quality", "communication_mode", "mode_label")
+
+    def __init__(self, name, last_activity, speaking_time=0, engagement=None, joined_at=None):
+        self.name = intern_id(name)
+        if joined_at is not None:
+            self.joined_at = joined_at
+        self.last_activity = last_activity
+        self.speaking_time = speaking_time
+        self.engagement = engagement
+
+
+def as_dict(obj):
+    """json.dumps default: records serialize as their dict form"""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_dicts(entries):
+    """List of dicts for a response body from records or dicts"""
+    return [entry.to_dict() if isinstance(entry, Record) else entry for entry in entries]
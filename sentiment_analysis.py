@@ -1,39 +1,41 @@
 # sentiment_analysis.py - Real-time sentiment analysis for meeting transcripts
 import time
-import re
 from collections import defaultdict
 
-# Simple sentiment lexicon
-POSITIVE_WORDS = {
-    'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'love', 'like', 
-    'happy', 'excited', 'agree', 'yes', 'perfect', 'awesome', 'brilliant', 'outstanding',
-    'superb', 'terrific', 'marvelous', 'fabulous', 'incredible', 'impressive', 'positive',
-    'successful', 'effective', 'efficient', 'productive', 'valuable', 'beneficial',
-    'helpful', 'useful', 'constructive', 'innovative', 'creative', 'inspiring'
-}
+from sentiment_engine import SentimentEngine
+from lexicons import load_lexicon, available_languages, DEFAULT_LANGUAGE
+from sentiment_history import POSITIVE_THRESHOLD, NEGATIVE_THRESHOLD
+from records import intern_id
 
-NEGATIVE_WORDS = {
-    'bad', 'terrible', 'awful', 'hate', 'dislike', 'sad', 'angry', 'frustrated', 
-    'disagree', 'no', 'wrong', 'problem', 'issue', 'concern', 'worried', 'disappointed',
-    'upset', 'annoyed', 'irritated', 'confused', 'difficult', 'challenging', 'impossible',
-    'failure', 'failed', 'broken', 'error', 'mistake', 'ineffective', 'useless',
-    'pointless', 'waste', 'boring', 'tedious', 'overwhelming', 'stressful'
-}
+# Compiled engines per language; lexicons live in data/lexicons/<language>.json
+_engines = {}
 
-INTENSIFIERS = {
-    'very': 1.5, 'really': 1.4, 'extremely': 1.8, 'incredibly': 1.7, 'absolutely': 1.6,
-    'totally': 1.5, 'completely': 1.6, 'quite': 1.2, 'rather': 1.1, 'pretty': 1.1,
-    'so': 1.3, 'too': 1.2, 'highly': 1.4, 'deeply': 1.3, 'truly': 1.4
-}
+def sentiment_trend(score):
+    """Label a score as positive, negative or neutral"""
+    if score > POSITIVE_THRESHOLD:
+        return "positive"
+    elif score < NEGATIVE_THRESHOLD:
+        return "negative"
+    return "neutral"
 
-NEGATIONS = {'not', 'no', 'never', 'nothing', 'nobody', 'nowhere', 'neither', 'nor', "don't", "won't", "can't", "shouldn't", "wouldn't", "couldn't", "isn't", "aren't", "wasn't", "weren't"}
+def get_engine(language=None):
+    """Return the sentiment engine for a language (unknown languages use the default pack)"""
+    language = language or DEFAULT_LANGUAGE
+    engine = _engines.get(language)
+    if engine is None:
+        if language not in available_languages():
+            language = DEFAULT_LANGUAGE
+        engine = _engines.get(language) or SentimentEngine.from_lexicon(load_lexicon(language))
+        _engines[language] = engine
+    return engine
 
-def analyze_sentiment(text):
+def analyze_sentiment(text, language=None):
     """
     Analyze sentiment of text using lexicon-based approach
     
     Args:
         text: Input text to analyze
+        language: Lexicon language (default: SENTIMENT_LANGUAGE)
         
     Returns:
         Float between -1 (negative) and 1 (positive)
@@ -41,56 +43,20 @@ def analyze_sentiment(text):
     if not text or not text.strip():
         return 0.0
     
-    # Clean and tokenize text
-    text = text.lower()
-    text = re.sub(r'[^\w\s]', ' ', text)  # Remove punctuation
-    words = text.split()
-    
-    if not words:
-        return 0.0
-    
-    sentiment_score = 0.0
-    word_count = 0
+    return get_engine(language).score(text)
+
+def score_batch(texts, language=None):
+    """
+    Analyze sentiment of many texts at once (e.g. re-scoring a transcript)
     
-    i = 0
-    while i < len(words):
-        word = words[i]
-        
-        # Check for negation in the previous 2 words
-        negated = False
-        for j in range(max(0, i-2), i):
-            if words[j] in NEGATIONS:
-                negated = True
-                break
-        
-        # Check for intensifiers in the previous word
-        intensifier = 1.0
-        if i > 0 and words[i-1] in INTENSIFIERS:
-            intensifier = INTENSIFIERS[words[i-1]]
-        
-        # Calculate sentiment for current word
-        word_sentiment = 0.0
-        if word in POSITIVE_WORDS:
-            word_sentiment = 1.0 * intensifier
-        elif word in NEGATIVE_WORDS:
-            word_sentiment = -1.0 * intensifier
-        
-        # Apply negation
-        if negated and word_sentiment != 0:
-            word_sentiment *= -0.8  # Reduce impact of negation slightly
-        
-        sentiment_score += word_sentiment
-        if word_sentiment != 0:
-            word_count += 1
+    Args:
+        texts: Sequence of input texts
+        language: Lexicon language (default: SENTIMENT_LANGUAGE)
         
-        i += 1
-    
-    # Normalize by number of sentiment-bearing words
-    if word_count > 0:
-        sentiment_score = sentiment_score / word_count
-    
-    # Clamp to [-1, 1] range
-    return max(-1.0, min(1.0, sentiment_score))
+    Returns:
+        List of floats between -1 (negative) and 1 (positive), one per text
+    """
+    return get_engine(language).score_batch(texts).tolist()
 
 def update_room_sentiment(room_data, text, speaker_id=None):
     """
@@ -104,18 +70,9 @@ def update_room_sentiment(room_data, text, speaker_id=None):
     sentiment_score = analyze_sentiment(text)
     timestamp = time.time()
     
-    sentiment_entry = {
-        "timestamp": timestamp,
-        "score": sentiment_score,
-        "text": text[:100],  # Store first 100 chars for context
-        "speaker": speaker_id
-    }
-    
-    room_data["sentiment_history"].append(sentiment_entry)
-    
-    # Keep only last 100 entries to prevent memory issues
-    if len(room_data["sentiment_history"]) > 100:
-        room_data["sentiment_history"] = room_data["sentiment_history"][-100:]
+    # Fixed-capacity ring buffer; the oldest entries are evicted. Keep the
+    # first 100 chars for context; speaker ids are shared across entries
+    room_data["sentiment_history"].add(timestamp, sentiment_score, text[:100], intern_id(speaker_id))
     
     return sentiment_score
 
@@ -130,16 +87,14 @@ def get_sentiment_graph(room_data, time_window_minutes=30):
     Returns:
         Dictionary with sentiment graph data
     """
-    current_time = time.time()
-    cutoff_time = current_time - (time_window_minutes * 60)
+    history = room_data["sentiment_history"]
+    cutoff_time = time.time() - (time_window_minutes * 60)
     
-    # Filter recent sentiment entries
-    recent_entries = [
-        entry for entry in room_data["sentiment_history"]
-        if entry["timestamp"] >= cutoff_time
-    ]
+    # Entries are time-ordered, so the window is a suffix found by bisection
+    start = history.index_since(cutoff_time)
+    window = history.stats(start)
     
-    if not recent_entries:
+    if not window["count"]:
         return {
             "sentiment_history": [],
             "overall_sentiment": 0.0,
@@ -147,27 +102,18 @@ def get_sentiment_graph(room_data, time_window_minutes=30):
             "summary": "No recent sentiment data"
         }
     
-    # Calculate overall sentiment
-    scores = [entry["score"] for entry in recent_entries]
-    overall_sentiment = sum(scores) / len(scores)
-    
-    # Determine trend
-    if overall_sentiment > 0.2:
-        trend = "positive"
-    elif overall_sentiment < -0.2:
-        trend = "negative"
-    else:
-        trend = "neutral"
+    overall_sentiment = window["mean"]
+    trend = sentiment_trend(overall_sentiment)
     
     # Generate summary
-    positive_count = sum(1 for score in scores if score > 0.2)
-    negative_count = sum(1 for score in scores if score < -0.2)
-    neutral_count = len(scores) - positive_count - negative_count
+    positive_count = window["positive_count"]
+    negative_count = window["negative_count"]
+    neutral_count = window["neutral_count"]
     
     summary = f"Recent sentiment: {positive_count} positive, {neutral_count} neutral, {negative_count} negative statements"
     
     return {
-        "sentiment_history": recent_entries,
+        "sentiment_history": history[start:],
         "overall_sentiment": overall_sentiment,
         "trend": trend,
         "summary": summary,
@@ -175,7 +121,7 @@ def get_sentiment_graph(room_data, time_window_minutes=30):
             "positive_count": positive_count,
             "negative_count": negative_count,
             "neutral_count": neutral_count,
-            "total_entries": len(recent_entries)
+            "total_entries": window["count"]
         }
     }
 
@@ -190,12 +136,9 @@ def get_speaker_sentiment_analysis(room_data, speaker_id):
     Returns:
         Dictionary with speaker sentiment data
     """
-    speaker_entries = [
-        entry for entry in room_data["sentiment_history"]
-        if entry.get("speaker") == speaker_id
-    ]
+    aggregate = room_data["sentiment_history"].speakers.get(speaker_id)
     
-    if not speaker_entries:
+    if not aggregate:
         return {
             "speaker_id": speaker_id,
             "avg_sentiment": 0.0,
@@ -203,25 +146,37 @@ def get_speaker_sentiment_analysis(room_data, speaker_id):
             "total_statements": 0
         }
     
-    scores = [entry["score"] for entry in speaker_entries]
-    avg_sentiment = sum(scores) / len(scores)
-    
-    # Determine trend
-    if avg_sentiment > 0.2:
-        trend = "positive"
-    elif avg_sentiment < -0.2:
-        trend = "negative"
-    else:
-        trend = "neutral"
+    avg_sentiment = aggregate["mean"]
     
     return {
         "speaker_id": speaker_id,
         "avg_sentiment": avg_sentiment,
-        "trend": trend,
-        "total_statements": len(speaker_entries),
-        "recent_scores": scores[-10:]  # Last 10 scores
+        "trend": sentiment_trend(avg_sentiment),
+        "total_statements": aggregate["count"],
+        "recent_scores": list(aggregate["recent"])  # Last 10 scores
     }
 
+def get_room_speaker_sentiment(room_data):
+    """
+    Get sentiment analysis for every speaker in a room
+    
+    Args:
+        room_data: Room data dictionary
+        
+    Returns:
+        List of speaker sentiment dictionaries (with names), most positive first
+    """
+    participants = room_data["participants"]
+    speakers = []
+    for speaker_id in room_data["sentiment_history"].speakers:
+        analysis = get_speaker_sentiment_analysis(room_data, speaker_id)
+        participant = participants.get(speaker_id)
+        analysis["name"] = participant.get("name", f"User {speaker_id[:8]}") if participant else f"User {speaker_id[:8]}"
+        speakers.append(analysis)
+    
+    speakers.sort(key=lambda s: s["avg_sentiment"], reverse=True)
+    return speakers
+
 def detect_sentiment_alerts(room_data, threshold=-0.5, consecutive_count=3):
     """
     Detect if room sentiment is consistently negative
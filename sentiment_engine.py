@@ -0,0 +1,179 @@
+# sentiment_engine.py - Vectorized lexicon sentiment scoring
+import re
+from collections import deque
+
+import numpy as np
+
+# Runs of word characters, i.e. the lowercased text with punctuation treated as spaces
+TOKEN_PATTERN = re.compile(r"\w+")
+
+NEGATION_WINDOW = 2       # a negation affects the next 2 tokens
+NEGATION_FACTOR = -0.8    # negated sentiment flips with slightly reduced impact
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over token ids.
+
+    A scan follows one goto/failure transition per token, so matching all
+    patterns costs time linear in the text however large the lexicon is.
+    """
+
+    def __init__(self, patterns):
+        self.lengths = [len(pattern) for pattern in patterns]
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for token in pattern:
+                next_state = self.goto[state].get(token)
+                if next_state is None:
+                    next_state = self.goto[state][token] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(index)
+
+        # Failure links breadth-first; each state also reports its suffixes' patterns
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(token, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find_all(self, ids):
+        """Yield (start, end, pattern index) for every match, end exclusive"""
+        goto, fail, output, lengths = self.goto, self.fail, self.output, self.lengths
+        state = 0
+        for position, token in enumerate(ids):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for index in output[state]:
+                yield position + 1 - lengths[index], position + 1, index
+
+    def find(self, ids):
+        """Leftmost-longest non-overlapping matches as (start, end, pattern index)"""
+        matches = sorted(self.find_all(ids), key=lambda m: (m[0], m[0] - m[1]))
+        chosen = []
+        covered = 0
+        for start, end, index in matches:
+            if start >= covered:
+                chosen.append((start, end, index))
+                covered = end
+        return chosen
+
+
+class SentimentEngine:
+    """
+    Lexicon sentiment scorer that works on whole batches of texts.
+
+    Lexicon entries are words or phrases. Each text is tokenized once, its
+    tokens are mapped to ids and a PhraseMatcher splits it into lexicon
+    units. The batch is then scored as one unit array: intensifiers and
+    negation windows are shifted lookups over unit positions, and per-text
+    sums come from np.bincount.
+    """
+
+    def __init__(self, sentiment, intensifiers=None, negations=()):
+        # phrase tokens -> [weight, boost, negates]; one phrase can play several roles
+        entries = {}
+        for phrase, weight in sentiment.items():
+            entries.setdefault(tuple(tokenize(phrase)), [0.0, 1.0, False])[0] = float(weight)
+        for phrase, boost in (intensifiers or {}).items():
+            entries.setdefault(tuple(tokenize(phrase)), [0.0, 1.0, False])[1] = float(boost)
+        for phrase in negations:
+            entries.setdefault(tuple(tokenize(phrase)), [0.0, 1.0, False])[2] = True
+        entries.pop((), None)
+
+        # Token id 0 is reserved for words outside the lexicon
+        self.vocab = {}
+        for phrase in entries:
+            for token in phrase:
+                self.vocab.setdefault(token, len(self.vocab) + 1)
+
+        patterns = list(entries)
+        self._weight = np.array([entries[p][0] for p in patterns])
+        self._boost = np.array([entries[p][1] for p in patterns])
+        self._negates = np.array([entries[p][2] for p in patterns], dtype=bool)
+        self.matcher = PhraseMatcher([[self.vocab[token] for token in p] for p in patterns])
+
+    @classmethod
+    def from_lexicon(cls, lexicon):
+        """Build from a lexicon pack (see lexicons.load_lexicon)"""
+        return cls(lexicon["sentiment"], lexicon.get("intensifiers"), lexicon.get("negations", ()))
+
+    def tokenize(self, text):
+        return tokenize(text)
+
+    def encode(self, tokens):
+        """Lexicon ids for a token list"""
+        get = self.vocab.get
+        return [get(token, 0) for token in tokens]
+
+    def score(self, text):
+        """Score a single text, between -1 (negative) and 1 (positive)"""
+        return float(self.score_batch([text])[0])
+
+    def score_batch(self, texts):
+        """
+        Score many texts at once
+
+        Args:
+            texts: Sequence of strings
+
+        Returns:
+            NumPy array of scores between -1 (negative) and 1 (positive), one per text
+        """
+        unit_doc, unit_start, unit_end, unit_index = [], [], [], []
+        doc_offset = []
+        offset = 0
+        for doc, text in enumerate(texts):
+            ids = self.encode(self.tokenize(text))
+            doc_offset.append(offset)
+            for start, end, index in self.matcher.find(ids):
+                unit_doc.append(doc)
+                unit_start.append(offset + start)
+                unit_end.append(offset + end - 1)
+                unit_index.append(index)
+            offset += len(ids)
+
+        unit_doc = np.array(unit_doc, dtype=np.intp)
+        unit_start = np.array(unit_start, dtype=np.intp)
+        unit_index = np.array(unit_index, dtype=np.intp)
+        # Token position of each unit inside its own text
+        position = unit_start - np.array(doc_offset, dtype=np.intp)[unit_doc]
+
+        # Per global token: the boost of an intensifier ending there, and whether a negation ends there
+        boost_at = np.ones(offset + 1)
+        negation_at = np.zeros(offset + 1, dtype=bool)
+        boost_at[unit_end] = self._boost[unit_index]
+        negation_at[unit_end] = self._negates[unit_index]
+
+        # Intensifier: the unit right before, in the same text
+        boost = np.where(position >= 1, boost_at[unit_start - 1], 1.0)
+
+        # Negation: one ending within the previous NEGATION_WINDOW tokens of the same text
+        negated = np.zeros(unit_start.size, dtype=bool)
+        for shift in range(1, NEGATION_WINDOW + 1):
+            negated |= (position >= shift) & negation_at[unit_start - shift]
+
+        values = self._weight[unit_index] * boost
+        values = np.where(negated, values * NEGATION_FACTOR, values)
+
+        sums = np.bincount(unit_doc, weights=values, minlength=len(texts))
+        counts = np.bincount(unit_doc, weights=values != 0, minlength=len(texts))
+        # Texts without sentiment words have a zero sum, so dividing by 1 leaves them at 0
+        return np.clip(sums / np.maximum(counts, 1), -1.0, 1.0)
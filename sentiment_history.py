@@ -0,0 +1,164 @@
+# sentiment_history.py - Fixed-capacity, time-indexed sentiment history
+import bisect
+from array import array
+from collections import deque
+
+SENTIMENT_HISTORY_CAPACITY = 100   # entries kept per room
+POSITIVE_THRESHOLD = 0.2           # scores above count as positive
+NEGATIVE_THRESHOLD = -0.2          # scores below count as negative
+SPEAKER_RECENT_SCORES = 10         # recent scores kept per speaker
+
+
+class _Timestamps:
+    """Read-only sequence view of the timestamps, oldest first (for bisect)"""
+
+    def __init__(self, history):
+        self.history = history
+
+    def __len__(self):
+        return len(self.history)
+
+    def __getitem__(self, i):
+        return self.history._ts[self.history._slot(i)]
+
+
+class SentimentHistory:
+    """
+    Ring buffer of sentiment entries with parallel timestamp/score arrays.
+
+    Alongside each entry it stores running totals (score sum, positive and
+    negative counts) since the room started, so the sum over any suffix of
+    the buffer is one subtraction. Window lookups bisect the timestamps;
+    they are kept non-decreasing by clamping out-of-order appends to the
+    latest timestamp.
+
+    Per-speaker aggregates (count, running mean, recent scores) are updated
+    on every append and cover the whole meeting, not just the buffer.
+
+    Behaves like the list of entry dicts it replaces: append(), len(),
+    iteration and indexing/slicing (which return dicts).
+    """
+
+    def __init__(self, capacity=SENTIMENT_HISTORY_CAPACITY):
+        self.capacity = capacity
+        self._ts = array("d", bytes(8 * capacity))
+        self._score = array("d", bytes(8 * capacity))
+        self._sum = array("d", bytes(8 * capacity))
+        self._positive = array("q", bytes(8 * capacity))
+        self._negative = array("q", bytes(8 * capacity))
+        self._text = [None] * capacity
+        self._speaker = [None] * capacity
+        self._start = 0
+        self._count = 0
+        self.total_appended = 0
+        # Running totals just before the oldest kept entry
+        self._base = (0.0, 0, 0)
+        self.timestamps = _Timestamps(self)
+        self.speakers = {}
+
+    def _slot(self, i):
+        return (self._start + i) % self.capacity
+
+    def _totals(self, i):
+        """Running totals up to and including logical entry i (i = -1 is the base)"""
+        if i < 0:
+            return self._base
+        slot = self._slot(i)
+        return self._sum[slot], self._positive[slot], self._negative[slot]
+
+    def add(self, timestamp, score, text=None, speaker=None):
+        """Append one entry, evicting the oldest when full"""
+        last_sum, last_positive, last_negative = self._totals(self._count - 1)
+        if self._count:
+            timestamp = max(timestamp, self._ts[self._slot(self._count - 1)])
+
+        if self._count == self.capacity:
+            self._base = self._totals(0)
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        else:
+            slot = self._slot(self._count)
+            self._count += 1
+
+        self._ts[slot] = timestamp
+        self._score[slot] = score
+        self._sum[slot] = last_sum + score
+        self._positive[slot] = last_positive + (score > POSITIVE_THRESHOLD)
+        self._negative[slot] = last_negative + (score < NEGATIVE_THRESHOLD)
+        self._text[slot] = text
+        self._speaker[slot] = speaker
+        self.total_appended += 1
+
+        if speaker is not None:
+            aggregate = self.speakers.get(speaker)
+            if aggregate is None:
+                aggregate = self.speakers[speaker] = {
+                    "count": 0, "mean": 0.0, "recent": deque(maxlen=SPEAKER_RECENT_SCORES)}
+            aggregate["count"] += 1
+            aggregate["mean"] += (score - aggregate["mean"]) / aggregate["count"]
+            aggregate["recent"].append(score)
+
+    def append(self, entry):
+        """Append an entry dict with timestamp, score, text and speaker"""
+        self.add(entry["timestamp"], entry["score"], entry.get("text"), entry.get("speaker"))
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, i):
+        slot = self._slot(i)
+        return {
+            "timestamp": self._ts[slot],
+            "score": self._score[slot],
+            "text": self._text[slot],
+            "speaker": self._speaker[slot]
+        }
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("sentiment history index out of range")
+        return self._entry(index)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._entry(i)
+
+    def index_since(self, timestamp):
+        """Logical index of the first entry at or after timestamp"""
+        return bisect.bisect_left(self.timestamps, timestamp)
+
+    def scores(self, start=0):
+        """Scores from logical index start onwards"""
+        return [self._score[self._slot(i)] for i in range(start, self._count)]
+
+    def stats(self, start=0):
+        """
+        Aggregates over the entries from logical index start onwards, in O(1)
+
+        Returns:
+            Dictionary with count, mean and positive/neutral/negative counts
+        """
+        start = max(0, start + self._count if start < 0 else start)
+        count = self._count - start
+        if count <= 0:
+            return {"count": 0, "mean": 0.0, "positive_count": 0, "neutral_count": 0, "negative_count": 0}
+
+        end_sum, end_positive, end_negative = self._totals(self._count - 1)
+        start_sum, start_positive, start_negative = self._totals(start - 1)
+        positive = end_positive - start_positive
+        negative = end_negative - start_negative
+        return {
+            "count": count,
+            "mean": (end_sum - start_sum) / count,
+            "positive_count": positive,
+            "neutral_count": count - positive - negative,
+            "negative_count": negative
+        }
+
+    def stats_since(self, timestamp):
+        """Aggregates over the entries at or after timestamp, in O(log n)"""
+        return self.stats(self.index_since(timestamp))
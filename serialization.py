@@ -0,0 +1,90 @@
+# serialization.py - Pluggable JSON encoding for HTTP responses and Socket.IO packets
+import os
+import json
+import logging
+from collections import deque
+
+from flask.json.provider import DefaultJSONProvider
+
+from records import Record
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Configuration: "orjson" (when installed) or "json" for the standard library
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "orjson" if ORJSON_AVAILABLE else "json").lower()
+if JSON_BACKEND == "orjson" and not ORJSON_AVAILABLE:
+    logger.warning("JSON_BACKEND=orjson but orjson is not installed; using the json module")
+    JSON_BACKEND = "json"
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if ORJSON_AVAILABLE else 0
+_COMPACT = (",", ":")
+
+
+def default(obj):
+    """
+    Encode the non-JSON types that room state carries
+
+    Records become their dicts, NumPy scalars/arrays and array.array
+    become numbers/lists, sets and deques become lists.
+
+    Raises:
+        TypeError: For any other type
+    """
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset, deque)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj, default=default, sort_keys=False, indent=None, **kwargs):
+    """
+    JSON text of obj with the configured backend
+
+    Accepts the json.dumps arguments python-socketio and Flask pass
+    (separators, ensure_ascii, ...); output is always compact UTF-8
+    unless indent is given.
+
+    Returns:
+        str
+    """
+    if JSON_BACKEND == "orjson":
+        option = _ORJSON_OPTIONS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+    return json.dumps(obj, default=default, sort_keys=sort_keys, indent=indent,
+                      separators=None if indent else _COMPACT, ensure_ascii=False)
+
+
+def loads(s, **kwargs):
+    if JSON_BACKEND == "orjson":
+        return orjson.loads(s)
+    return json.loads(s)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider (jsonify, request.get_json) backed by dumps/loads"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj, default=self._default, sort_keys=kwargs.get("sort_keys", self.sort_keys),
+                     indent=kwargs.get("indent"))
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def _default(self, obj):
+        try:
+            return default(obj)
+        except TypeError:
+            return DefaultJSONProvider.default(obj)
@@ -1,19 +1,32 @@
 # server.py - Complete implementation with all features
 # Adaptive async mode for local development and production deployment
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
 from flask_socketio import SocketIO, join_room, leave_room, emit
 from collections import defaultdict
 import logging
 import os
+import re
 import time
 from datetime import datetime
 
+from lexicons import load_lexicon
+from sentiment_history import SentimentHistory
+from attention_window import RoomAttention
+from engagement_log import EngagementLog, engagement_score
+from records import Participant, TranscriptEntry, intern_id, to_dicts
+import serialization
+from serialization import FastJSONProvider, JSON_BACKEND
+from transcript_stats import TranscriptStats, BackgroundCorpus
+from downsampling import downsample_columns, parse_points
+from transcript_export import FORMATS as EXPORT_FORMATS, export_chunks, gzip_chunks, snapshot
+
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("agamai-platform")
 
 app = Flask(__name__, template_folder="templates", static_folder="static")
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'agamai-secret-key-2024')
+app.json = FastJSONProvider(app)
 
 # Determine the best async mode based on available packages
 def get_async_mode():
@@ -30,6 +43,18 @@ def get_async_mode():
 
 ASYNC_MODE = get_async_mode()
 log.info(f"Using async mode: {ASYNC_MODE}")
+log.info(f"JSON serialization: {JSON_BACKEND}")
+
+# Binary (msgpack) packets for clients that connect with ?serializer=msgpack
+try:
+    from msgpack_packets import HybridPacket, NegotiatingManager, NegotiatingServer, MSGPACK_AVAILABLE
+    MSGPACK_PACKETS = MSGPACK_AVAILABLE and os.environ.get("SOCKETIO_MSGPACK", "true").lower() in ("1", "true", "yes")
+    packet_options = {"serializer": HybridPacket, "client_manager": NegotiatingManager()} if MSGPACK_PACKETS else {}
+    log.info("msgpack packets module loaded successfully")
+except Exception as e:
+    log.warning("msgpack packets module not available: %s", e)
+    MSGPACK_PACKETS = False
+    packet_options = {}
 
 socketio = SocketIO(
     app,
@@ -38,19 +63,36 @@ socketio = SocketIO(
     logger=False,
     engineio_logger=False,
     ping_timeout=60,
-    ping_interval=25
+    ping_interval=25,
+    # Room emits without callbacks encode their packet once for all recipients
+    json=serialization,
+    **packet_options
 )
+if MSGPACK_PACKETS:
+    NegotiatingServer.adopt(socketio.server)
 
 # Global state
 rooms = defaultdict(set)
+room_snapshots = {}             # room -> (etag, encoded snapshot)
+SNAPSHOT_CHART_POINTS = 120
+SNAPSHOT_TRANSCRIPT_TAIL = 20
+# Meeting duration and decayed engagement scores change with time alone, so
+# a snapshot is also rebuilt once this many seconds have passed
+SNAPSHOT_MAX_AGE = float(os.environ.get("SNAPSHOT_MAX_AGE", 5))
+topic_corpus = BackgroundCorpus()
 room_data = defaultdict(lambda: {
     "transcript": [],
+    "transcript_stats": TranscriptStats(topic_corpus),
+    "version": 0,
     "participants": {},
     "engagement": {},
-    "sentiment_history": [],
+    "sentiment_history": SentimentHistory(),
     "meeting_start": time.time(),
     "network_stats": {},
-    "attention_scores": defaultdict(list)
+    "attention": RoomAttention(),
+    "audio_uploaders": {},
+    "recording": None,
+    "metrics": MetricsStore() if METRICS_ENABLED else None
 })
 
 # Import feature modules safely
@@ -61,7 +103,8 @@ try:
         rooms as trans_rooms,
         audio_workers,
         start_transcription_worker,
-        get_transcription_stats
+        get_transcription_stats,
+        get_caption_latency
     )
     TRANSCRIPTION_ENABLED = True
     log.info("Transcription module loaded successfully")
@@ -69,16 +112,101 @@ except Exception as e:
     log.warning("Transcription module not available: %s", e)
     TRANSCRIPTION_ENABLED = False
     handle_audio_chunk = audio_worker_for_room = trans_rooms = audio_workers = None
-    start_transcription_worker = get_transcription_stats = None
+    start_transcription_worker = get_transcription_stats = get_caption_latency = None
+
+try:
+    from uploader_election import register_audio_upload, release_audio_uploader
+    UPLOADER_ELECTION_ENABLED = True
+    log.info("Uploader election module loaded successfully")
+except Exception as e:
+    log.warning("Uploader election module not available: %s", e)
+    UPLOADER_ELECTION_ENABLED = False
+    register_audio_upload = release_audio_uploader = None
+
+try:
+    from broadcast import RoomBroadcaster
+    BROADCAST_BATCHING = os.environ.get("BROADCAST_BATCHING", "true").lower() in ("1", "true", "yes")
+    broadcaster = RoomBroadcaster(socketio, lambda room: rooms.get(room, ())) if BROADCAST_BATCHING else None
+    log.info("Broadcast module loaded successfully")
+except Exception as e:
+    log.warning("Broadcast module not available: %s", e)
+    BROADCAST_BATCHING = False
+    broadcaster = None
+
+try:
+    from participant_store import ParticipantStore, ENGAGEMENT_TICK_SECONDS
+    COLUMNAR_PARTICIPANTS = os.environ.get("COLUMNAR_PARTICIPANTS", "").lower() in ("1", "true", "yes")
+    participant_store = ParticipantStore() if COLUMNAR_PARTICIPANTS else None
+    log.info("Participant store module loaded successfully")
+except Exception as e:
+    log.warning("Participant store module not available: %s", e)
+    COLUMNAR_PARTICIPANTS = False
+    participant_store = None
+
+try:
+    from nudge_scheduler import NudgeScheduler, NUDGE_IDLE_SECONDS, NUDGE_ENGAGEMENT_THRESHOLD
+    AUTO_NUDGE = os.environ.get("AUTO_NUDGE", "true").lower() in ("1", "true", "yes")
+    nudge_scheduler = NudgeScheduler(
+        socketio,
+        check=lambda room, sid: nudge_due(room, sid),
+        notify=lambda room, sid: send_nudge(sid)
+    ) if AUTO_NUDGE else None
+    log.info("Nudge scheduler module loaded successfully")
+except Exception as e:
+    log.warning("Nudge scheduler module not available: %s", e)
+    AUTO_NUDGE = False
+    nudge_scheduler = None
+    NUDGE_IDLE_SECONDS, NUDGE_ENGAGEMENT_THRESHOLD = 300, 0.3
+
+try:
+    from timeseries import MetricsStore
+    METRICS_ENABLED = True
+    log.info("Metrics store module loaded successfully")
+except Exception as e:
+    log.warning("Metrics store module not available: %s", e)
+    METRICS_ENABLED = False
+    MetricsStore = None
+
+try:
+    from meeting_archive import archive_meeting, meeting_id_for, latest_meeting, load_meeting_meta, iter_transcript
+    from meeting_recorder import start_recording, stop_recording, start_batch_job, RECORD_MEETINGS
+    ARCHIVE_ENABLED = os.environ.get("ARCHIVE_MEETINGS", "true").lower() in ("1", "true", "yes")
+    log.info("Meeting archive module loaded successfully")
+except Exception as e:
+    log.warning("Meeting archive module not available: %s", e)
+    ARCHIVE_ENABLED = RECORD_MEETINGS = False
+    archive_meeting = meeting_id_for = latest_meeting = load_meeting_meta = iter_transcript = None
+    start_recording = stop_recording = start_batch_job = None
 
 try:
-    from summarizer import summarize_and_extract, get_summary_stats, GEMINI_AVAILABLE
+    from analytics import fleet, parse_quantiles
+    ANALYTICS_ENABLED = True
+    log.info("Analytics module loaded successfully")
+except Exception as e:
+    log.warning("Analytics module not available: %s", e)
+    ANALYTICS_ENABLED = False
+    fleet = None
+
+try:
+    from transcript_search import get_index as get_search_index, MAX_RESULTS as SEARCH_MAX_RESULTS
+    search_index = get_search_index()
+    SEARCH_ENABLED = search_index is not None
+    if SEARCH_ENABLED:
+        search_index.backfill()
+    log.info("Transcript search module loaded successfully")
+except Exception as e:
+    log.warning("Transcript search module not available: %s", e)
+    SEARCH_ENABLED = False
+    search_index = None
+
+try:
+    from summarizer import summarize_and_extract, GEMINI_AVAILABLE
     SUMMARIZER_ENABLED = True
     log.info(f"Summarizer module loaded successfully (Gemini AI: {'Available' if GEMINI_AVAILABLE else 'Fallback mode'})")
 except Exception as e:
     log.warning("Summarizer module not available: %s", e)
     SUMMARIZER_ENABLED = False
-    summarize_and_extract = get_summary_stats = None
+    summarize_and_extract = None
     GEMINI_AVAILABLE = False
 
 try:
@@ -111,7 +239,8 @@ try:
         update_room_sentiment,
         get_sentiment_graph,
         analyze_sentiment,
-        detect_sentiment_alerts
+        detect_sentiment_alerts,
+        get_room_speaker_sentiment
     )
     SENTIMENT_ENABLED = True
     log.info("Sentiment analysis module loaded successfully")
@@ -119,7 +248,7 @@ except Exception as e:
     log.warning("Sentiment analysis module not available: %s", e)
     SENTIMENT_ENABLED = False
     update_room_sentiment = get_sentiment_graph = None
-    analyze_sentiment = detect_sentiment_alerts = None
+    analyze_sentiment = detect_sentiment_alerts = get_room_speaker_sentiment = None
 
 # CORS headers
 @app.after_request
@@ -132,7 +261,7 @@ def after_request(response):
 # Routes
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return render_template('index.html', msgpack_packets=MSGPACK_PACKETS)
 
 @app.route('/dashboard')
 def dashboard():
@@ -158,9 +287,55 @@ def health_check():
         },
         "active_rooms": len(rooms),
         "total_participants": sum(len(participants) for participants in rooms.values()),
-        "transcription_stats": transcription_stats
+        "transcription_stats": transcription_stats,
+        "broadcast_stats": broadcaster.get_stats() if broadcaster is not None else {},
+        "nudge_stats": nudge_scheduler.get_stats() if nudge_scheduler is not None else {},
+        "search_stats": search_index.get_stats() if search_index is not None else {},
+        "json_backend": JSON_BACKEND,
+        "packet_stats": socketio.server.manager.get_stats() if MSGPACK_PACKETS else {}
     })
 
+@app.route('/analytics', methods=['GET'])
+def get_analytics():
+    """
+    Distributions of attention, engagement, sentiment, caption latency and
+    network stats across every room on this node. ?sketches=1 adds the raw
+    sketches, which merge exactly with other processes' (POST /analytics/merge).
+    """
+    if fleet is None:
+        return jsonify({"error": "Analytics not available"}), 500
+    try:
+        quantiles = parse_quantiles(request.args.get("quantiles"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    response = {
+        "timestamp": datetime.now().isoformat(),
+        "since": fleet.started_at,
+        "active_rooms": len(rooms),
+        "total_participants": sum(len(participants) for participants in rooms.values()),
+        "relative_accuracy": fleet.relative_accuracy,
+        "metrics": fleet.summary(quantiles)
+    }
+    if request.args.get("sketches") in ("1", "true"):
+        response["sketches"] = fleet.export()
+    return jsonify(response)
+
+@app.route('/analytics/merge', methods=['POST'])
+def merge_analytics():
+    """
+    Store the sketches another worker process exported, as {"worker": id,
+    "sketches": ...}; a later push from the same worker replaces them
+    """
+    if fleet is None:
+        return jsonify({"error": "Analytics not available"}), 500
+    try:
+        data = request.get_json(force=True) or {}
+        fleet.merge(data.get("worker"), data.get("sketches", {}))
+        return jsonify({"merged": True, "workers": len(fleet.remote), "metrics": fleet.metrics()})
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid sketches: {e}"}), 400
+
 @app.route('/transcription/status')
 def transcription_status():
     if not TRANSCRIPTION_ENABLED:
@@ -173,6 +348,17 @@ def transcription_status():
         "timestamp": datetime.now().isoformat()
     })
 
+@app.route('/transcription/latency/<room>')
+def transcription_latency(room):
+    if not TRANSCRIPTION_ENABLED:
+        return jsonify({"error": "Transcription not available"}), 500
+
+    return jsonify({
+        "room": room,
+        "caption_latency": get_caption_latency(room),
+        "timestamp": datetime.now().isoformat()
+    })
+
 def parse_ai_summary(ai_response):
     """
     Parse the AI response text and extract structured data for the frontend.
@@ -277,9 +463,9 @@ def summarize():
 
     # Get transcript from room data
     transcript_entries = room_data[room]["transcript"]
-    transcript_text = " ".join([entry.get("text", "") for entry in transcript_entries])
+    transcript_stats = room_data[room]["transcript_stats"]
 
-    if not transcript_text.strip():
+    if not transcript_stats.word_count:
         return jsonify({
             "result": {
                 "summary": "No transcript available for this room",
@@ -295,6 +481,7 @@ def summarize():
 
     try:
         # Generate AI summary (returns formatted text)
+        transcript_text = " ".join([entry.get("text", "") for entry in transcript_entries])
         ai_response = summarize_and_extract(
             transcript_text,
             include_sentiment=include_sentiment,
@@ -304,13 +491,8 @@ def summarize():
         # Parse the AI response into structured format
         structured_result = parse_ai_summary(ai_response)
 
-        # Get transcript statistics
-        stats = get_summary_stats(transcript_text) if get_summary_stats else {
-            "word_count": len(transcript_text.split()),
-            "sentence_count": len([s for s in transcript_text.split('.') if s.strip()]),
-            "estimated_duration": len(transcript_text.split()) / 150,
-            "key_topics": []
-        }
+        # Transcript statistics, maintained as entries arrive
+        stats = transcript_stats.summary()
 
         # Get meeting insights if available
         insights = {}
@@ -346,78 +528,132 @@ def adapt():
 @app.route('/engagement/<room>', methods=['GET'])
 def get_engagement_data(room):
     try:
-        data = room_data[room]
-        
-        # Calculate engagement metrics
-        participants = []
-        for sid, participant_data in data["participants"].items():
-            attention_scores = data["attention_scores"].get(sid, [])
-            avg_attention = sum(attention_scores) / len(attention_scores) if attention_scores else 0
-            
-            participants.append({
-                "sid": sid,
-                "name": participant_data.get("name", f"User {sid[:8]}"),
-                "engagement_score": participant_data.get("engagement_score", 0.5),
-                "speaking_time": participant_data.get("speaking_time", 0),
-                "avg_attention": avg_attention,
-                "last_activity": participant_data.get("last_activity", time.time())
-            })
-        
-        # Sort by engagement score
-        participants.sort(key=lambda x: x["engagement_score"], reverse=True)
-        
-        # Assign titles
-        leaderboard = []
-        for i, p in enumerate(participants):
-            if i == 0 and len(participants) > 1:
-                p["title"] = "🏆 Meeting Champ"
-            elif i == len(participants) - 1 and len(participants) > 1:
-                p["title"] = "🤫 Silent Listener"
-            else:
-                p["title"] = f"#{i+1} Participant"
-            leaderboard.append(p)
-        
-        # Calculate speaking distribution
-        total_speaking = sum(p["speaking_time"] for p in participants)
-        speaking_distribution = {}
-        
-        for p in participants:
-            speaking_distribution[p["sid"]] = {
-                "time": p["speaking_time"],
-                "percentage": (p["speaking_time"] / total_speaking * 100) if total_speaking > 0 else 0,
-                "name": p["name"]
-            }
+        return jsonify(engagement_view(room))
+    except Exception as e:
+        log.error(f"Engagement data error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+def engagement_view(room):
+    """Leaderboard, speaking distribution and attention summary of a room"""
+    data = room_data[room]
+    
+    # Calculate engagement metrics
+    participants = []
+    now = time.time()
+    for sid, participant_data in data["participants"].items():
+        avg_attention = data["attention"].mean(sid)
         
-        return jsonify({
-            "room": room,
-            "leaderboard": leaderboard,
-            "speaking_distribution": speaking_distribution,
-            "total_participants": len(participants),
-            "meeting_duration": time.time() - data["meeting_start"]
+        participants.append({
+            "sid": sid,
+            "name": participant_data.get("name", f"User {sid[:8]}"),
+            "engagement_score": engagement_score(participant_data, now),
+            "speaking_time": participant_data.get("speaking_time", 0),
+            "avg_attention": avg_attention,
+            "last_activity": participant_data.get("last_activity", time.time())
         })
-        
+    
+    # Sort by engagement score
+    participants.sort(key=lambda x: x["engagement_score"], reverse=True)
+    
+    # Assign titles
+    leaderboard = []
+    for i, p in enumerate(participants):
+        if i == 0 and len(participants) > 1:
+            p["title"] = "🏆 Meeting Champ"
+        elif i == len(participants) - 1 and len(participants) > 1:
+            p["title"] = "🤫 Silent Listener"
+        else:
+            p["title"] = f"#{i+1} Participant"
+        leaderboard.append(p)
+    
+    # Calculate speaking distribution
+    total_speaking = sum(p["speaking_time"] for p in participants)
+    speaking_distribution = {}
+    
+    for p in participants:
+        speaking_distribution[p["sid"]] = {
+            "time": p["speaking_time"],
+            "percentage": (p["speaking_time"] / total_speaking * 100) if total_speaking > 0 else 0,
+            "name": p["name"]
+        }
+    
+    return {
+        "room": room,
+        "leaderboard": leaderboard,
+        "speaking_distribution": speaking_distribution,
+        "total_participants": len(participants),
+        "meeting_duration": now - data["meeting_start"],
+        "room_attention": {
+            "mean": data["attention"].room_mean,
+            "variance": data["attention"].room_variance,
+            "samples": data["attention"].count
+        }
+    }
+
+@app.route('/room/<room>/snapshot', methods=['GET'])
+def get_room_snapshot(room):
+    """
+    Everything a dashboard refresh needs in one response, rebuilt when the
+    room's version changes or the SNAPSHOT_MAX_AGE time bucket rolls over.
+    Clients send the ETag back as If-None-Match and get 304 while neither
+    has changed.
+    """
+    try:
+        version = room_data[room]["version"]
+        bucket = int(time.time() // SNAPSHOT_MAX_AGE)
+        etag = f"{int(room_data[room]['meeting_start'])}-{version}-{bucket}"
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers={"ETag": f'"{etag}"'})
+
+        cached = room_snapshots.get(room)
+        if cached is None or cached[0] != etag:
+            cached = room_snapshots[room] = (etag, jsonify(build_room_snapshot(room, version)).get_data())
+        return Response(cached[1], mimetype="application/json", headers={"ETag": f'"{etag}"', "Cache-Control": "no-cache"})
     except Exception as e:
-        log.error(f"Engagement data error: {e}")
+        log.error(f"Room snapshot error: {e}")
         return jsonify({"error": str(e)}), 500
 
+def build_room_snapshot(room, version):
+    data = room_data[room]
+    sentiment_history = data["sentiment_history"]
+    overall_sentiment = sentiment_history.stats(-10)["mean"]
+    return {
+        "room": room,
+        "version": version,
+        "generated_at": time.time(),
+        "engagement": engagement_view(room),
+        "sentiment": {
+            "sentiment_history": sentiment_timeline(room, SNAPSHOT_CHART_POINTS),
+            "overall_sentiment": overall_sentiment,
+            "trend": "positive" if overall_sentiment > 0.2 else "negative" if overall_sentiment < -0.2 else "neutral"
+        },
+        "transcript_tail": to_dicts(data["transcript"][-SNAPSHOT_TRANSCRIPT_TAIL:]),
+        "total_entries": len(data["transcript"]),
+        "transcript_stats": data["transcript_stats"].summary(),
+        "insights": calculate_meeting_insights(data) if ENGAGEMENT_ENABLED else {}
+    }
+
 @app.route('/sentiment/<room>', methods=['GET'])
 def get_sentiment_data(room):
     try:
         sentiment_history = room_data[room]["sentiment_history"]
+        points = parse_points(request.args.get("points"))
         
         # Format sentiment data for frontend
-        formatted_data = []
-        for entry in sentiment_history[-50:]:  # Last 50 entries
-            formatted_data.append({
-                "timestamp": entry["timestamp"],
-                "score": entry["score"],
-                "trend": "positive" if entry["score"] > 0.2 else "negative" if entry["score"] < -0.2 else "neutral",
-                "text_snippet": entry.get("text", "")[:50]
-            })
+        if points:
+            formatted_data = sentiment_timeline(room, points)
+        else:
+            formatted_data = []
+            for entry in sentiment_history[-50:]:  # Last 50 entries
+                formatted_data.append({
+                    "timestamp": entry["timestamp"],
+                    "score": entry["score"],
+                    "trend": "positive" if entry["score"] > 0.2 else "negative" if entry["score"] < -0.2 else "neutral",
+                    "text_snippet": entry.get("text", "")[:50]
+                })
         
-        # Calculate overall sentiment
-        recent_scores = [entry["score"] for entry in sentiment_history[-10:]]
-        overall_sentiment = sum(recent_scores) / len(recent_scores) if recent_scores else 0
+        # Calculate overall sentiment over the last 10 entries
+        overall_sentiment = sentiment_history.stats(-10)["mean"]
         
         return jsonify({
             "room": room,
@@ -426,46 +662,226 @@ def get_sentiment_data(room):
             "trend": "positive" if overall_sentiment > 0.2 else "negative" if overall_sentiment < -0.2 else "neutral"
         })
         
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         log.error(f"Sentiment data error: {e}")
         return jsonify({"error": str(e)}), 500
 
+def sentiment_timeline(room, points):
+    """Whole-meeting sentiment timeline downsampled to at most `points` entries"""
+    series = room_data[room]["metrics"].query("sentiment") if METRICS_ENABLED else None
+    if series is None:
+        # No metric history; fall back to the entries still in the ring buffer
+        entries = room_data[room]["sentiment_history"][:]
+        series = {
+            "t": [entry["timestamp"] for entry in entries],
+            "mean": [entry["score"] for entry in entries],
+            "text": [(entry.get("text") or "")[:50] for entry in entries]
+        }
+    series = downsample_columns(series, "t", "mean", points)
+    texts = series.get("text") or [""] * len(series["t"])
+    return [{
+        "timestamp": ts,
+        "score": score,
+        "trend": "positive" if score > 0.2 else "negative" if score < -0.2 else "neutral",
+        "text_snippet": text
+    } for ts, score, text in zip(series["t"], series["mean"], texts)]
+
+@app.route('/sentiment/<room>/speakers', methods=['GET'])
+def get_speaker_sentiment_data(room):
+    """Per-speaker sentiment breakdown from incrementally maintained aggregates"""
+    if not SENTIMENT_ENABLED:
+        return jsonify({"error": "Sentiment analysis not available"}), 500
+    try:
+        speakers = get_room_speaker_sentiment(room_data[room])
+        return jsonify({
+            "room": room,
+            "speakers": speakers,
+            "total_speakers": len(speakers)
+        })
+    except Exception as e:
+        log.error(f"Speaker sentiment error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/metrics/<room>', methods=['GET'])
+def get_metrics_data(room):
+    """Metric history; without ?metric= lists the available series"""
+    if not METRICS_ENABLED:
+        return jsonify({"error": "Metrics store not available"}), 500
+    try:
+        metrics = room_data[room]["metrics"]
+        metric = request.args.get("metric")
+        if not metric:
+            return jsonify({"room": room, "series": metrics.describe()})
+
+        sid = request.args.get("sid")
+        since = request.args.get("since", type=float)
+        resolution = request.args.get("resolution", type=int)
+        points = parse_points(request.args.get("points"))
+        series = metrics.query(metric, sid, since, resolution)
+        if series is None:
+            return jsonify({"error": f"No {metric} series"}), 404
+        if points:
+            series = downsample_columns(series, "t", "mean", points)
+
+        return jsonify({"room": room, "metric": metric, "sid": sid or "room", **series})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        log.error(f"Metrics data error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/transcript/<room>', methods=['GET'])
 def get_transcript(room):
     try:
         transcript = room_data[room]["transcript"]
         return jsonify({
             "room": room,
-            "transcript": transcript,
+            "transcript": to_dicts(transcript),
             "total_entries": len(transcript)
         })
     except Exception as e:
         log.error(f"Transcript error: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/transcript/<room>/export', methods=['GET'])
+def export_transcript(room):
+    """
+    Stream a transcript as NDJSON, CSV, SRT or plain text
+
+    Query parameters: format (ndjson, csv, srt, txt), meeting (archived
+    meeting id; by default the live room, else its latest archived meeting),
+    download=1 for an attachment. Gzipped when the client accepts it.
+    """
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unknown export format: {fmt}"}), 400
+
+    meeting_id = request.args.get("meeting")
+    if meeting_id is None and room in room_data and (room in rooms or room_data[room]["transcript"]):
+        source, entries = "live", snapshot(room_data[room]["transcript"])
+    else:
+        if meeting_id is None and latest_meeting is not None:
+            meeting_id = latest_meeting(room)
+        try:
+            if not meeting_id or load_meeting_meta is None or load_meeting_meta(meeting_id) is None:
+                return jsonify({"error": "No live or archived transcript found"}), 404
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        source, entries = meeting_id, iter_transcript(meeting_id)
+
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    body = export_chunks(entries, fmt)
+    headers = {"X-Transcript-Source": source, "Vary": "Accept-Encoding"}
+    if request.accept_encodings["gzip"] > 0:
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    if request.args.get("download") in ("1", "true"):
+        name = re.sub(r"[^A-Za-z0-9_-]", "_", source if source != "live" else room)
+        headers["Content-Disposition"] = f'attachment; filename="transcript-{name}.{extension}"'
+
+    return Response(stream_with_context(body), content_type=f"{mimetype}; charset=utf-8", headers=headers)
+
+@app.route('/transcript/<room>/stats', methods=['GET'])
+def get_transcript_stats(room):
+    """Running word/sentence counts and current topics of a room's transcript"""
+    try:
+        topics = min(int(request.args.get("topics", 5)), 50)
+        return jsonify({
+            "room": room,
+            "total_entries": room_data[room]["transcript_stats"].entries,
+            "stats": room_data[room]["transcript_stats"].summary(topics)
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/search', methods=['GET'])
+def search_transcripts():
+    """Full-text search over live and archived transcripts"""
+    if search_index is None:
+        return jsonify({"error": "Transcript search not enabled"}), 500
+
+    args = request.args
+    try:
+        started = time.perf_counter()
+        results = search_index.search(
+            args.get("q", ""),
+            room=args.get("room"),
+            speaker=args.get("speaker"),
+            since=float(args["since"]) if args.get("since") else None,
+            until=float(args["until"]) if args.get("until") else None,
+            limit=int(args.get("limit", 20))
+        )
+        return jsonify({
+            "query": args.get("q", ""),
+            "results": results,
+            "count": len(results),
+            "max_results": SEARCH_MAX_RESULTS,
+            "took_ms": round((time.perf_counter() - started) * 1000, 2)
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        log.error(f"Search error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/recording/<room>', methods=['POST'])
+def toggle_recording(room):
+    """Opt a room in or out of audio recording for deferred batch transcription"""
+    if start_recording is None:
+        return jsonify({"error": "Recording not available"}), 500
+
+    data = request.get_json(force=True) or {}
+    if data.get("enabled", True):
+        meeting_id = meeting_id_for(room, room_data[room]["meeting_start"])
+        room_data[room]["recording"] = start_recording(room, meeting_id).meeting_id
+    else:
+        # Audio recorded so far is still batch transcribed when the meeting ends
+        stop_recording(room)
+
+    return jsonify({
+        "room": room,
+        "recording": room_data[room]["recording"],
+        "enabled": bool(data.get("enabled", True))
+    })
+
+@app.route('/engagement/leaderboards', methods=['GET'])
+def get_all_leaderboards():
+    """Leaderboards of every room on this node from the last engagement tick"""
+    if participant_store is None:
+        return jsonify({"error": "Columnar participant store not enabled"}), 500
+    return jsonify({
+        "tick": participant_store.last_tick,
+        "participants": len(participant_store),
+        "leaderboards": {
+            room: [{"sid": sid, "engagement_score": score} for sid, score in board]
+            for room, board in participant_store.leaderboards.items()
+        }
+    })
+
 @app.route('/nudge', methods=['POST'])
 def nudge_participants():
+    """
+    Fire any due nudges now and report when each participant of the room is
+    checked next. Without the scheduler (AUTO_NUDGE=false) the room's
+    participants are scanned on demand instead, and next_check is empty.
+    """
     data = request.get_json(force=True)
     room = data.get("room", "default")
-    
+
     try:
-        nudged = []
-        room_participants = room_data[room]["participants"]
-        current_time = time.time()
-        
-        for sid, participant_data in room_participants.items():
-            last_activity = participant_data.get("last_activity", current_time)
-            engagement_score = participant_data.get("engagement_score", 0.5)
-            
-            # Nudge if inactive for more than 5 minutes and low engagement
-            if (current_time - last_activity > 300) and engagement_score < 0.3:
-                socketio.emit('nudge', {
-                    "message": "You've been quiet for a while. Would you like to share your thoughts?",
-                    "type": "engagement"
-                }, room=sid)
-                nudged.append(sid)
-        
-        return jsonify({"nudged": nudged, "count": len(nudged)})
+        participants = list(room_data[room]["participants"]) if room in room_data else []
+        if nudge_scheduler is None:
+            nudged = [sid for sid in participants if nudge_due(room, sid)]
+            for sid in nudged:
+                send_nudge(sid)
+            return jsonify({"nudged": nudged, "count": len(nudged), "next_check": {}})
+
+        nudged = [sid for nudged_room, sid in nudge_scheduler.run_due() if nudged_room == room]
+        next_check = {sid: nudge_scheduler.deadline(room, sid) for sid in participants}
+
+        return jsonify({"nudged": nudged, "count": len(nudged), "next_check": next_check})
 
     except Exception as e:
         log.error(f"Nudge error: {e}")
@@ -501,46 +917,48 @@ def add_test_data(room):
         if room not in room_data:
             room_data[room] = {
                 "transcript": [],
+                "transcript_stats": TranscriptStats(topic_corpus),
+                "version": 0,
                 "participants": {},
                 "engagement": {},
-                "sentiment_history": [],
+                "sentiment_history": SentimentHistory(),
                 "meeting_start": time.time(),
                 "network_stats": {},
-                "attention_scores": defaultdict(list)
+                "attention": RoomAttention(),
+                "audio_uploaders": {},
+                "recording": None,
+                "metrics": MetricsStore() if METRICS_ENABLED else None
             }
 
         # Add test participants
         for i, participant in enumerate(test_participants):
             sid = f"test_user_{i+1}"
-            room_data[room]["participants"][sid] = {
-                "name": participant["name"],
-                "engagement_score": participant["engagement"],
-                "speaking_time": participant["speaking_time"],
-                "last_activity": time.time()
-            }
+            room_data[room]["participants"][sid] = Participant(
+                participant["name"],
+                time.time(),
+                speaking_time=participant["speaking_time"],
+                engagement=EngagementLog(baseline=participant["engagement"])
+            )
             # Add attention scores
-            room_data[room]["attention_scores"][sid] = [participant["attention"]] * 10
+            for _ in range(10):
+                room_data[room]["attention"].add(sid, participant["attention"])
+            sync_participant(room, sid)
 
         # Add test transcript and sentiment
         for i, msg in enumerate(test_messages):
             ts = int(time.time()) - (len(test_messages) - i) * 30  # Spread over last 5 minutes
 
             # Add transcript entry
-            room_data[room]["transcript"].append({
-                "ts": ts,
-                "text": msg["text"],
-                "sid": f"test_user_{(i % len(test_participants)) + 1}",
-                "speaker": test_participants[i % len(test_participants)]["name"],
-                "sentiment": msg["sentiment"]
-            })
+            sid = intern_id(f"test_user_{(i % len(test_participants)) + 1}")
+            room_data[room]["transcript"].append(TranscriptEntry(
+                ts, msg["text"], sid, test_participants[i % len(test_participants)]["name"],
+                sentiment=msg["sentiment"]
+            ))
+            room_data[room]["transcript_stats"].add(msg["text"])
 
             # Add sentiment entry
-            room_data[room]["sentiment_history"].append({
-                "timestamp": ts,
-                "score": msg["sentiment"],
-                "text": msg["text"][:100],
-                "speaker": f"test_user_{(i % len(test_participants)) + 1}"
-            })
+            room_data[room]["sentiment_history"].add(ts, msg["sentiment"], msg["text"][:100], sid)
+        mark_room_changed(room)
 
         return jsonify({
             "message": "Test data added successfully",
@@ -563,16 +981,26 @@ def on_connect():
 @socketio.on('disconnect')
 def on_disconnect():
     log.info(f"Client disconnected: {request.sid}")
+    if broadcaster is not None:
+        broadcaster.forget(request.sid)
     # Clean up from all rooms
     for room in list(rooms.keys()):
         if request.sid in rooms[room]:
             rooms[room].discard(request.sid)
             if request.sid in room_data[room]["participants"]:
                 del room_data[room]["participants"][request.sid]
+            room_data[room]["attention"].remove(request.sid)
+            if participant_store is not None:
+                participant_store.remove(room, request.sid)
+            if nudge_scheduler is not None:
+                nudge_scheduler.remove(room, request.sid)
+            release_uploads(room, request.sid)
+            mark_room_changed(room)
             emit('peer-left', {"sid": request.sid}, room=room)
             
             if not rooms[room]:  # Room is empty
                 del rooms[room]
+                finish_meeting(room)
                 del room_data[room]
 
 @socketio.on('join')
@@ -582,16 +1010,17 @@ def on_join(data):
     
     # Add to room
     rooms[room].add(request.sid)
+    if RECORD_MEETINGS and not room_data[room]["recording"]:
+        room_data[room]["recording"] = start_recording(room, meeting_id_for(room, room_data[room]["meeting_start"])).meeting_id
     
     # Initialize participant data
-    room_data[room]["participants"][request.sid] = {
-        "name": data.get("name", f"User {request.sid[:8]}"),
-        "joined_at": time.time(),
-        "last_activity": time.time(),
-        "speaking_time": 0,
-        "engagement_score": 0.5,
-        "attention_scores": []
-    }
+    now = time.time()
+    room_data[room]["participants"][intern_id(request.sid)] = Participant(
+        data.get("name", f"User {request.sid[:8]}"), now, engagement=EngagementLog(), joined_at=now
+    )
+    sync_participant(room, request.sid)
+    touch_participant(room, request.sid)
+    mark_room_changed(room)
     
     # Send existing peers to new participant
     existing_peers = [sid for sid in rooms[room] if sid != request.sid]
@@ -606,16 +1035,26 @@ def on_join(data):
 def on_leave(data):
     room = data.get('room', 'default')
     leave_room(room)
+    if broadcaster is not None:
+        broadcaster.leave(room, request.sid)
     
     if request.sid in rooms[room]:
         rooms[room].discard(request.sid)
         if request.sid in room_data[room]["participants"]:
             del room_data[room]["participants"][request.sid]
+        room_data[room]["attention"].remove(request.sid)
+        if participant_store is not None:
+            participant_store.remove(room, request.sid)
+        if nudge_scheduler is not None:
+            nudge_scheduler.remove(room, request.sid)
+        release_uploads(room, request.sid)
+        mark_room_changed(room)
         
         emit('peer-left', {"sid": request.sid}, room=room)
         
         if not rooms[room]:  # Room is empty
             del rooms[room]
+            finish_meeting(room)
             del room_data[room]
     
     log.info(f"User {request.sid} left room {room}")
@@ -653,6 +1092,14 @@ def handle_audio_chunk(data):
     if not audio_data:
         return
 
+    # Only the elected uploader's copy of each speaker is transcribed
+    if UPLOADER_ELECTION_ENABLED:
+        accepted, notices = register_audio_upload(room_data[room], from_sid, request.sid)
+        for sid, payload in notices:
+            socketio.emit('audio-uploader', payload, to=sid)
+        if not accepted:
+            return
+
     try:
         # Import transcription module if available
         if TRANSCRIPTION_ENABLED:
@@ -665,6 +1112,94 @@ def handle_audio_chunk(data):
     except Exception as e:
         log.error(f"Error handling audio chunk: {e}")
 
+def finish_meeting(room):
+    """Archive a meeting whose last participant left and start batch re-transcription"""
+    room_snapshots.pop(room, None)
+    if participant_store is not None:
+        participant_store.remove_room(room)
+    if search_index is not None:
+        search_index.assign_meeting(room, meeting_id_for(room, room_data[room]["meeting_start"]))
+    if not ARCHIVE_ENABLED and not room_data[room]["recording"]:
+        return
+    try:
+        stop_recording(room)
+        meeting_id = room_data[room]["recording"]
+        server_entries = trans_rooms[room]["transcript"] if TRANSCRIPTION_ENABLED and room in trans_rooms else []
+        archive_meeting(room, room_data[room], server_entries)
+        if room_data[room]["transcript_stats"].entries:
+            topic_corpus.add_document(room_data[room]["transcript_stats"].document_terms())
+        if meeting_id:
+            start_batch_job(meeting_id)
+    except Exception as e:
+        log.error(f"Error archiving meeting in {room}: {e}")
+
+engagement_ticker_started = False
+
+def sync_participant(room, sid):
+    """Mirror a participant's engagement sums into the columnar store (when enabled)"""
+    if participant_store is None or sid not in room_data[room]["participants"]:
+        return
+    participant_store.sync(room, sid, room_data[room]["participants"][sid])
+    global engagement_ticker_started
+    if not engagement_ticker_started:
+        engagement_ticker_started = True
+        socketio.start_background_task(engagement_ticker)
+
+def engagement_ticker():
+    """Periodic vectorized pass scoring every participant and ordering every room's leaderboard"""
+    while True:
+        socketio.sleep(ENGAGEMENT_TICK_SECONDS)
+        try:
+            participant_store.tick()
+        except Exception as e:
+            log.error(f"Engagement tick error: {e}")
+
+def touch_participant(room, sid):
+    """Push a participant's inactivity nudge deadline out after activity"""
+    if nudge_scheduler is not None:
+        nudge_scheduler.touch(room, sid)
+
+def nudge_due(room, sid):
+    """Whether an idle participant should be nudged now (None once they have left)"""
+    if room not in room_data or sid not in room_data[room]["participants"]:
+        return None
+    if ENGAGEMENT_ENABLED:
+        return should_nudge_participant(room_data[room], sid, NUDGE_IDLE_SECONDS / 60)
+    participant = room_data[room]["participants"][sid]
+    return (time.time() - participant.get("last_activity", time.time()) > NUDGE_IDLE_SECONDS
+            and engagement_score(participant) < NUDGE_ENGAGEMENT_THRESHOLD)
+
+def send_nudge(sid):
+    socketio.emit('nudge', {
+        "message": "You've been quiet for a while. Would you like to share your thoughts?",
+        "type": "engagement"
+    }, to=sid)
+
+def broadcast_update(room, event, key, payload, include_self=True):
+    """Send a last-value-wins room update, batched per tick when the broadcaster is enabled"""
+    if broadcaster is not None:
+        broadcaster.publish(room, event, key, payload, exclude=None if include_self else request.sid)
+    else:
+        emit(event, payload, room=room, include_self=include_self)
+
+def record_metric(room, metric, value, sid=None, ts=None):
+    """Add a sample to the room's multi-resolution metric history and the node-wide sketches"""
+    if METRICS_ENABLED:
+        room_data[room]["metrics"].record(metric, value, sid, ts)
+    if fleet is not None:
+        fleet.record(metric, value)
+
+def mark_room_changed(room):
+    """Bump the room's version so the next snapshot request rebuilds it"""
+    room_data[room]["version"] += 1
+
+def release_uploads(room, sid):
+    """Fail over audio uploads handled by a participant that left the room"""
+    if not UPLOADER_ELECTION_ENABLED:
+        return
+    for target, payload in release_audio_uploader(room_data[room], sid):
+        socketio.emit('audio-uploader', payload, to=target)
+
 @socketio.on('transcript-text')
 def handle_transcript_text(data):
     room = data.get('room', 'default')
@@ -675,30 +1210,28 @@ def handle_transcript_text(data):
         return
 
     # Store transcript
-    entry = {
-        "ts": ts,
-        "text": text,
-        "sid": request.sid,
-        "speaker": room_data[room]["participants"].get(request.sid, {}).get("name", f"User {request.sid[:8]}")
-    }
+    participant = room_data[room]["participants"].get(request.sid)
+    entry = TranscriptEntry(ts, text, request.sid, participant.name if participant else f"User {request.sid[:8]}")
 
     room_data[room]["transcript"].append(entry)
+    room_data[room]["transcript_stats"].add(text)
+    if search_index is not None:
+        search_index.add(room, entry)
 
     # Update participant activity and engagement
-    if request.sid in room_data[room]["participants"]:
-        participant = room_data[room]["participants"][request.sid]
-        participant["last_activity"] = time.time()
-        participant["speaking_time"] += len(text.split()) * 0.5  # Estimate speaking time
+    if participant is not None:
+        participant.last_activity = time.time()
+        participant.speaking_time += len(text.split()) * 0.5  # Estimate speaking time
 
         # Update engagement using the engagement module
+        words_count = len(text.split())
         if ENGAGEMENT_ENABLED:
-            words_count = len(text.split())
             update_engagement(room_data[room], request.sid, "speaking", words_count)
         else:
-            # Fallback engagement calculation
-            words_count = len(text.split())
-            engagement_boost = min(0.1, words_count / 50)
-            participant["engagement_score"] = min(1.0, participant["engagement_score"] + engagement_boost)
+            participant.engagement.add("speaking", participant.last_activity, words_count)
+        record_metric(room, "engagement", engagement_score(participant), request.sid)
+        sync_participant(room, request.sid)
+        touch_participant(room, request.sid)
 
     # Analyze sentiment using the sentiment analysis module
     if SENTIMENT_ENABLED:
@@ -706,15 +1239,12 @@ def handle_transcript_text(data):
     else:
         # Fallback sentiment analysis
         sentiment_score = analyze_simple_sentiment(text)
-        room_data[room]["sentiment_history"].append({
-            "timestamp": ts,
-            "score": sentiment_score,
-            "text": text[:100],
-            "speaker": request.sid
-        })
+        room_data[room]["sentiment_history"].add(ts, sentiment_score, text[:100], entry.sid)
 
     # Add sentiment to entry
-    entry["sentiment"] = sentiment_score
+    entry.sentiment = sentiment_score
+    record_metric(room, "sentiment", sentiment_score, request.sid)
+    mark_room_changed(room)
 
     # Check for sentiment alerts
     if SENTIMENT_ENABLED:
@@ -723,7 +1253,7 @@ def handle_transcript_text(data):
             emit('sentiment-alert', alert, room=room)
 
     # Broadcast transcript update
-    emit('transcript-update', {"room": room, "entry": entry}, room=room)
+    emit('transcript-update', {"room": room, "entry": entry.to_dict()}, room=room)
 
     log.info(f"Transcript from {request.sid} in {room}: {text[:50]}...")
 
@@ -762,25 +1292,27 @@ def handle_attention(data):
     room = data.get('room', 'default')
     score = float(data.get('score', 0.0))
     
-    # Store attention score
-    room_data[room]["attention_scores"][request.sid].append(score)
-    
-    # Keep only last 20 scores
-    if len(room_data[room]["attention_scores"][request.sid]) > 20:
-        room_data[room]["attention_scores"][request.sid] = room_data[room]["attention_scores"][request.sid][-20:]
+    # Store attention score (fixed-size window with a running mean)
+    room_data[room]["attention"].add(request.sid, score)
+    record_metric(room, "attention", score, request.sid)
+    mark_room_changed(room)
     
     # Update participant data
     if request.sid in room_data[room]["participants"]:
         participant = room_data[room]["participants"][request.sid]
-        participant["last_activity"] = time.time()
         
         # Update engagement based on attention
-        attention_scores = room_data[room]["attention_scores"][request.sid]
-        avg_attention = sum(attention_scores) / len(attention_scores)
-        participant["engagement_score"] = (participant["engagement_score"] * 0.7) + (avg_attention * 0.3)
+        if ENGAGEMENT_ENABLED:
+            update_engagement(room_data[room], request.sid, "attention", score)
+        else:
+            participant.last_activity = time.time()
+            participant.engagement.add("attention", participant.last_activity, score)
+        record_metric(room, "engagement", engagement_score(participant), request.sid)
+        sync_participant(room, request.sid)
+        touch_participant(room, request.sid)
     
-    # Broadcast attention update
-    emit('attention-update', {"sid": request.sid, "score": score}, room=room)
+    # Broadcast attention update (coalesced per tick when batching)
+    broadcast_update(room, 'attention-update', request.sid, {"sid": request.sid, "score": score})
 
 @socketio.on('network-stats')
 def handle_network_stats(data):
@@ -788,12 +1320,17 @@ def handle_network_stats(data):
     stats = data.get('stats', {})
 
     # Store network stats
-    room_data[room]["network_stats"][request.sid] = {
+    room_data[room]["network_stats"][request.sid] = latest = {
         "timestamp": time.time(),
         "rtt": stats.get("rtt", 0),
         "packet_loss": stats.get("packet_loss", 0),
         "bandwidth": stats.get("bandwidth", 1000)
     }
+    for metric in ("rtt", "packet_loss", "bandwidth"):
+        try:
+            record_metric(room, metric, latest[metric], request.sid, latest["timestamp"])
+        except (TypeError, ValueError):
+            pass  # non-numeric stat from the client
 
     # Evaluate network and suggest adaptation
     if NETWORK_ADAPTATION_ENABLED:
@@ -816,33 +1353,34 @@ def handle_network_quality_change(data):
 
     # Store the participant's current network quality state
     if request.sid in room_data[room]["participants"]:
-        room_data[room]["participants"][request.sid]["network_quality"] = quality
-        room_data[room]["participants"][request.sid]["communication_mode"] = mode
-        room_data[room]["participants"][request.sid]["mode_label"] = mode_label
+        participant = room_data[room]["participants"][request.sid]
+        participant.network_quality = quality
+        participant.communication_mode = mode
+        participant.mode_label = mode_label
 
     # Broadcast to other participants in the room (exclude sender)
-    emit('participant-network-quality-change', {
+    broadcast_update(room, 'participant-network-quality-change', from_sid, {
         "room": room,
         "quality": quality,
         "mode": mode,
         "modeLabel": mode_label,
         "participantId": from_sid,
         "timestamp": time.time()
-    }, room=room, include_self=False)
+    }, include_self=False)
 
 def analyze_simple_sentiment(text):
-    """Simple sentiment analysis"""
-    positive_words = {'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'love', 'like', 'happy', 'excited', 'agree', 'yes', 'perfect', 'awesome', 'brilliant'}
-    negative_words = {'bad', 'terrible', 'awful', 'hate', 'dislike', 'sad', 'angry', 'frustrated', 'disagree', 'no', 'wrong', 'problem', 'issue', 'concern', 'worried'}
-    
-    words = text.lower().split()
-    positive_count = sum(1 for word in words if word in positive_words)
-    negative_count = sum(1 for word in words if word in negative_words)
+    """Simple sentiment analysis (single-word entries of the shared lexicon)"""
+    try:
+        lexicon = load_lexicon()["sentiment"]
+    except Exception as e:
+        log.error(f"Lexicon error: {e}")
+        return 0
     
+    words = re.findall(r"\w+", text.lower())
     if len(words) == 0:
         return 0
     
-    sentiment = (positive_count - negative_count) / len(words)
+    sentiment = sum(lexicon.get(word, 0) for word in words) / len(words)
     return max(-1, min(1, sentiment * 5))
 
 if __name__ == '__main__':
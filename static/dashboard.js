@@ -5,6 +5,9 @@ document.addEventListener('DOMContentLoaded', () => {
   let sentimentChart = null;
   let updateInterval = null;
 
+  // Timelines are downsampled server-side to about one point per few pixels
+  const CHART_POINTS = 120;
+
   // Get room from URL parameters
   const urlParams = new URLSearchParams(window.location.search);
   room = urlParams.get('room') || 'testroom';
@@ -88,93 +91,51 @@ document.addEventListener('DOMContentLoaded', () => {
     });
   }
 
-  async function loadDashboardData() {
-    try {
-      // Load engagement data
-      await loadEngagementData();
-      
-      // Load sentiment data
-      await loadSentimentData();
-      
-      // Load transcript data
-      await loadTranscriptData();
-      
-      // Load meeting metrics
-      await loadMeetingMetrics();
-      
-    } catch (error) {
-      console.error('Error loading dashboard data:', error);
-    }
-  }
+  // ETag of the last snapshot shown; the server answers 304 while the room is unchanged
+  let snapshotEtag = null;
 
-  async function loadEngagementData() {
+  async function loadDashboardData() {
     try {
-      const response = await fetch(`/engagement/${room}`);
-      const data = await response.json();
-      
-      if (data.leaderboard) {
-        updateLeaderboard(data.leaderboard);
+      const headers = snapshotEtag ? { 'If-None-Match': snapshotEtag } : {};
+      const response = await fetch(`/room/${room}/snapshot`, { headers });
+      if (response.status === 304) {
+        return;
       }
-      
-      if (data.speaking_distribution) {
-        updateSpeakingDistribution(data.speaking_distribution);
-      }
-      
-      // Update metrics
-      if (data.leaderboard.length > 0) {
-        const avgEngagement = data.leaderboard.reduce((sum, p) => sum + p.engagement_score, 0) / data.leaderboard.length;
-        const avgAttention = data.leaderboard.reduce((sum, p) => sum + p.avg_attention, 0) / data.leaderboard.length;
-        
-        document.getElementById('engagementScore').textContent = Math.round(avgEngagement * 100) + '%';
-        document.getElementById('avgAttention').textContent = Math.round(avgAttention * 100) + '%';
-        document.getElementById('participantCount').textContent = data.leaderboard.length;
-      }
-      
-    } catch (error) {
-      console.error('Error loading engagement data:', error);
-    }
-  }
-
-  async function loadSentimentData() {
-    try {
-      const response = await fetch(`/sentiment/${room}`);
       const data = await response.json();
-      
-      if (data.sentiment_history && data.sentiment_history.length > 0) {
-        updateSentimentChart(data.sentiment_history);
-        updateSentimentStats(data);
+      if (!response.ok) {
+        throw new Error(data.error || `HTTP ${response.status}`);
       }
+      snapshotEtag = response.headers.get('ETag');
+
+      updateEngagement(data.engagement);
+      updateSentiment(data.sentiment);
+      updateRecentTranscript(data.transcript_tail.slice(-10)); // Show last 10 entries
+      updateMeetingDuration(data.engagement.meeting_duration);
       
     } catch (error) {
-      console.error('Error loading sentiment data:', error);
+      console.error('Error loading dashboard data:', error);
     }
   }
 
-  async function loadTranscriptData() {
-    try {
-      const response = await fetch(`/transcript/${room}`);
-      const data = await response.json();
-      
-      if (data.transcript && data.transcript.length > 0) {
-        updateRecentTranscript(data.transcript.slice(-10)); // Show last 10 entries
-      }
+  function updateEngagement(data) {
+    updateLeaderboard(data.leaderboard);
+    updateSpeakingDistribution(data.leaderboard);
+    
+    // Update metrics
+    if (data.leaderboard.length > 0) {
+      const avgEngagement = data.leaderboard.reduce((sum, p) => sum + p.engagement_score, 0) / data.leaderboard.length;
+      const avgAttention = data.leaderboard.reduce((sum, p) => sum + p.avg_attention, 0) / data.leaderboard.length;
       
-    } catch (error) {
-      console.error('Error loading transcript data:', error);
+      document.getElementById('engagementScore').textContent = Math.round(avgEngagement * 100) + '%';
+      document.getElementById('avgAttention').textContent = Math.round(avgAttention * 100) + '%';
+      document.getElementById('participantCount').textContent = data.leaderboard.length;
     }
   }
 
-  async function loadMeetingMetrics() {
-    try {
-      const response = await fetch(`/health`);
-      const data = await response.json();
-      
-      // Update meeting duration (this would need to be tracked properly)
-      // For now, we'll use a placeholder
-      updateMeetingDuration();
-      
-    } catch (error) {
-      console.error('Error loading meeting metrics:', error);
+  function updateSentiment(data) {
+    if (data.sentiment_history && data.sentiment_history.length > 0) {
+      updateSentimentChart(data.sentiment_history);
+      updateSentimentStats({ overall_sentiment: data.trend });
     }
   }
 
@@ -293,11 +254,8 @@ document.addEventListener('DOMContentLoaded', () => {
     `).join('');
   }
 
-  function updateMeetingDuration() {
-    // This would need to be properly implemented with actual meeting start time
-    const startTime = Date.now() - (Math.random() * 3600000); // Random duration for demo
-    const duration = Date.now() - startTime;
-    document.getElementById('meetingDuration').textContent = formatTime(Math.floor(duration / 1000));
+  function updateMeetingDuration(seconds) {
+    document.getElementById('meetingDuration').textContent = formatTime(Math.floor(seconds));
   }
 
   function formatTime(seconds) {
@@ -327,29 +285,13 @@ document.addEventListener('DOMContentLoaded', () => {
     }, 300);
   };
 
-  window.downloadTranscript = async function() {
-    try {
-      const response = await fetch(`/transcript/${room}`);
-      const data = await response.json();
-      
-      if (data.transcript && data.transcript.length > 0) {
-        const transcriptText = data.transcript.map(entry => 
-          `[${new Date(entry.ts * 1000).toLocaleTimeString()}] ${entry.speaker || 'Unknown'}: ${entry.text}`
-        ).join('\n');
-        
-        const blob = new Blob([transcriptText], { type: 'text/plain' });
-        const url = URL.createObjectURL(blob);
-        const a = document.createElement('a');
-        a.href = url;
-        a.download = `transcript-${room}-${new Date().toISOString().split('T')[0]}.txt`;
-        document.body.appendChild(a);
-        a.click();
-        document.body.removeChild(a);
-        URL.revokeObjectURL(url);
-      }
-    } catch (error) {
-      console.error('Error downloading transcript:', error);
-    }
+  window.downloadTranscript = function() {
+    // Streamed (and gzipped) by the server; the browser saves it directly
+    const a = document.createElement('a');
+    a.href = `/transcript/${encodeURIComponent(room)}/export?format=txt&download=1`;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
   };
 
   // Generate summary handler
@@ -1,6 +1,7 @@
 // Complete main.js with all features working
 document.addEventListener('DOMContentLoaded', () => {
-  const socket = io();
+  // The server sends msgpack packets to clients that ask for them (see index.html)
+  const socket = io({ query: { serializer: window.SOCKET_SERIALIZER || 'json' } });
   const pcs = {};
   let localStream = null;
   let joined = false;
@@ -14,6 +15,7 @@ document.addEventListener('DOMContentLoaded', () => {
   
   // Charts
   let sentimentChart = null;
+  const CHART_POINTS = 120; // server-side downsampling target for timelines
   
   // Audio context for attention detection
   let audioContext = null;
@@ -282,8 +284,35 @@ document.addEventListener('DOMContentLoaded', () => {
     await handleIceCandidate(data);
   });
   
+  // Interim server-side captions, replaced by the final transcript-update
+  const partialTranscripts = {};
+
+  socket.on('transcript-partial', (data) => {
+    let el = partialTranscripts[data.segment_id];
+    if (!el) {
+      el = document.createElement('div');
+      el.className = 'transcript-entry interim-transcript';
+      partialTranscripts[data.segment_id] = el;
+      transcriptBox.appendChild(el);
+    }
+    const speaker = data.sid === socket.id ? 'You' : data.speaker || `User ${(data.sid || 'unknown').slice(0, 8)}`;
+    el.innerHTML = `
+      <div class="transcript-meta">
+        <span><strong>${speaker}</strong></span>
+        <span>${new Date(data.ts * 1000).toLocaleTimeString()} …</span>
+      </div>
+      <div class="transcript-text"><em>${data.text}</em></div>
+    `;
+    transcriptBox.scrollTop = transcriptBox.scrollHeight;
+  });
+
   socket.on('transcript-update', (data) => {
     log('Transcript update:', data.entry.text.substring(0, 50));
+    const partial = data.entry.segment_id && partialTranscripts[data.entry.segment_id];
+    if (partial) {
+      partial.remove();
+      delete partialTranscripts[data.entry.segment_id];
+    }
     appendTranscript(data.entry);
     if (currentTab === 'insights') {
       updateSentimentChart();
@@ -303,19 +332,38 @@ document.addEventListener('DOMContentLoaded', () => {
     appendTranscript(entry);
   });
   
-  socket.on('attention-update', (data) => {
+  function onAttentionUpdate(data) {
     log(`Attention from ${data.sid}: ${Math.round(data.score * 100)}%`);
     updateParticipantAttention(data.sid, data.score);
-  });
+  }
+
+  function onParticipantNetworkQualityChange(data) {
+    log(`Participant ${data.participantId} changed network quality: ${data.quality}% (${data.modeLabel})`);
+    handleRemoteParticipantNetworkChange(data);
+  }
+
+  socket.on('attention-update', onAttentionUpdate);
   
   socket.on('network-adaptation', (data) => {
     log('Network adaptation:', data.mode);
     handleNetworkAdaptation(data.mode, data.stats);
   });
 
-  socket.on('participant-network-quality-change', (data) => {
-    log(`Participant ${data.participantId} changed network quality: ${data.quality}% (${data.modeLabel})`);
-    handleRemoteParticipantNetworkChange(data);
+  socket.on('participant-network-quality-change', onParticipantNetworkQualityChange);
+
+  // Batched high-rate updates (one message per server tick, latest value per key)
+  const roomUpdateHandlers = {
+    'attention-update': onAttentionUpdate,
+    'participant-network-quality-change': onParticipantNetworkQualityChange
+  };
+
+  socket.on('room-updates', (batch, ack) => {
+    (batch.updates || []).forEach(update => {
+      const handler = roomUpdateHandlers[update.event];
+      if (handler) handler(update.data);
+    });
+    // Acknowledge so the server sends the next batch to this client
+    if (typeof ack === 'function') ack();
   });
   
   socket.on('nudge', (data) => {
@@ -784,6 +832,14 @@ document.addEventListener('DOMContentLoaded', () => {
   const remoteAudioContexts = {};
   const remoteAudioProcessors = {};
 
+  // Speakers whose audio another client has been elected to upload
+  const suppressedUploads = {};
+
+  socket.on('audio-uploader', (data) => {
+    suppressedUploads[data.speaker] = !data.upload;
+    log(`${data.upload ? 'Uploading' : 'Not uploading'} audio for ${data.speaker}`);
+  });
+
   function setupRemoteAudioCapture(remoteSid, stream) {
     try {
       // Skip if already set up
@@ -816,14 +872,12 @@ document.addEventListener('DOMContentLoaded', () => {
 
       let audioBuffer = [];
       let lastSend = Date.now();
-      const SEND_INTERVAL = 5000; // Send audio chunks every 5 seconds
+      const SEND_INTERVAL = 500; // Short chunks; the server VAD cuts segments at pauses
 
       processor.onaudioprocess = (event) => {
         const inputData = event.inputBuffer.getChannelData(0);
 
-        // Only process if there's significant audio
-        const volume = Math.sqrt(inputData.reduce((sum, val) => sum + val * val, 0) / inputData.length);
-        if (volume < 0.01) return; // Skip silent audio
+        // Silence is kept: the server-side VAD drops it and needs the pauses to endpoint
 
         // Convert to 16-bit PCM with reduced precision
         const pcmData = new Int16Array(Math.floor(inputData.length / 4)); // Downsample
@@ -860,6 +914,8 @@ document.addEventListener('DOMContentLoaded', () => {
   }
 
   function sendAudioChunkToServer(remoteSid, audioBuffer) {
+    if (suppressedUploads[remoteSid]) return;
+
     try {
       // Limit buffer size to prevent stack overflow
       if (audioBuffer.length === 0) return;
@@ -915,6 +971,8 @@ document.addEventListener('DOMContentLoaded', () => {
   }
 
   function cleanupRemoteAudioCapture(remoteSid) {
+    delete suppressedUploads[remoteSid];
+
     if (remoteAudioContexts[remoteSid]) {
       try {
         remoteAudioContexts[remoteSid].close();
@@ -1415,7 +1473,7 @@ document.addEventListener('DOMContentLoaded', () => {
     if (!room) return;
     
     try {
-      const response = await fetch(`/sentiment/${room}`);
+      const response = await fetch(`/sentiment/${room}?points=${CHART_POINTS}`);
       const data = await response.json();
       
       if (data.sentiment_history && sentimentChart) {
@@ -2004,32 +2062,14 @@ document.addEventListener('DOMContentLoaded', () => {
   });
   
   // Download transcript
-  document.getElementById('downloadTranscript')?.addEventListener('click', async () => {
+  document.getElementById('downloadTranscript')?.addEventListener('click', () => {
     if (!room) return;
     
-    try {
-      const response = await fetch(`/transcript/${room}`);
-      const data = await response.json();
-      
-      if (data.transcript) {
-        const transcript = data.transcript.map(entry => 
-          `[${new Date(entry.ts * 1000).toLocaleString()}] ${entry.speaker || 'Unknown'}: ${entry.text}`
-        ).join('\n');
-        
-        const blob = new Blob([transcript], { type: 'text/plain' });
-        const url = URL.createObjectURL(blob);
-        const a = document.createElement('a');
-        a.href = url;
-        a.download = `meeting-transcript-${room}-${new Date().toISOString().slice(0, 10)}.txt`;
-        a.click();
-        URL.revokeObjectURL(url);
-        
-        showNotification('Transcript downloaded', 'success');
-      }
-    } catch (error) {
-      log('Error downloading transcript:', error);
-      showNotification('Failed to download transcript', 'error');
-    }
+    // Streamed (and gzipped) by the server; the browser saves it directly
+    const a = document.createElement('a');
+    a.href = `/transcript/${encodeURIComponent(room)}/export?format=txt&download=1`;
+    a.click();
+    showNotification('Transcript download started', 'success');
   });
   
   // Add CSS animation for flash effect
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for DDSketch quantiles and node-wide analytics
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from analytics import DDSketch, FleetAnalytics, parse_quantiles, RELATIVE_ACCURACY
+
+
+def exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize("values", [
+    np.random.default_rng(1).lognormal(0, 2, 20000).tolist(),     # caption latency-like
+    np.random.default_rng(2).uniform(-1, 1, 20000).tolist(),      # sentiment-like, signed
+    [0.0] * 100 + [0.5] * 100
+])
+def test_quantiles_within_relative_accuracy(values):
+    sketch = DDSketch()
+    for value in values:
+        sketch.add(value)
+    for q in (0.01, 0.25, 0.5, 0.9, 0.95, 0.99):
+        expected = exact(values, q)
+        assert sketch.quantile(q) == pytest.approx(expected, rel=RELATIVE_ACCURACY, abs=1e-9)
+    assert sketch.summary()["count"] == len(values)
+
+
+def test_merge_matches_single_sketch_and_round_trips():
+    rng = random.Random(5)
+    values = [rng.random() for _ in range(5000)]
+    whole, left, right = DDSketch(), DDSketch(), DDSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+
+    left.merge(DDSketch.from_dict(right.to_dict()))
+    for q in (0.5, 0.95):
+        assert left.quantile(q) == whole.quantile(q)
+    with pytest.raises(ValueError):
+        left.merge(DDSketch(0.05))
+
+
+def test_fleet_analytics_merges_exports():
+    node_a, node_b = FleetAnalytics(), FleetAnalytics()
+    for value in (0.2, 0.4, 0.6):
+        node_a.record("attention", value)
+    node_b.record("attention", 0.8)
+    node_b.record("caption_latency", 1.5)
+
+    node_a.merge("b", node_b.export())
+    summary = node_a.summary((0.5,))
+    assert summary["attention"]["count"] == 4
+    assert summary["attention"]["max"] == 0.8
+    assert summary["caption_latency"]["p50"] == pytest.approx(1.5, rel=RELATIVE_ACCURACY)
+    assert DDSketch().quantile(0.5) is None
+    assert node_a.metrics() == ["attention", "caption_latency"]
+    assert "caption_latency" not in node_a.export()
+
+
+def test_merging_the_same_worker_again_replaces_its_sketches():
+    node_a, node_b = FleetAnalytics(), FleetAnalytics()
+    node_a.record("attention", 0.2)
+    node_b.record("attention", 0.4)
+    node_a.merge("b", node_b.export())
+    node_a.merge("b", node_b.export())
+    assert node_a.summary()["attention"]["count"] == 2
+
+    node_b.record("attention", 0.6)
+    node_a.merge("b", node_b.export())
+    assert node_a.summary()["attention"]["count"] == 3
+    assert node_a.sketches["attention"].count == 1
+
+
+@pytest.mark.parametrize("change", [
+    {"positive": {"1": "a"}},
+    {"positive": {"x": 1}, "count": 1},
+    {"negative": {"1": -1}, "count": -1},
+    {"count": 5},
+    {"alpha": 0.05},
+    {"alpha": 2},
+    {"sum": None},
+])
+def test_invalid_exports_are_rejected_and_nothing_is_stored(change):
+    node_a, node_b = FleetAnalytics(), FleetAnalytics()
+    node_b.record("attention", 0.5)
+    exported = node_b.export()
+    exported["attention"].update(change)
+    with pytest.raises(ValueError):
+        node_a.merge("b", exported)
+    assert node_a.remote == {}
+    with pytest.raises(ValueError):
+        node_a.merge("", node_b.export())
+
+
+def test_parse_quantiles():
+    assert parse_quantiles(None) == (0.5, 0.9, 0.95, 0.99)
+    assert parse_quantiles("0.5,0.75") == (0.5, 0.75)
+    with pytest.raises(ValueError):
+        parse_quantiles("95")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for the running-sum attention windows
+"""
+
+import random
+import statistics
+
+import pytest
+
+from attention_window import AttentionWindow, RoomAttention
+
+
+def test_window_mean_and_variance_match_recomputation():
+    random.seed(7)
+    window = AttentionWindow(size=20)
+    history = []
+    for _ in range(2500):  # crosses a periodic re-sum
+        score = random.random()
+        window.add(score)
+        history.append(score)
+        kept = history[-20:]
+        assert window.mean == pytest.approx(statistics.fmean(kept))
+        assert window.variance == pytest.approx(statistics.pvariance(kept), abs=1e-9)
+    assert window.scores() == history[-20:]
+
+
+def test_room_totals_track_windows():
+    room = RoomAttention(size=3)
+    for score in (0.1, 0.2, 0.3, 0.4):
+        room.add("a", score)
+    room.add("b", 1.0)
+    assert room.count == 4
+    assert room.room_mean == pytest.approx((0.2 + 0.3 + 0.4 + 1.0) / 4)
+    assert room.mean("a") == pytest.approx(0.3)
+    assert room.mean("missing") == 0.0
+
+    room.remove("b")
+    assert room.count == 3
+    assert room.room_mean == pytest.approx(0.3)
+    room.remove("a")
+    assert room.count == 0 and room.room_mean == 0.0
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled transcription backend clients against a local fake
+speech server (no network access needed)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import backend_clients
+import transcription_backends
+from backend_clients import GoogleSpeechClient
+
+
+class FakeSpeechServer:
+    """Google web speech API stand-in that can fail, stall and count connections"""
+
+    def __init__(self, fail_first=0, delay=0.0):
+        self.fail_first = fail_first
+        self.delay = delay
+        self.requests = 0
+        self.connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with fake.lock:
+                    fake.requests += 1
+                    fake.connections.add(self.client_address)
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                    failing = fake.requests <= fake.fail_first
+                time.sleep(fake.delay)
+                with fake.lock:
+                    fake.in_flight -= 1
+
+                if failing:
+                    body = b"busy"
+                    self.send_response(503)
+                else:
+                    body = (json.dumps({"result": []}) + "\n" + json.dumps({
+                        "result": [{"alternative": [{"transcript": "hello world"}], "final": True}]
+                    }) + "\n").encode()
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/recognize"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_connections_are_reused():
+    server = FakeSpeechServer()
+    try:
+        client = GoogleSpeechClient(url=server.url, max_in_flight=1)
+        for _ in range(5):
+            assert client.transcribe(b"\x00\x01" * 100) == "hello world"
+        assert server.requests == 5
+        assert len(server.connections) == 1
+    finally:
+        server.close()
+
+
+def test_transient_failures_are_retried(monkeypatch):
+    monkeypatch.setattr(backend_clients, "backoff_delay", lambda attempt: 0)
+    server = FakeSpeechServer(fail_first=2)
+    try:
+        client = GoogleSpeechClient(url=server.url, max_retries=3)
+        assert client.transcribe(b"\x00\x01" * 100) == "hello world"
+        assert client.stats["retries"] == 2
+        assert client.stats["failures"] == 0
+    finally:
+        server.close()
+
+
+def test_in_flight_requests_are_bounded():
+    server = FakeSpeechServer(delay=0.05)
+    try:
+        client = GoogleSpeechClient(url=server.url, max_in_flight=2)
+        threads = [threading.Thread(target=client.transcribe, args=(b"\x00\x01" * 100,)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert server.requests == 8
+        assert server.max_in_flight <= 2
+        assert len(server.connections) <= 2
+    finally:
+        server.close()
+
+
+def test_backoff_is_jittered_and_capped():
+    delays = [backend_clients.backoff_delay(10) for _ in range(50)]
+    assert all(0 <= d <= backend_clients.BACKOFF_CAP_SECONDS for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_google_endpoint_defaults_to_https():
+    assert backend_clients.GOOGLE_SPEECH_URL.startswith("https://")
+
+
+def test_google_backend_is_gated_only_on_the_key(monkeypatch):
+    monkeypatch.setattr(transcription_backends, "GOOGLE_SPEECH_KEY", None)
+    assert not transcription_backends.GoogleSpeechBackend.is_available()
+    monkeypatch.setattr(transcription_backends, "GOOGLE_SPEECH_KEY", "test-key")
+    assert transcription_backends.GoogleSpeechBackend.is_available()
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the coalesced room broadcaster (with a fake Socket.IO server)
+"""
+
+from broadcast import ACK_TIMEOUT_SECONDS, RoomBroadcaster
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.sent = []
+        self.callbacks = {}
+
+    def start_background_task(self, target):
+        pass
+
+    def emit(self, event, data, to=None, callback=None):
+        self.sent.append((to, event, data))
+        self.callbacks[to] = callback
+
+
+def updates_for(sio, sid):
+    return [u for to, _, data in sio.sent if to == sid for u in data["updates"]]
+
+
+def test_last_value_wins_within_a_tick():
+    sio = FakeSocketIO()
+    members = {"r": ["a", "b"]}
+    broadcaster = RoomBroadcaster(sio, lambda room: members.get(room, ()))
+    for score in (0.1, 0.2, 0.3):
+        broadcaster.publish("r", "attention-update", "a", {"sid": "a", "score": score})
+    broadcaster.publish("r", "attention-update", "b", {"sid": "b", "score": 0.9})
+    broadcaster.flush(now=0)
+
+    assert len(sio.sent) == 2  # one batch per client
+    assert updates_for(sio, "a") == [
+        {"event": "attention-update", "data": {"sid": "a", "score": 0.3}},
+        {"event": "attention-update", "data": {"sid": "b", "score": 0.9}},
+    ]
+
+
+def test_excluded_sender_and_slow_consumers():
+    sio = FakeSocketIO()
+    broadcaster = RoomBroadcaster(sio, lambda room: ["a", "b"])
+    broadcaster.publish("r", "participant-network-quality-change", "a", {"q": 1}, exclude="a")
+    broadcaster.flush(now=0)
+    assert updates_for(sio, "a") == []
+    assert len(updates_for(sio, "b")) == 1
+
+    # b has not acknowledged: newer values coalesce instead of queueing up
+    for q in (2, 3, 4):
+        broadcaster.publish("r", "participant-network-quality-change", "a", {"q": q}, exclude="a")
+        broadcaster.flush(now=1)
+    assert len(updates_for(sio, "b")) == 1
+    assert broadcaster.get_stats()["backlog"] == 1
+
+    sio.callbacks["b"]()
+    broadcaster.flush(now=2)
+    assert updates_for(sio, "b")[-1]["data"] == {"q": 4}
+
+    # A lost acknowledgement only delays delivery until the timeout
+    broadcaster.publish("r", "participant-network-quality-change", "a", {"q": 5}, exclude="a")
+    broadcaster.flush(now=3)
+    assert updates_for(sio, "b")[-1]["data"] == {"q": 4}
+    broadcaster.flush(now=3 + ACK_TIMEOUT_SECONDS)
+    assert updates_for(sio, "b")[-1]["data"] == {"q": 5}
+
+
+def test_leaving_a_room_drops_its_queued_updates():
+    sio = FakeSocketIO()
+    members = {"r1": ["a", "b"], "r2": ["a"]}
+    broadcaster = RoomBroadcaster(sio, lambda room: members.get(room, ()))
+    broadcaster.publish("r1", "attention-update", "b", {"score": 0.1})
+    broadcaster.flush(now=0)
+
+    # a has not acknowledged, so newer updates wait in its queue
+    broadcaster.publish("r1", "attention-update", "b", {"score": 0.2})
+    broadcaster.publish("r2", "attention-update", "c", {"score": 0.7})
+    broadcaster.flush(now=1)
+    assert broadcaster.get_stats()["backlog"] == 3
+
+    members["r1"].remove("a")
+    broadcaster.leave("r1", "a")
+    sio.callbacks["a"]()
+    broadcaster.flush(now=2)
+    assert updates_for(sio, "a")[1:] == [{"event": "attention-update", "data": {"score": 0.7}}]
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for LTTB chart downsampling
+"""
+
+import numpy as np
+import pytest
+
+from downsampling import downsample_columns, lttb_indices, parse_points
+
+
+def test_keeps_endpoints_and_target_size():
+    x = np.arange(1000.0)
+    y = np.sin(x / 50)
+    kept = lttb_indices(x, y, 50)
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_keeps_spikes():
+    y = np.zeros(500)
+    y[123] = 10.0
+    y[321] = -10.0
+    kept = lttb_indices(np.arange(500.0), y, 20)
+    assert 123 in kept and 321 in kept
+
+
+def test_short_series_pass_through():
+    assert list(lttb_indices([1, 2, 3], [0, 1, 0], 10)) == [0, 1, 2]
+
+
+def test_columns_stay_aligned():
+    columns = {"resolution": 10, "t": list(range(100)), "mean": [i % 7 for i in range(100)],
+               "max": [i % 7 + 1 for i in range(100)]}
+    reduced = downsample_columns(columns, "t", "mean", 10)
+    assert reduced["resolution"] == 10
+    assert len(reduced["t"]) == len(reduced["max"]) == 10
+    assert all(m == reduced["mean"][i] + 1 for i, m in enumerate(reduced["max"]))
+
+
+def test_points_validation():
+    assert parse_points(None) is None
+    assert parse_points("50") == 50
+    assert parse_points("100000") == 2000
+    with pytest.raises(ValueError):
+        parse_points("2")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
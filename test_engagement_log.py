@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the time-decayed engagement event log
+"""
+
+import math
+import random
+
+import pytest
+
+from engagement_log import (
+    EngagementLog, engagement_score, ENGAGEMENT_DECAY_SECONDS, PRIOR_WEIGHT
+)
+
+
+def test_score_is_closed_form_decayed_mean():
+    log = EngagementLog(baseline=0.5)
+    log.add("attention", 0.0, 1.0)
+    log.add("attention", 100.0, 0.0)
+    d0 = math.exp(-200.0 / ENGAGEMENT_DECAY_SECONDS)
+    d1 = math.exp(-100.0 / ENGAGEMENT_DECAY_SECONDS)
+    expected = (1.0 * d0 + PRIOR_WEIGHT * 0.5) / (d0 + d1 + PRIOR_WEIGHT)
+    assert log.score(200.0) == pytest.approx(expected)
+
+
+def test_score_does_not_depend_on_event_order():
+    events = [("attention", t * 3.0, random.Random(t).random()) for t in range(200)]
+    events += [("speaking", 50.0, 12), ("interaction", 400.0, None)]
+    forward, shuffled = EngagementLog(), EngagementLog()
+    for event in events:
+        forward.add(*event)
+    for event in random.Random(1).sample(events, len(events)):
+        shuffled.add(*event)
+    assert shuffled.score(700.0) == pytest.approx(forward.score(700.0))
+
+
+def test_idle_participant_returns_to_baseline():
+    log = EngagementLog(baseline=0.5)
+    for t in range(20):
+        log.add("attention", float(t), 0.1)
+    assert log.score(20.0) < 0.3
+    assert log.score(20.0 + 20 * ENGAGEMENT_DECAY_SECONDS) == pytest.approx(0.5, abs=1e-3)
+
+
+def test_scores_are_cached_per_version():
+    log = EngagementLog()
+    log.add("speaking", 10.0, 5)
+    log.score(10.2)
+    log._cache = -1.0
+    assert log.score(10.7) == -1.0      # same version, same quantum
+    log.add("attention", 11.0, 0.0)
+    assert log.score(11.0) != -1.0
+
+
+def test_engagement_score_defaults_without_log():
+    assert engagement_score({}) == 0.5
+    with pytest.raises(ValueError):
+        EngagementLog().add("waving", 0.0)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
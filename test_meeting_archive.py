@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk meeting archive
+"""
+
+import pytest
+
+import meeting_archive
+from meeting_archive import (
+    archive_meeting, iter_transcript, latest_meeting, list_meetings, load_meeting_meta, meeting_id_for,
+    meeting_path, replace_transcript
+)
+from records import Participant, TranscriptEntry
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(meeting_archive, "ARCHIVE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def room_data(start):
+    return {
+        "meeting_start": start,
+        "transcript": [TranscriptEntry(start + 5, "second", "a", "Alice")],
+        "participants": {"b": Participant("Bob", start)}
+    }
+
+
+def test_archive_merges_and_orders_entries():
+    extra = [{"ts": 1001, "text": "first", "sid": "c", "speaker": "Carol"}]
+    meeting_id = archive_meeting("team room", room_data(1000), extra)
+    assert meeting_id == "team_room-1000"
+
+    assert [e["text"] for e in iter_transcript(meeting_id)] == ["first", "second"]
+    meta = load_meeting_meta(meeting_id)
+    assert meta["room"] == "team room"
+    assert meta["transcript_entries"] == 2
+    assert meta["participants"] == {"a": "Alice", "b": "Bob", "c": "Carol"}
+
+
+def test_replace_transcript_updates_meta():
+    meeting_id = archive_meeting("r", room_data(1000))
+    replace_transcript(meeting_id, [{"ts": 1, "text": "batch"}], source="batch")
+    assert [e["text"] for e in iter_transcript(meeting_id)] == ["batch"]
+    assert load_meeting_meta(meeting_id)["transcript_source"] == "batch"
+
+
+def test_lists_meetings_and_finds_the_latest():
+    for start in (3000, 1000, 2000):
+        archive_meeting("r", room_data(start))
+    archive_meeting("r-other", room_data(4000))
+    assert list_meetings() == ["r-1000", "r-2000", "r-3000", "r-other-4000"]
+    assert latest_meeting("r") == "r-3000"
+    assert latest_meeting("missing") is None
+    assert load_meeting_meta("r-9") is None
+    assert list(iter_transcript("r-9")) == []
+
+
+def test_rejects_unsafe_meeting_ids():
+    assert meeting_id_for("../etc", 1) == "___etc-1"
+    with pytest.raises(ValueError):
+        meeting_path("../etc")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
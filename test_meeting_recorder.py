@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for meeting audio recording
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import meeting_archive
+import meeting_recorder
+from meeting_archive import archive_meeting, iter_transcript
+from meeting_recorder import (
+    MeetingRecorder, SpeakerRecording, _read_speaker, batch_backend, record_audio, run_batch_job,
+    start_recording, stop_recording
+)
+from records import TranscriptEntry
+from voice_activity import SAMPLE_RATE
+
+
+@pytest.fixture(autouse=True)
+def recordings_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(meeting_recorder, "RECORDINGS_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def recorded_meeting(tmp_path, monkeypatch):
+    """An archived meeting whose speaker "a" was recorded saying one sentence"""
+    monkeypatch.setattr(meeting_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(meeting_recorder, "get_search_index", lambda: None)
+    monkeypatch.setattr(meeting_recorder, "BATCH_WORKERS", 1)
+    live = [TranscriptEntry(1002, "live caption", "a", "Alice"),
+            TranscriptEntry(1001, "typed by web speech", "b", "Bob"),
+            TranscriptEntry(1010, "still here", "b", "Bob")]
+    meeting_id = archive_meeting("room", {"meeting_start": 1000, "transcript": live, "participants": {}})
+
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    speech = (5000 * np.sin(2 * np.pi * 200 * t)).astype("<i2").tobytes()
+    recorder = MeetingRecorder(meeting_id)
+    recorder.write("a", bytes(SAMPLE_RATE), 1003.0)
+    recorder.write("a", speech, 1003.5)
+    recorder.write("a", bytes(SAMPLE_RATE * 2), 1004.5)
+    recorder.close()
+    return meeting_id
+
+
+def test_reads_back_writes_in_order(tmp_path):
+    recording = SpeakerRecording(str(tmp_path / "s1"))
+    recording.write(b"A" * 10, 100.0)
+    recording.write(b"B" * 6, 101.0)
+    recording.close()
+    assert list(_read_speaker(str(tmp_path / "s1"))) == [(b"A" * 10, 100.0), (b"B" * 6, 101.0)]
+
+
+def test_chunks_roll_at_the_size_limit(tmp_path):
+    recording = SpeakerRecording(str(tmp_path / "s1"))
+    recording.chunk_bytes = 8
+    for i in range(3):
+        recording.write(bytes([i]) * 8, float(i))
+    recording.close()
+    assert sorted(name for name in os.listdir(tmp_path / "s1") if name.endswith(".pcm")) == \
+        ["00000.pcm", "00001.pcm", "00002.pcm"]
+    assert [pcm for pcm, _ in _read_speaker(str(tmp_path / "s1"))] == [bytes([i]) * 8 for i in range(3)]
+
+
+def test_restarting_a_recording_keeps_offsets_valid(tmp_path):
+    start_recording("room", "room-1").write("sid", b"A" * 10, 1.0)
+    stop_recording("room")
+    start_recording("room", "room-1").write("sid", b"B" * 10, 2.0)
+    stop_recording("room")
+    assert list(_read_speaker(str(tmp_path / "room-1" / "sid"))) == [(b"A" * 10, 1.0), (b"B" * 10, 2.0)]
+
+
+def test_writes_after_close_are_dropped(tmp_path):
+    recorder = MeetingRecorder("room-2")
+    recorder.write("sid", b"A" * 4, 1.0)
+    recorder.close()
+    recorder.write("sid", b"B" * 4, 2.0)
+    recorder.write("other", b"C" * 4, 2.0)
+    assert list(recorder.speakers) == ["sid"]
+    assert list(_read_speaker(str(tmp_path / "room-2" / "sid"))) == [(b"A" * 4, 1.0)]
+
+
+def test_record_audio_only_while_recording(tmp_path):
+    record_audio("room", "sid", b"A" * 4, 1.0)
+    assert not os.path.exists(tmp_path / "room-3")
+    start_recording("room", "room-3")
+    record_audio("room", "sid", b"A" * 4, 1.0)
+    assert stop_recording("room") == "room-3"
+    assert stop_recording("room") is None
+    assert list(_read_speaker(str(tmp_path / "room-3" / "sid"))) == [(b"A" * 4, 1.0)]
+
+
+def test_batch_refuses_to_fall_back_to_the_mock(recorded_meeting, monkeypatch):
+    monkeypatch.setattr(meeting_recorder, "BATCH_TRANSCRIPTION_BACKEND", None)
+    monkeypatch.setattr(meeting_recorder, "select_backend_name", lambda: "mock")
+    assert batch_backend() is None
+    assert batch_backend("missing") is None
+    assert batch_backend("mock") == "mock"
+
+    assert run_batch_job(recorded_meeting) is None
+    assert [e["text"] for e in iter_transcript(recorded_meeting)] == \
+        ["typed by web speech", "live caption", "still here"]
+
+
+def test_batch_replaces_only_recorded_speakers(recorded_meeting):
+    entries = run_batch_job(recorded_meeting, "mock")
+    assert [(e["sid"], e["text"], e.get("source")) for e in entries] == [
+        ("b", "typed by web speech", None),
+        ("a", "This is a longer speech segment detected by the mock transcription service.", "batch"),
+        ("b", "still here", None)
+    ]
+    assert entries[1]["ts"] == 1003
+    assert list(iter_transcript(recorded_meeting)) == entries
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for per-client msgpack Socket.IO packets
+"""
+
+import inspect
+
+import pytest
+
+msgpack = pytest.importorskip("msgpack")
+
+import socketio
+from socketio import packet
+
+import serialization
+from msgpack_packets import HybridPacket, NegotiatingManager, NegotiatingServer, wants_msgpack
+from records import TranscriptEntry
+
+
+def test_packet_round_trips_in_both_formats():
+    entry = TranscriptEntry(1, "hi", "s1", "Alice")
+    pkt = HybridPacket(packet.EVENT, data=["transcript-update", {"entry": entry}], namespace="/", id=7)
+
+    decoded = HybridPacket(encoded_packet=pkt.encode_msgpack())
+    assert decoded.packet_type == packet.EVENT
+    assert decoded.id == 7
+    assert decoded.data == ["transcript-update", {"entry": entry.to_dict()}]
+
+    HybridPacket.json = serialization
+    text = HybridPacket(packet.EVENT, data=["attention", {"score": 0.5}]).encode()
+    assert isinstance(text, str)
+    assert HybridPacket(encoded_packet=text).data == ["attention", {"score": 0.5}]
+
+
+def test_binary_payloads_are_not_split_into_attachments():
+    pkt = HybridPacket(packet.EVENT, data=["audio", b"\x00\x01"])
+    assert pkt.packet_type == packet.BINARY_EVENT
+    decoded = HybridPacket(encoded_packet=pkt.encode_msgpack())
+    assert decoded.packet_type == packet.EVENT
+    assert decoded.data == ["audio", b"\x00\x01"]
+
+
+def test_wants_msgpack():
+    assert wants_msgpack({"QUERY_STRING": "serializer=msgpack&EIO=4&transport=polling"})
+    assert not wants_msgpack({"QUERY_STRING": "EIO=4&transport=websocket"})
+    assert not wants_msgpack(None)
+
+
+def test_python_socketio_internals_we_extend_still_exist():
+    # If this fails after a python-socketio upgrade, revisit msgpack_packets.py
+    for name in ("_send_packet", "_send_eio_packet", "get_environ"):
+        assert callable(getattr(socketio.Server, name, None)), name
+    for name in ("get_participants", "eio_sid_from_sid", "connect", "disconnect"):
+        assert callable(getattr(socketio.Manager, name, None)), name
+    assert inspect.signature(NegotiatingManager.emit) == inspect.signature(socketio.Manager.emit)
+    assert list(inspect.signature(socketio.Server._send_packet).parameters) == ["self", "eio_sid", "pkt"]
+    plain = socketio.Server()
+    assert isinstance(plain.environ, dict)
+    assert callable(plain.eio.send)
+
+
+def test_adopts_only_plain_servers():
+    server = NegotiatingServer.adopt(socketio.Server())
+    assert type(server) is NegotiatingServer
+    assert "_send_packet" not in vars(server)
+    with pytest.raises(TypeError):
+        NegotiatingServer.adopt(server)
+
+
+def make_server(monkeypatch, server_class=NegotiatingServer, manager=None):
+    manager = manager or NegotiatingManager()
+    server = server_class(serializer=HybridPacket, client_manager=manager, json=serialization)
+    server.manager_initialized = True
+    server.sent = []
+    monkeypatch.setattr(server, "_send_eio_packet", lambda eio_sid, pkt: server.sent.append((eio_sid, pkt)))
+    monkeypatch.setattr(server.eio, "send", lambda eio_sid, data: server.sent.append((eio_sid, data)))
+    return server
+
+
+@pytest.fixture
+def server(monkeypatch):
+    return make_server(monkeypatch)
+
+
+def connect(server, eio_sid, query=""):
+    server.environ[eio_sid] = {"QUERY_STRING": query}
+    sid = server.manager.connect(eio_sid, "/")
+    server.manager.enter_room(sid, "/", "r1")
+    return sid
+
+
+def test_room_emit_encodes_once_per_format(server):
+    connect(server, "json-1")
+    connect(server, "json-2")
+    connect(server, "bin-1", "serializer=msgpack")
+    binary_sid = connect(server, "bin-2", "serializer=msgpack")
+
+    server.emit("attention-update", {"sid": "a", "score": 0.75}, to="r1")
+
+    sent = dict(server.sent)
+    assert set(sent) == {"json-1", "json-2", "bin-1", "bin-2"}
+    assert sent["json-1"] is sent["json-2"]
+    assert sent["bin-1"] is sent["bin-2"]
+    assert isinstance(sent["json-1"].data, str)
+    assert msgpack.unpackb(sent["bin-1"].data)["data"] == ["attention-update", {"sid": "a", "score": 0.75}]
+
+    # Direct packets (here a disconnect) use the client's format too
+    server.sent.clear()
+    server._send_packet("bin-2", HybridPacket(packet.DISCONNECT, namespace="/"))
+    assert msgpack.unpackb(server.sent[0][1])["type"] == packet.DISCONNECT
+
+    server.manager.disconnect(binary_sid, "/")
+    assert server.manager.get_stats() == {"msgpack_clients": 1}
+
+
+def test_json_only_rooms_use_the_default_path(server):
+    connect(server, "json-1")
+    connect(server, "json-2")
+    server.emit("peer-left", {"sid": "x"}, to="r1")
+    assert len(server.sent) == 2
+    assert server.sent[0][1] is server.sent[1][1]
+
+
+@pytest.mark.parametrize("data", [{"sid": "x"}, ("a", 2), None, [1, 2]])
+def test_json_clients_get_what_the_default_manager_sends(monkeypatch, data):
+    default = make_server(monkeypatch, socketio.Server, socketio.Manager())
+    negotiating = make_server(monkeypatch)
+    for server in (default, negotiating):
+        connect(server, "json-1")
+    connect(negotiating, "bin-1", "serializer=msgpack")
+    for server in (default, negotiating):
+        server.emit("event", data, to="r1")
+
+    json_packet = dict(negotiating.sent)["json-1"]
+    assert json_packet.encode() == default.sent[0][1].encode()
+    assert HybridPacket(encoded_packet=json_packet.data).data == \
+        msgpack.unpackb(dict(negotiating.sent)["bin-1"].data)["data"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the timer wheel and the nudge scheduler
+"""
+
+import random
+
+import pytest
+
+from nudge_scheduler import TimerWheel, NudgeScheduler, NUDGE_COOLDOWN_SECONDS
+
+
+class FakeSocketIO:
+    def start_background_task(self, target):
+        pass
+
+
+def test_wheel_fires_each_timer_once_at_its_deadline():
+    wheel = TimerWheel(now=0)
+    rng = random.Random(7)
+    deadlines = {i: rng.uniform(1, 20000) for i in range(500)}
+    for key, deadline in deadlines.items():
+        wheel.schedule(key, deadline)
+
+    fired = {}
+    for now in range(0, 20001, 37):
+        for key in wheel.advance(now):
+            fired[key] = now
+    assert len(wheel) == 0
+    assert sorted(fired) == sorted(deadlines)
+    for key, now in fired.items():
+        assert deadlines[key] <= now < deadlines[key] + 38
+
+
+def test_wheel_reschedule_and_cancel():
+    wheel = TimerWheel(now=0)
+    wheel.schedule("a", 10)
+    wheel.schedule("b", 10)
+    wheel.schedule("a", 100)
+    wheel.cancel("b")
+    assert wheel.advance(50) == []
+    assert wheel.deadline("a") == 100
+    assert wheel.advance(100) == ["a"]
+
+
+def test_wheel_handles_deadlines_beyond_its_range():
+    wheel = TimerWheel(slots=4, levels=2, now=0)
+    wheel.schedule("far", 100)
+    assert wheel.advance(99) == []
+    assert wheel.advance(100) == ["far"]
+
+
+def test_scheduler_nudges_after_inactivity_and_respects_activity():
+    present = {"quiet": True, "busy": True}
+    sent = []
+    scheduler = NudgeScheduler(FakeSocketIO(), check=lambda room, sid: present.get(sid),
+                               notify=lambda room, sid: sent.append(sid), idle_seconds=300)
+    scheduler.wheel = TimerWheel(now=0)
+    scheduler.touch("r", "quiet", ts=0)
+    scheduler.touch("r", "busy", ts=0)
+    scheduler.touch("r", "busy", ts=200)
+
+    assert scheduler.run_due(now=301) == [("r", "quiet")]
+    assert scheduler.deadline("r", "quiet") == pytest.approx(301 + NUDGE_COOLDOWN_SECONDS)
+    assert scheduler.run_due(now=501) == [("r", "busy")]
+
+    present.pop("quiet")
+    scheduler.run_due(now=301 + NUDGE_COOLDOWN_SECONDS)
+    assert scheduler.deadline("r", "quiet") is None
+    assert sent == ["quiet", "busy"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar participant store and its vectorized tick
+"""
+
+import pytest
+
+from engagement_log import EngagementLog
+from participant_store import ParticipantStore
+
+
+def test_slots_are_reused_and_columns_grow():
+    store = ParticipantStore(capacity=2)
+    for i in range(5):
+        store.update("r", f"s{i}", engagement=i / 10)
+    assert store.capacity == 8 and len(store) == 5
+    slot = store.slots[("r", "s1")]
+    store.remove("r", "s1")
+    store.update("r", "new", engagement=0.9)
+    assert store.slots[("r", "new")] == slot
+    store.remove_room("r")
+    assert len(store) == 0
+
+
+def test_room_ids_are_freed_and_reused():
+    store = ParticipantStore()
+    for room in ("a", "b"):
+        store.update(room, "s1", engagement=0.5)
+        store.update(room, "s2", engagement=0.7)
+    store.tick(now=0.0)
+    room_id = store.room_ids["a"]
+
+    store.remove("a", "s1")
+    assert store.room_ids["a"] == room_id
+    store.remove_room("a")
+    assert "a" not in store.room_ids and "a" not in store.leaderboards
+    assert store.room_sizes == {"b": 2}
+
+    for i in range(3):
+        store.update(f"room-{i}", "s", engagement=0.1)
+        store.remove_room(f"room-{i}")
+    store.update("c", "s", engagement=0.2)
+    assert store.room_ids["c"] == room_id
+    assert len(store.room_names) == 2
+    assert set(store.tick(now=0.0)["leaderboards"]) == {"b", "c"}
+
+
+def test_tick_scores_match_the_engagement_log():
+    store = ParticipantStore()
+    logs = {"idle": EngagementLog(), "busy": EngagementLog(baseline=0.3)}
+    logs["idle"].add("attention", 0.0, 0.9)
+    logs["busy"].add("speaking", 500.0, 20)
+    logs["busy"].add("attention", 900.0, 0.2)
+    for sid, log in logs.items():
+        store.sync("r", sid, {"engagement": log})
+
+    store.tick(now=1000.0)
+    for sid, log in logs.items():
+        assert store.engagement[store.slots[("r", sid)]] == pytest.approx(log.score(1000.0))
+
+
+def test_leaderboards_for_all_rooms_in_one_pass():
+    store = ParticipantStore()
+    for room, sid, baseline in (("a", "a1", 0.2), ("b", "b1", 0.5), ("a", "a2", 0.7)):
+        store.sync(room, sid, {"engagement": EngagementLog(baseline=baseline)})
+    boards = store.tick(now=100.0)["leaderboards"]
+    assert [sid for sid, _ in boards["a"]] == ["a2", "a1"]
+    assert [sid for sid, _ in boards["b"]] == ["b1"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the slotted participant and transcript records
+"""
+
+import json
+import tracemalloc
+
+import pytest
+
+from engagement import update_engagement
+from engagement_log import engagement_score
+from records import Participant, TranscriptEntry, as_dict, to_dicts
+
+
+def test_entry_reads_and_writes_like_a_dict():
+    entry = TranscriptEntry(100, "hello there", "abc", "Alice")
+    assert entry["text"] == "hello there"
+    assert entry.get("sentiment") is None
+    assert entry.get("sentiment", 0.0) == 0.0
+    assert "sentiment" not in entry
+
+    entry["sentiment"] = 0.4
+    assert "sentiment" in entry
+    assert entry.sentiment == 0.4
+    assert entry == {"ts": 100, "text": "hello there", "sid": "abc", "speaker": "Alice", "sentiment": 0.4}
+
+    with pytest.raises(KeyError):
+        entry["missing"]
+    with pytest.raises(KeyError):
+        entry["get"]
+    with pytest.raises(KeyError):
+        entry["unknown"] = 1
+
+
+def test_serializes_to_the_dict_shape_at_the_edges():
+    entry = TranscriptEntry(5, "text", None, "Unknown", backend="mock", segment_id="x-1")
+    assert entry.to_dict() == {"ts": 5, "text": "text", "sid": None, "speaker": "Unknown",
+                               "backend": "mock", "segment_id": "x-1"}
+    assert json.loads(json.dumps(entry, default=as_dict)) == entry.to_dict()
+    assert to_dicts([entry, {"ts": 1}]) == [entry.to_dict(), {"ts": 1}]
+    with pytest.raises(TypeError):
+        json.dumps(object(), default=as_dict)
+
+
+def test_ids_are_interned():
+    sid = "".join(["sid-", "1234"])
+    a = TranscriptEntry(1, "a", sid, "".join(["Bo", "b"]))
+    b = TranscriptEntry(2, "b", "".join(["sid-", "1234"]), "".join(["B", "ob"]))
+    assert a.sid is b.sid
+    assert a.speaker is b.speaker
+
+
+def test_participant_works_with_engagement_helpers():
+    participant = Participant("Alice", 0.0)
+    assert engagement_score(participant) == 0.5
+    room = {"participants": {"a": participant}}
+    update_engagement(room, "a", "speaking", 4)
+    assert participant.speaking_time == 2.0
+    assert participant["engagement"] is participant.engagement
+    assert len(participant.engagement) == 1
+
+
+def test_records_are_smaller_than_dicts():
+    def measure(make):
+        tracemalloc.start()
+        items = [make(i) for i in range(2000)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        assert len(items) == 2000
+        return size
+
+    dicts = measure(lambda i: {"ts": i, "text": "hi", "sid": "abc", "speaker": "Alice", "sentiment": 0.1})
+    records = measure(lambda i: TranscriptEntry(i, "hi", "abc", "Alice", sentiment=0.1))
+    assert records < dicts * 0.6
+    assert not hasattr(TranscriptEntry(0, ""), "__dict__")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
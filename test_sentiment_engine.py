@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized, phrase-aware sentiment engine
+"""
+
+import pytest
+
+from sentiment_analysis import analyze_sentiment, score_batch
+from sentiment_engine import PhraseMatcher, SentimentEngine
+
+
+def test_single_words():
+    assert analyze_sentiment("This is great") == 1.0
+    assert analyze_sentiment("That was a mistake.") == -1.0
+    assert analyze_sentiment("We meet on Tuesday") == 0.0
+    assert analyze_sentiment("") == 0.0
+    assert analyze_sentiment("   ") == 0.0
+
+
+def test_negation_window():
+    assert analyze_sentiment("not good") == pytest.approx(-0.8)
+    assert analyze_sentiment("not quite good") == pytest.approx(-0.8 * 1.2)
+    # Three tokens back is outside the window
+    assert analyze_sentiment("not at all good") == 1.0
+
+
+def test_intensifier_and_average():
+    assert analyze_sentiment("very good") == 1.0  # clamped
+    assert analyze_sentiment("good but a problem") == 0.0
+    assert analyze_sentiment("quite good, bad, bad") == pytest.approx((1.2 - 2) / 3)
+
+
+def test_context_does_not_leak_between_texts():
+    # "not" and "very" end the first text and must not touch the second
+    assert score_batch(["that is not", "good"]) == [0.0, 1.0]
+    assert score_batch(["so very", "bad"]) == [0.0, -1.0]
+
+
+def test_batch_matches_single_scoring():
+    texts = [
+        "This is a great idea! I love the approach.",
+        "I'm not sure about this part, it seems difficult.",
+        "",
+        "Absolutely not a waste of time, really helpful.",
+        "No, that is wrong and the timeline is a concern.",
+    ]
+    assert score_batch(texts) == [analyze_sentiment(text) for text in texts]
+    assert score_batch([]) == []
+
+
+def test_phrases_take_precedence_over_words():
+    # "not bad" is a phrase, not a negated "bad"
+    assert analyze_sentiment("honestly not bad") == pytest.approx(0.6)
+    assert analyze_sentiment("no problem at all") == pytest.approx(0.6)
+    assert analyze_sentiment("we are behind schedule") == pytest.approx(-0.8)
+    assert analyze_sentiment("we are on track") == pytest.approx(0.8)
+
+
+def test_multi_token_negations():
+    # Contractions tokenize as "don t"
+    assert analyze_sentiment("I don't like it") == pytest.approx(-0.8)
+    assert analyze_sentiment("it isn't helpful") == pytest.approx(-0.8)
+
+
+def test_language_packs():
+    assert analyze_sentiment("muy buen trabajo", language="es") == 1.0
+    assert analyze_sentiment("no es bueno", language="es") == pytest.approx(-0.8)
+    # Unknown languages use the default pack
+    assert analyze_sentiment("great", language="xx") == 1.0
+
+
+def test_matcher_is_leftmost_longest():
+    matcher = PhraseMatcher([[1], [1, 2, 3], [2, 3, 4], [2]])
+    assert sorted(matcher.find_all([1, 2, 3, 4])) == [(0, 1, 0), (0, 3, 1), (1, 2, 3), (1, 4, 2)]
+    assert matcher.find([1, 2, 3, 4]) == [(0, 3, 1)]
+    assert matcher.find([5, 2, 3, 4, 1]) == [(1, 4, 2), (4, 5, 0)]
+
+
+def test_custom_lexicon_weights():
+    engine = SentimentEngine({"ship it": 0.5, "late": -1.0}, {"very": 2.0}, ["never"])
+    assert engine.score("let's ship it") == 0.5
+    assert engine.score("very late") == -1.0
+    assert engine.score("never late") == pytest.approx(0.8)
+    assert engine.score("unrelated words") == 0.0
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the ring-buffer sentiment history
+"""
+
+import pytest
+
+from sentiment_history import SentimentHistory
+
+
+def fill(history, scores, start=1000.0):
+    for i, score in enumerate(scores):
+        history.append({"timestamp": start + i, "score": score, "text": f"t{i}", "speaker": "a"})
+
+
+def test_behaves_like_a_bounded_list():
+    history = SentimentHistory(capacity=3)
+    fill(history, [0.1, 0.2, 0.3, 0.4, 0.5])
+    assert len(history) == 3
+    assert [e["score"] for e in history] == [0.3, 0.4, 0.5]
+    assert history[0]["text"] == "t2"
+    assert history[-1]["score"] == 0.5
+    assert [e["score"] for e in history[-2:]] == [0.4, 0.5]
+    with pytest.raises(IndexError):
+        history[3]
+
+
+def test_stats_match_a_full_scan_after_wraparound():
+    scores = [0.9, -0.5, 0.0, 0.3, -0.9, 0.25, -0.1, 1.0, -0.3, 0.5, 0.2, -0.2]
+    history = SentimentHistory(capacity=5)
+    fill(history, scores)
+    for start in range(-5, 6):
+        kept = scores[-5:][start:]
+        stats = history.stats(start)
+        assert stats["count"] == len(kept)
+        assert stats["mean"] == pytest.approx(sum(kept) / len(kept) if kept else 0.0)
+        assert stats["positive_count"] == sum(1 for s in kept if s > 0.2)
+        assert stats["negative_count"] == sum(1 for s in kept if s < -0.2)
+
+
+def test_window_lookup_by_time():
+    history = SentimentHistory(capacity=10)
+    fill(history, [0.5] * 8, start=100.0)
+    assert history.index_since(0) == 0
+    assert history.index_since(103) == 3
+    assert history.index_since(103.5) == 4
+    assert history.index_since(1000) == 8
+    assert history.stats_since(105)["count"] == 3
+
+
+def test_out_of_order_timestamps_are_clamped():
+    history = SentimentHistory(capacity=4)
+    history.add(200.0, 0.5)
+    history.add(150.0, -0.5)
+    assert [e["timestamp"] for e in history] == [200.0, 200.0]
+    assert history.index_since(200.0) == 0
+
+
+def test_speaker_aggregates_cover_evicted_entries():
+    history = SentimentHistory(capacity=2)
+    for i, (speaker, score) in enumerate([("a", 0.5), ("b", -0.5), ("a", 1.0), ("a", 0.0), (None, 0.9)]):
+        history.add(100.0 + i, score, speaker=speaker)
+    assert set(history.speakers) == {"a", "b"}
+    assert history.speakers["a"]["count"] == 3
+    assert history.speakers["a"]["mean"] == pytest.approx(0.5)
+    assert list(history.speakers["a"]["recent"]) == [0.5, 1.0, 0.0]
+    assert history.speakers["b"]["mean"] == -0.5
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
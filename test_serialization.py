@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable JSON serializer
+"""
+
+import json
+from collections import deque
+
+import numpy as np
+import pytest
+from flask import Flask, jsonify, request
+from flask_socketio import SocketIO, join_room
+
+import serialization
+from records import TranscriptEntry
+
+BACKENDS = ["json"] + (["orjson"] if serialization.ORJSON_AVAILABLE else [])
+
+PAYLOAD = {
+    "room": "r1",
+    "entry": TranscriptEntry(10, "héllo", "sid-1", "Alice", sentiment=0.25),
+    "scores": np.array([0.5, 0.75]),
+    "mean": np.float64(0.625),
+    "recent": deque([1, 2], maxlen=5),
+    "speakers": {"sid-1"},
+    "counts": {1: "one"}
+}
+EXPECTED = {
+    "room": "r1",
+    "entry": {"ts": 10, "text": "héllo", "sid": "sid-1", "speaker": "Alice", "sentiment": 0.25},
+    "scores": [0.5, 0.75],
+    "mean": 0.625,
+    "recent": [1, 2],
+    "speakers": ["sid-1"],
+    "counts": {"1": "one"}
+}
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    monkeypatch.setattr(serialization, "JSON_BACKEND", request.param)
+    return request.param
+
+
+def test_round_trip_matches_stdlib(backend):
+    text = serialization.dumps(PAYLOAD, separators=(",", ":"))
+    assert isinstance(text, str)
+    assert json.loads(text) == EXPECTED
+    assert serialization.loads(text) == EXPECTED
+    assert serialization.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+    with pytest.raises(TypeError):
+        serialization.dumps({"x": object()})
+
+
+def test_flask_provider(backend):
+    app = Flask(__name__)
+    app.json = serialization.FastJSONProvider(app)
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return jsonify({"got": request.get_json(), "entry": PAYLOAD["entry"]})
+
+    response = app.test_client().post("/echo", json={"a": [1, 2]})
+    assert response.get_json() == {"got": {"a": [1, 2]}, "entry": EXPECTED["entry"]}
+
+
+def test_room_emit_is_encoded_once(backend, monkeypatch):
+    app = Flask(__name__)
+    socketio = SocketIO(app, json=serialization)
+
+    @socketio.on("join")
+    def on_join(room):
+        join_room(room)
+
+    clients = [socketio.test_client(app) for _ in range(3)]
+    for client in clients:
+        client.emit("join", "r1")
+        client.get_received()
+
+    # Record the engine.io packets handed to each recipient
+    sent = []
+    send = socketio.server._send_eio_packet
+    monkeypatch.setattr(socketio.server, "_send_eio_packet", lambda sid, pkt: sent.append(pkt) or send(sid, pkt))
+    socketio.emit("transcript-update", {"entry": PAYLOAD["entry"]}, to="r1")
+
+    assert len(sent) == 3
+    assert len({id(pkt) for pkt in sent}) == 1
+    for client in clients:
+        received = client.get_received()
+        assert received[0]["args"][0] == {"entry": EXPECTED["entry"]}
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
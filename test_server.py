@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the versioned dashboard room snapshot served by the Flask app
+"""
+
+import gzip
+import time
+
+import pytest
+
+import server
+from engagement_log import EngagementLog
+from records import Participant, TranscriptEntry
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def room(clock):
+    name = f"snapshot-{id(clock)}"
+    data = server.room_data[name]
+    data["meeting_start"] = clock[0] - 60
+    data["participants"]["sid-a"] = Participant("Alice", clock[0], engagement=EngagementLog(), joined_at=clock[0])
+    yield name
+    server.room_data.pop(name, None)
+    server.room_snapshots.pop(name, None)
+
+
+def test_snapshot_bundles_the_dashboard_data(room):
+    response = server.app.test_client().get(f"/room/{room}/snapshot")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-cache"
+    data = response.get_json()
+    assert data["room"] == room
+    assert data["version"] == 0
+    assert data["engagement"]["total_participants"] == 1
+    assert data["engagement"]["meeting_duration"] == pytest.approx(60)
+    assert {"sentiment", "transcript_tail", "total_entries", "transcript_stats", "insights"} <= set(data)
+
+
+def test_unchanged_room_answers_304_and_reuses_the_body(room):
+    client = server.app.test_client()
+    first = client.get(f"/room/{room}/snapshot")
+    etag = first.headers["ETag"]
+
+    again = client.get(f"/room/{room}/snapshot", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.data == b""
+    assert client.get(f"/room/{room}/snapshot").data == first.data
+
+
+def test_version_bump_rebuilds_the_snapshot(room):
+    client = server.app.test_client()
+    etag = client.get(f"/room/{room}/snapshot").headers["ETag"]
+
+    server.room_data[room]["participants"]["sid-b"] = Participant("Bob", time.time())
+    server.mark_room_changed(room)
+    response = client.get(f"/room/{room}/snapshot", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.get_json()["version"] == 1
+    assert response.get_json()["engagement"]["total_participants"] == 2
+
+
+def test_idle_room_snapshot_expires_with_time(room, clock):
+    client = server.app.test_client()
+    first = client.get(f"/room/{room}/snapshot")
+
+    clock[0] += server.SNAPSHOT_MAX_AGE
+    response = client.get(f"/room/{room}/snapshot", headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.get_json()["version"] == 0
+    assert response.get_json()["engagement"]["meeting_duration"] == pytest.approx(60 + server.SNAPSHOT_MAX_AGE)
+
+
+def test_manual_nudge_scan_without_the_scheduler(room, clock, monkeypatch):
+    server.room_data[room]["participants"]["sid-quiet"] = Participant(
+        "Quinn", clock[0] - 600, engagement=EngagementLog(baseline=0.1))
+    sent = []
+    monkeypatch.setattr(server, "nudge_scheduler", None)
+    monkeypatch.setattr(server, "send_nudge", sent.append)
+
+    response = server.app.test_client().post("/nudge", json={"room": room})
+    assert response.status_code == 200
+    assert response.get_json() == {"nudged": ["sid-quiet"], "count": 1, "next_check": {}}
+    assert sent == ["sid-quiet"]
+
+
+@pytest.mark.parametrize("accept, gzipped", [
+    ("gzip", True), ("deflate, gzip;q=0.5", True), ("*", True),
+    ("gzip;q=0", False), ("identity", False), ("", False)
+])
+def test_export_gzips_only_when_accepted(room, accept, gzipped):
+    server.room_data[room]["transcript"].append(TranscriptEntry(1, "hello", "sid-a", "Alice"))
+    response = server.app.test_client().get(f"/transcript/{room}/export?format=txt",
+                                            headers={"Accept-Encoding": accept})
+    assert response.status_code == 200
+    assert (response.headers.get("Content-Encoding") == "gzip") is gzipped
+    body = gzip.decompress(response.data) if gzipped else response.data
+    assert b"hello" in body
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-resolution metric store
+"""
+
+import pytest
+
+from timeseries import MetricsStore, TimeSeries
+
+
+def test_rollups_keep_min_mean_max():
+    series = TimeSeries(tiers=((0, 100), (10, 10), (60, 10)))
+    for i in range(30):
+        series.add(float(i), ts=1000.0 + i)
+    ten = series.query(resolution=10)
+    assert ten["t"] == [1000.0, 1010.0, 1020.0]
+    assert ten["min"] == [0.0, 10.0, 20.0]
+    assert ten["max"] == [9.0, 19.0, 29.0]
+    assert ten["mean"] == [4.5, 14.5, 24.5]
+    minute = series.query(resolution=60)
+    assert minute["t"] == [960.0, 1020.0]
+    assert minute["count"] == [20, 10]
+
+
+def test_memory_is_bounded_and_coarser_tiers_cover_history():
+    series = TimeSeries(tiers=((0, 5), (10, 3), (60, 100)))
+    for i in range(120):
+        series.add(1.0, ts=float(i))
+    assert len(series.query(resolution=0)["t"]) == 5
+    assert len(series.query(resolution=10)["t"]) == 3
+    # Recent windows come raw, the whole meeting from the 1 minute tier
+    assert series.query(since=116.0)["resolution"] == 0
+    assert series.query(since=95.0)["resolution"] == 10
+    assert series.query()["resolution"] == 60
+    with pytest.raises(ValueError):
+        series.query(resolution=5)
+
+
+def test_arrays_grow_lazily_up_to_capacity():
+    series = TimeSeries(tiers=((0, 40), (10, 3)))
+    raw = series.tiers[0]
+    series.add(0.0, ts=0)
+    assert raw.start.size == 16
+    for i in range(1, 30):
+        series.add(float(i), ts=i)
+    assert raw.start.size == 32
+    assert series.query(resolution=0)["mean"] == [float(i) for i in range(30)]
+
+    for i in range(30, 100):
+        series.add(float(i), ts=i)
+    assert raw.start.size == 40
+    assert series.query(resolution=0)["t"] == [float(i) for i in range(60, 100)]
+    assert series.tiers[1].start.size == 3
+
+
+def test_store_keeps_participant_and_room_series():
+    store = MetricsStore(tiers=((0, 10),))
+    store.record("attention", 0.2, "a", ts=1.0)
+    store.record("attention", 0.8, "b", ts=2.0)
+    assert store.query("attention", "a")["mean"] == [0.2]
+    assert store.query("attention")["mean"] == [0.2, 0.8]
+    assert store.query("sentiment") is None
+    assert sorted(store.describe()["attention"]) == ["a", "b", "room"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming transcript exports
+"""
+
+import csv
+import gzip
+import json
+
+import pytest
+
+from transcript_export import export_chunks, gzip_chunks, snapshot
+
+ENTRIES = [
+    {"ts": 1000, "text": "Welcome, everyone", "speaker": "Alice", "sid": "s1"},
+    {"ts": 1003, "text": 'Budget is "tight", sadly', "speaker": "Bob", "sid": "s2", "sentiment": -0.4},
+    {"ts": 1030, "text": "Next item"}
+]
+
+
+def test_ndjson_round_trips():
+    lines = "".join(export_chunks(ENTRIES, "ndjson")).splitlines()
+    assert [json.loads(line) for line in lines] == ENTRIES
+
+
+def test_csv_quotes_text_and_has_header():
+    rows = list(csv.reader("".join(export_chunks(ENTRIES, "csv")).splitlines()))
+    assert rows[0] == ["ts", "time", "speaker", "sid", "text", "sentiment"]
+    assert rows[2][4] == 'Budget is "tight", sadly' and rows[2][5] == "-0.4"
+    assert rows[3][2] == "Unknown"
+    assert "".join(export_chunks([], "csv")) == "ts,time,speaker,sid,text,sentiment\r\n"
+
+
+def test_srt_cues_follow_entry_timestamps():
+    cues = "".join(export_chunks(ENTRIES, "srt")).strip().split("\n\n")
+    assert cues[0].splitlines()[1] == "00:00:00,000 --> 00:00:03,000"
+    assert cues[1].splitlines()[1] == "00:00:03,000 --> 00:00:13,000"   # capped at 10 s
+    assert cues[2].splitlines() == ["3", "00:00:30,000 --> 00:00:40,000", "Unknown: Next item"]
+
+
+def test_streams_lazily_and_gzips():
+    consumed = []
+
+    def entries():
+        for entry in ENTRIES:
+            consumed.append(entry)
+            yield entry
+
+    chunks = export_chunks(entries(), "txt")
+    assert next(chunks).startswith("[1970-01-01 00:16:40 UTC] Alice: Welcome")
+    assert len(consumed) == 1
+    text = gzip.decompress(b"".join(gzip_chunks(chunks))).decode()
+    assert text.count("\n") == 2
+
+    with pytest.raises(ValueError):
+        export_chunks(ENTRIES, "pdf")
+
+
+def test_snapshot_ignores_later_appends():
+    live = list(ENTRIES)
+    rows = snapshot(live)
+    next(rows)
+    live.append({"ts": 2000, "text": "late"})
+    assert len(list(rows)) == 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
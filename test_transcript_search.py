@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the transcript full-text index
+"""
+
+import pytest
+
+import meeting_archive
+from transcript_search import TranscriptIndex, match_query
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(meeting_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    return TranscriptIndex(str(tmp_path / "search.db"))
+
+
+def entry(text, speaker="Alice", ts=100, sid="s1"):
+    return {"text": text, "speaker": speaker, "ts": ts, "sid": sid}
+
+
+def test_match_query_quotes_user_input():
+    assert match_query('budget "next quarter" deploy*') == '"budget" "next quarter" "deploy"*'
+    assert match_query("NOT OR") == '"NOT" "OR"'
+    with pytest.raises(ValueError):
+        match_query('" ... "')
+
+
+def test_search_with_filters_and_highlighting(index):
+    index.add("r1", entry("The <budget> review is done", ts=100))
+    index.add("r1", entry("Budget approved for hiring", speaker="Bob", ts=200, sid="s2"))
+    index.add("r2", entry("No budget talk here", ts=300))
+    index.flush()
+
+    assert len(index.search("budget")) == 3
+    results = index.search("budget", room="r1", speaker="bob")
+    assert [r["ts"] for r in results] == [200]
+    assert [r["ts"] for r in index.search("budget", since=150, until=250)] == [200]
+    snippet = index.search("review")[0]["snippet"]
+    assert "&lt;budget&gt;" in snippet and "<mark>review</mark>" in snippet
+    assert index.search("budg*", room="r2")[0]["live"] is True
+
+
+def test_finished_meetings_move_from_live_to_archive(index):
+    index.add("r1", entry("kickoff notes"))
+    index.assign_meeting("r1", "r1-100")
+    index.flush()
+    assert index.search("kickoff")[0]["meeting_id"] == "r1-100"
+
+    index.replace_meeting("r1-100", "r1", [entry("batch kickoff notes"), entry("more notes", ts=110)])
+    assert len(index.search("notes")) == 2
+
+
+def test_backfill_indexes_archived_meetings_once(index):
+    meeting_archive.archive_meeting("r3", {
+        "meeting_start": 1000, "participants": {}, "transcript": [entry("retro action items", ts=1001)]
+    })
+    index.backfill(wait=True)
+    index.backfill(wait=True)
+    results = index.search("retro")
+    assert len(results) == 1 and results[0]["meeting_id"] == "r3-1000"
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
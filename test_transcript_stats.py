@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental transcript statistics and topic weighting
+"""
+
+import random
+
+import pytest
+
+from transcript_stats import TranscriptStats, BackgroundCorpus, FrequencyIndex
+
+
+def batch_stats(texts):
+    """Reference: the old full-text analysis in summarizer.get_summary_stats"""
+    transcript = " ".join(texts)
+    return len(transcript.split()), len([s for s in transcript.split('.') if s.strip()])
+
+
+def test_counts_match_full_text_analysis():
+    rng = random.Random(3)
+    pieces = ["release", "looks", "good.", "we", "are", ".", "behind", "schedule", "...", "ok", "fine. next"]
+    texts = [" ".join(rng.choice(pieces) for _ in range(rng.randint(0, 6))) for _ in range(300)]
+    stats = TranscriptStats()
+    for i, text in enumerate(texts, 1):
+        stats.add(text)
+        assert (stats.word_count, stats.sentence_count) == batch_stats(texts[:i])
+
+
+def test_frequency_index_top_k():
+    index = FrequencyIndex()
+    for term in "a b a c a b d".split():
+        index.add(term)
+    assert index.top(2) == [("a", 3), ("b", 2)]
+    assert len(index.top(10)) == 4
+
+
+def test_topics_are_weighted_against_the_corpus(tmp_path):
+    corpus = BackgroundCorpus(str(tmp_path / "corpus.json"))
+    for _ in range(5):
+        corpus.add_document(["meeting", "update", "meeting update"])
+    stats = TranscriptStats(corpus)
+    for text in ["meeting update meeting update", "kubernetes migration plan", "meeting kubernetes migration"]:
+        stats.add(text)
+
+    assert stats.top_topics(2) == ["kubernetes", "migration"]
+    assert stats.top_phrases(1) == ["kubernetes migration"]
+    assert BackgroundCorpus(str(tmp_path / "corpus.json")).documents == 5
+
+
+def test_reset_clears_counts():
+    stats = TranscriptStats()
+    stats.add("Budget review. Hiring plan")
+    assert stats.summary()["sentence_count"] == 2
+    stats.reset()
+    assert stats.summary() == {
+        "word_count": 0, "sentence_count": 0, "estimated_duration": 0.0,
+        "key_topics": [], "key_phrases": []
+    }
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for interim/final caption events and caption latency, using the mock
+transcription backend
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+import transcription
+import transcription_backends
+from voice_activity import SAMPLE_RATE, SpeechSegmenter
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, data, room=None, **kwargs):
+        self.events.append((event, data))
+
+
+def tone(seconds, amplitude=5000):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 200 * t)).astype("<i2").tobytes()
+
+
+def silence(seconds):
+    return bytes(2 * int(SAMPLE_RATE * seconds))
+
+
+@pytest.fixture
+def room(monkeypatch):
+    monkeypatch.setattr(transcription_backends.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(transcription, "get_search_index", lambda: None)
+    name = f"captions-{time.time_ns()}"
+    yield name
+    transcription.rooms.pop(name, None)
+
+
+def test_partials_and_final_share_a_segment_id(room):
+    socketio = FakeSocketIO()
+    segmenter = SpeechSegmenter()
+
+    segmenter.push(tone(1.2))
+    transcription.emit_partial_transcript(room, socketio, "sid-alice", segmenter, "mock", first=True)
+    [segment] = segmenter.push(silence(0.9))
+    transcription.transcribe_segment(room, socketio, "sid-alice", segment, "mock", time.time())
+
+    segmenter.push(tone(0.5))
+    [segment] = segmenter.push(silence(0.9))
+    transcription.transcribe_segment(room, socketio, "sid-alice", segment, "mock", time.time())
+
+    sequence = [(event, data.get("segment_id") or data["entry"]["segment_id"]) for event, data in socketio.events]
+    assert sequence == [
+        ("transcript-partial", "sid-alice:1"),
+        ("transcript-partial", "sid-alice:1"),
+        ("transcript-update", "sid-alice:1"),
+        ("transcript-partial", "sid-alice:2"),
+        ("transcript-update", "sid-alice:2")
+    ]
+    partial, final = socketio.events[1][1], socketio.events[2][1]["entry"]
+    assert partial["text"] == "This is a longer speech segment"
+    assert final["text"].startswith(partial["text"])
+    assert final["backend"] == "mock"
+    assert [entry.segment_id for entry in transcription.get_room_transcript(room)] == ["sid-alice:1", "sid-alice:2"]
+
+
+def test_latency_is_recorded_for_first_partial_and_finals(room):
+    socketio = FakeSocketIO()
+    segmenter = SpeechSegmenter()
+    segmenter.push(tone(1.2))
+    segmenter.segment_started_at -= 0.4
+    transcription.emit_partial_transcript(room, socketio, "sid-bob", segmenter, "mock", first=True)
+    transcription.emit_partial_transcript(room, socketio, "sid-bob", segmenter, "mock")
+
+    [segment] = segmenter.push(silence(0.9))
+    transcription.transcribe_segment(room, socketio, "sid-bob", segment, "mock", time.time() - 0.25)
+
+    latency = transcription.get_caption_latency(room)
+    assert latency["partial"]["count"] == 1
+    assert latency["partial"]["p50"] == pytest.approx(0.4, abs=0.05)
+    assert latency["final"]["count"] == 1
+    assert latency["final"]["mean"] == pytest.approx(0.25, abs=0.05)
+
+
+def test_latency_percentiles(room):
+    transcription.rooms[room]["latency"]["final"].extend(i / 100 for i in range(100, 0, -1))
+    latency = transcription.get_caption_latency(room)
+    assert latency["final"] == {"count": 100, "mean": 0.505, "p50": 0.51, "p95": 0.96}
+    assert latency["partial"] == {"count": 0, "mean": None, "p50": None, "p95": None}
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the transcription backend registry and the batching local engine
+(driven by a fake pipeline, so no model is downloaded)
+"""
+
+import threading
+import time
+
+import pytest
+
+import transcription_backends as tb
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(tb, "_registry", dict(tb._registry))
+    monkeypatch.setattr(tb, "_instances", {})
+    monkeypatch.setattr(tb, "_failures", {})
+    monkeypatch.setattr(tb, "_warned", set())
+    monkeypatch.setattr(tb, "TRANSCRIPTION_BACKEND", None)
+
+
+def register(backend_name, available=True, fail=False):
+    attempts = []
+
+    @tb.register_backend
+    class Backend(tb.TranscriptionBackend):
+        name = backend_name
+
+        @classmethod
+        def is_available(cls):
+            return available
+
+        def __init__(self):
+            attempts.append(time.time())
+            if fail:
+                raise RuntimeError("model failed to load")
+
+        def transcribe(self, audio_data):
+            return backend_name
+
+    return attempts
+
+
+def test_selection_prefers_the_configured_backend(monkeypatch):
+    register("fast")
+    register("offline", available=False)
+    monkeypatch.setattr(tb, "TRANSCRIPTION_BACKEND", "fast")
+    assert tb.select_backend_name() == "fast"
+
+    monkeypatch.setattr(tb, "TRANSCRIPTION_BACKEND", "offline")
+    monkeypatch.setattr(tb, "AUTO_SELECT_ORDER", ["offline", "mock"])
+    assert tb.select_backend_name() == "mock"
+    assert "fast" in tb.available_backends()
+    assert "offline" not in tb.available_backends()
+
+
+def test_falling_through_to_the_mock_warns_once(monkeypatch, caplog):
+    register("cloud", available=False)
+    monkeypatch.setattr(tb, "AUTO_SELECT_ORDER", ["cloud", "mock"])
+    with caplog.at_level("WARNING", logger=tb.logger.name):
+        assert tb.select_backend_name() == "mock"
+        assert tb.select_backend_name() == "mock"
+    assert len([r for r in caplog.records if "mock backend" in r.getMessage()]) == 1
+
+
+def test_instances_are_shared_and_unknown_names_get_the_mock():
+    attempts = register("fast")
+    assert tb.get_backend("fast") is tb.get_backend("fast")
+    assert len(attempts) == 1
+    assert isinstance(tb.get_backend("nope"), tb.MockBackend)
+    assert tb.get_backend("mock").transcribe_batch([b"\0" * 10]) == ["Brief audio detected."]
+
+
+def test_failed_start_uses_the_mock_until_the_cooldown_ends(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tb.time, "time", lambda: now[0])
+    attempts = register("broken", fail=True)
+
+    for _ in range(5):
+        assert isinstance(tb.get_backend("broken"), tb.MockBackend)
+    assert len(attempts) == 1
+
+    now[0] += tb.BACKEND_RETRY_SECONDS
+    assert isinstance(tb.get_backend("broken"), tb.MockBackend)
+    assert len(attempts) == 2
+
+
+class FakePipeline:
+    """Stands in for the transformers ASR pipeline and records each batch"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def __call__(self, inputs, batch_size):
+        assert batch_size == len(inputs)
+        self.batches.append(len(inputs))
+        if self.fail:
+            raise RuntimeError("inference failed")
+        return [{"text": f" {item['raw'].size} samples "} for item in inputs]
+
+
+@pytest.fixture
+def local_engine(monkeypatch):
+    def make(pipe, **kwargs):
+        monkeypatch.setattr(tb, "hf_pipeline", lambda *args, **kw: pipe, raising=False)
+        return tb.LocalWhisperBackend(model="fake", **kwargs)
+    return make
+
+
+def test_local_engine_batches_segments_into_one_call(local_engine):
+    pipe = FakePipeline()
+    engine = local_engine(pipe, max_batch=8, batch_wait_ms=100)
+    segments = [b"\1\0" * n for n in (1600, 3200, 4800)]
+    assert engine.transcribe_batch(segments) == [f"{tb._pcm_to_float(seg).size} samples" for seg in segments]
+    assert pipe.batches == [3]
+    assert engine.batches == 1
+
+
+def test_concurrent_rooms_share_batches_up_to_the_limit(local_engine):
+    pipe = FakePipeline()
+    engine = local_engine(pipe, max_batch=4, batch_wait_ms=200)
+    segments = [b"\0\0" * 160 * (i + 1) for i in range(6)]
+    results = {}
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, engine.transcribe(segments[i])))
+               for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert results == {i: f"{tb._pcm_to_float(seg).size} samples" for i, seg in enumerate(segments)}
+    assert sum(pipe.batches) == 6
+    assert max(pipe.batches) <= 4
+    assert len(pipe.batches) < 6
+
+
+def test_inference_error_reaches_every_waiting_caller(local_engine):
+    engine = local_engine(FakePipeline(fail=True), batch_wait_ms=50)
+    with pytest.raises(RuntimeError, match="inference failed"):
+        engine.transcribe_batch([b"\0\0" * 10, b"\0\0" * 20])
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for electing one audio uploader per speaker and failing over
+"""
+
+import pytest
+
+from uploader_election import register_audio_upload, release_audio_uploader
+
+
+def make_room(**network_stats):
+    return {"audio_uploaders": {}, "network_stats": network_stats}
+
+
+def stop(speaker):
+    return {"speaker": speaker, "upload": False}
+
+
+def start(speaker):
+    return {"speaker": speaker, "upload": True}
+
+
+def test_first_sender_is_elected_and_duplicates_are_stopped_once():
+    room = make_room()
+    assert register_audio_upload(room, "spk", "a") == (True, [])
+    assert register_audio_upload(room, "spk", "a") == (True, [])
+
+    room["network_stats"]["b"] = {"packet_loss": 0.5, "rtt": 400, "bandwidth": 100}
+    room["network_stats"]["a"] = {"packet_loss": 0.0, "rtt": 20, "bandwidth": 2000}
+    assert register_audio_upload(room, "spk", "b") == (False, [("b", stop("spk"))])
+    assert register_audio_upload(room, "spk", "b") == (False, [])
+    assert room["audio_uploaders"]["spk"]["uploader"] == "a"
+
+
+def test_better_ranked_newcomer_takes_over():
+    room = make_room(a={"packet_loss": 0.1, "rtt": 200, "bandwidth": 500},
+                     b={"packet_loss": 0.0, "rtt": 30, "bandwidth": 3000})
+    assert register_audio_upload(room, "spk", "a") == (True, [])
+    assert register_audio_upload(room, "spk", "b") == (True, [("a", stop("spk"))])
+    assert register_audio_upload(room, "spk", "a") == (False, [])
+    assert room["audio_uploaders"]["spk"]["uploader"] == "b"
+
+
+def test_measured_link_beats_unknown_one():
+    room = make_room(b={"packet_loss": 0.2, "rtt": 300, "bandwidth": 200})
+    assert register_audio_upload(room, "spk", "a") == (True, [])
+    assert register_audio_upload(room, "spk", "b") == (True, [("a", stop("spk"))])
+
+
+def test_speaker_own_client_always_wins():
+    room = make_room(a={"packet_loss": 0.0, "rtt": 10, "bandwidth": 5000},
+                     spk={"packet_loss": 0.3, "rtt": 500, "bandwidth": 100})
+    assert register_audio_upload(room, "spk", "a") == (True, [])
+    assert register_audio_upload(room, "spk", "spk") == (True, [("a", stop("spk"))])
+
+
+def test_newcomer_can_restart_a_stopped_candidate_with_a_better_link():
+    room = make_room(a={"packet_loss": 0.1, "rtt": 100, "bandwidth": 1000})
+    register_audio_upload(room, "spk", "a")
+    register_audio_upload(room, "spk", "b")   # unmeasured, stopped
+    room["network_stats"]["b"] = {"packet_loss": 0.0, "rtt": 10, "bandwidth": 5000}
+    room["network_stats"]["c"] = {"packet_loss": 0.05, "rtt": 50, "bandwidth": 2000}
+
+    accepted, notices = register_audio_upload(room, "spk", "c")
+    assert not accepted
+    assert notices == [("a", stop("spk")), ("b", start("spk")), ("c", stop("spk"))]
+    assert register_audio_upload(room, "spk", "b") == (True, [])
+
+
+def test_failover_picks_the_best_remaining_candidate():
+    room = make_room(a={"packet_loss": 0.0, "rtt": 10, "bandwidth": 5000},
+                     b={"packet_loss": 0.2, "rtt": 300, "bandwidth": 300},
+                     c={"packet_loss": 0.1, "rtt": 100, "bandwidth": 1000})
+    for sid in ("a", "b", "c"):
+        register_audio_upload(room, "spk", sid)
+    assert room["audio_uploaders"]["spk"]["uploader"] == "a"
+
+    assert release_audio_uploader(room, "a") == [("c", start("spk"))]
+    assert register_audio_upload(room, "spk", "c") == (True, [])
+    assert release_audio_uploader(room, "b") == []
+    assert release_audio_uploader(room, "c") == []
+    assert room["audio_uploaders"]["spk"]["uploader"] is None
+
+
+def test_departing_speaker_entry_is_dropped():
+    room = make_room()
+    register_audio_upload(room, "spk", "a")
+    release_audio_uploader(room, "spk")
+    assert "spk" not in room["audio_uploaders"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
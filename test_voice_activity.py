@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for VAD endpointing on synthesized PCM (silence, tones and noise)
+"""
+
+import numpy as np
+import pytest
+
+from voice_activity import SpeechSegmenter, classify_frames
+
+RATE = 12000
+FRAME = 360  # 30 ms at 12 kHz
+
+
+def silence(seconds):
+    return np.zeros(int(RATE * seconds), dtype=np.int16)
+
+
+def tone(seconds, amplitude=5000, freq=200):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def pcm(*parts):
+    return np.concatenate(parts).astype("<i2").tobytes()
+
+
+def push_chunked(segmenter, audio, chunk_bytes=2048):
+    segments = []
+    for i in range(0, len(audio), chunk_bytes):
+        segments.extend(segmenter.push(audio[i:i + chunk_bytes]))
+    return segments
+
+
+def test_speech_between_silences_is_one_segment_with_hangover():
+    segmenter = SpeechSegmenter(sample_rate=RATE)
+    segments = push_chunked(segmenter, pcm(silence(0.6), tone(1.2), silence(0.9)))
+
+    assert len(segments) == 1
+    segment = segments[0]
+    assert segment.index == 1
+    assert segment.offset == int(RATE * 0.6)
+    # 40 speech frames plus 10 hangover frames (300 ms)
+    assert len(segment.audio) == (40 + 10) * FRAME * 2
+    assert segment.audio[:FRAME * 2] == pcm(tone(1.2))[:FRAME * 2]
+    assert not segmenter.has_pending
+    assert segmenter.frames_seen == int(RATE * 2.7) // FRAME
+    assert segmenter.frames_dropped == 20 + 20
+
+
+def test_chunk_size_does_not_change_boundaries():
+    audio = pcm(silence(0.3), tone(0.5), silence(0.6), tone(0.4), silence(0.6))
+    whole = SpeechSegmenter(sample_rate=RATE).push(audio)
+    chunked = push_chunked(SpeechSegmenter(sample_rate=RATE), audio, chunk_bytes=998)
+
+    assert [(s.index, s.offset, s.audio) for s in whole] == [(s.index, s.offset, s.audio) for s in chunked]
+    # Boundaries snap to the start of the first frame containing speech
+    assert [s.offset for s in whole] == [int(RATE * 0.3), int(RATE * 1.4) // FRAME * FRAME]
+
+
+def test_short_pause_inside_hangover_keeps_one_segment():
+    segmenter = SpeechSegmenter(sample_rate=RATE)
+    segments = push_chunked(segmenter, pcm(tone(0.6), silence(0.15), tone(0.6), silence(0.6)))
+    assert len(segments) == 1
+    assert len(segments[0].audio) == (20 + 5 + 20 + 10) * FRAME * 2
+
+
+def test_long_speech_is_split_at_the_max_segment_length():
+    segmenter = SpeechSegmenter(sample_rate=RATE, max_segment_seconds=0.6)
+    segments = push_chunked(segmenter, pcm(silence(0.3), tone(1.5), silence(0.6)))
+
+    # 50 speech + 10 hangover frames cut into 20-frame segments
+    assert [s.index for s in segments] == [1, 2, 3]
+    assert [len(s.audio) for s in segments] == [20 * FRAME * 2] * 3
+    start = int(RATE * 0.3)
+    assert [s.offset for s in segments] == [start, start + 20 * FRAME, start + 40 * FRAME]
+
+
+def test_clicks_are_dropped_and_open_segments_flush():
+    segmenter = SpeechSegmenter(sample_rate=RATE)
+    assert push_chunked(segmenter, pcm(silence(0.3), tone(0.09), silence(0.6))) == []
+    assert segmenter.segments_opened == 1
+
+    assert segmenter.push(pcm(tone(0.5))) == []
+    assert segmenter.has_pending
+    assert segmenter.pending_seconds == pytest.approx(0.48)
+    segment = segmenter.flush()
+    assert segment.index == 2
+    assert segment.offset == int(RATE * 0.99) // FRAME * FRAME
+    assert segmenter.flush() is None
+
+
+def test_quiet_unvoiced_noise_counts_as_speech():
+    rng = np.random.default_rng(0)
+    hiss = rng.choice([-300, 300], size=(4, FRAME)).astype(np.int16)
+    hum = np.tile((300 * np.sin(2 * np.pi * 100 * np.arange(FRAME) / RATE)).astype(np.int16), (4, 1))
+    assert classify_frames(hiss).all()
+    assert not classify_frames(hum).any()
+    assert not classify_frames(np.zeros((2, FRAME), dtype=np.int16)).any()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
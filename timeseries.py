@@ -0,0 +1,157 @@
+# timeseries.py - Bounded multi-resolution metric history per room and participant
+import time
+
+import numpy as np
+
+# (bucket seconds, slots) per tier; 0 keeps raw samples. With the defaults a
+# series holds the last 300 samples, 1 hour at 10 s and 12 hours at 1 minute.
+DEFAULT_TIERS = ((0, 300), (10, 360), (60, 720))
+ROOM = "room"  # series key for room-wide series
+INITIAL_SLOTS = 16  # a tier's arrays start this small and double up to its capacity
+
+
+class _Tier:
+    """
+    Ring of (bucket start, count, sum, min, max) slots at one resolution.
+
+    The arrays grow on demand, so short-lived series do not hold the full
+    capacity; slots fill in order until the first wrap, at which point
+    the arrays have reached capacity.
+    """
+
+    _COLUMNS = (("start", np.float64), ("count", np.int64), ("sum", np.float64),
+                ("min", np.float64), ("max", np.float64))
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.head = -1
+        self.size = 0
+        self._grow(min(capacity, INITIAL_SLOTS))
+
+    def _grow(self, slots):
+        for name, dtype in self._COLUMNS:
+            column = np.zeros(slots, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                column[:old.size] = old
+            setattr(self, name, column)
+
+    def add(self, ts, value):
+        bucket = ts - ts % self.resolution if self.resolution else ts
+        head = self.head
+        if self.resolution and self.size and bucket <= self.start[head]:
+            # Same bucket (late samples fold into the newest bucket too)
+            self.count[head] += 1
+            self.sum[head] += value
+            if value < self.min[head]:
+                self.min[head] = value
+            if value > self.max[head]:
+                self.max[head] = value
+            return
+
+        head = self.head = (head + 1) % self.capacity
+        if head == self.start.size:
+            self._grow(min(self.capacity, head * 2))
+        self.size = min(self.size + 1, self.capacity)
+        self.start[head] = bucket
+        self.count[head] = 1
+        self.sum[head] = self.min[head] = self.max[head] = value
+
+    def covers(self, since):
+        """Whether this tier still holds everything from since onwards"""
+        if self.size < self.capacity:
+            return True
+        oldest = self.start[(self.head + 1) % self.capacity]
+        return since is not None and oldest <= since
+
+    def query(self, since=None):
+        order = (np.arange(self.size) + self.head + 1 - self.size) % self.capacity
+        if since is not None:
+            order = order[self.start[order] + self.resolution >= since]
+        return {
+            "resolution": self.resolution,
+            "t": self.start[order].tolist(),
+            "mean": (self.sum[order] / self.count[order]).tolist(),
+            "min": self.min[order].tolist(),
+            "max": self.max[order].tolist(),
+            "count": self.count[order].tolist()
+        }
+
+
+class TimeSeries:
+    """One metric's history: raw samples rolled up into coarser buckets on append"""
+
+    def __init__(self, tiers=DEFAULT_TIERS):
+        self.tiers = [_Tier(resolution, capacity) for resolution, capacity in tiers]
+        self.last_value = None
+        self.last_ts = None
+
+    def add(self, value, ts=None):
+        ts = time.time() if ts is None else ts
+        for tier in self.tiers:
+            tier.add(ts, value)
+        self.last_value = value
+        self.last_ts = ts
+
+    def query(self, since=None, resolution=None):
+        """
+        Columnar points from since onwards
+
+        Args:
+            since: Start timestamp (None for everything retained)
+            resolution: Tier in seconds (0 for raw); by default the finest
+                tier that still covers the whole range
+
+        Returns:
+            Dictionary with resolution and t/mean/min/max/count lists
+        """
+        if resolution is not None:
+            tier = next((t for t in self.tiers if t.resolution == resolution), None)
+            if tier is None:
+                raise ValueError(f"Unknown resolution: {resolution}")
+        else:
+            tier = next((t for t in self.tiers if t.covers(since)), self.tiers[-1])
+        return tier.query(since)
+
+
+class MetricsStore:
+    """Time series per (metric, participant) for one room, plus room-wide series"""
+
+    def __init__(self, tiers=DEFAULT_TIERS):
+        self.tiers = tiers
+        self.series = {}
+
+    def record(self, metric, value, sid=None, ts=None):
+        """Add a sample to the participant's series and to the room-wide series"""
+        ts = time.time() if ts is None else ts
+        value = float(value)
+        keys = [(metric, ROOM)] if sid is None else [(metric, sid), (metric, ROOM)]
+        for key in keys:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = TimeSeries(self.tiers)
+            series.add(value, ts)
+
+    def get(self, metric, sid=None):
+        return self.series.get((metric, sid or ROOM))
+
+    def query(self, metric, sid=None, since=None, resolution=None):
+        series = self.get(metric, sid)
+        if series is None:
+            return None
+        return series.query(since, resolution)
+
+    def describe(self):
+        """Metric name -> series keys (participant ids and "room")"""
+        metrics = {}
+        for metric, key in self.series:
+            metrics.setdefault(metric, []).append(key)
+        return metrics
+
+    def export(self, resolution=None):
+        """Every series as plain data, e.g. for the meeting archive"""
+        exported = {}
+        for (metric, key), series in self.series.items():
+            exported.setdefault(metric, {})[key] = series.query(resolution=resolution)
+        return exported
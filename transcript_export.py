@@ -0,0 +1,124 @@
+# transcript_export.py - Streaming transcript exports (NDJSON, CSV, SRT, plain text)
+import io
+import csv
+import json
+import zlib
+from datetime import datetime, timezone
+
+from records import as_dict
+
+# format -> (mimetype, file extension)
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "srt": ("application/x-subrip", "srt"),
+    "txt": ("text/plain", "txt")
+}
+CSV_COLUMNS = ("ts", "time", "speaker", "sid", "text", "sentiment")
+MIN_CUE_SECONDS = 1.0      # shortest subtitle cue
+MAX_CUE_SECONDS = 10.0     # a cue ends at the next entry or after this long
+GZIP_LEVEL = 6
+
+
+def _speaker(entry):
+    return entry.get("speaker") or "Unknown"
+
+
+def _time(ts, fmt="%Y-%m-%d %H:%M:%S UTC"):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime(fmt)
+
+
+def _srt_time(seconds):
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def _ndjson(entries):
+    for entry in entries:
+        yield json.dumps(entry, ensure_ascii=False, default=as_dict) + "\n"
+
+
+def _csv(entries):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for entry in entries:
+        ts = entry.get("ts", 0)
+        writer.writerow((ts, _time(ts, "%Y-%m-%dT%H:%M:%SZ"), _speaker(entry), entry.get("sid") or "",
+                         entry.get("text", ""), entry.get("sentiment", "")))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _txt(entries):
+    for entry in entries:
+        yield f"[{_time(entry.get('ts', 0))}] {_speaker(entry)}: {entry.get('text', '')}\n"
+
+
+def _srt(entries):
+    # Each cue ends when the next entry starts, so hold one entry back
+    start = None
+    previous = None
+    number = 0
+    for entry in entries:
+        if start is None:
+            start = entry.get("ts", 0)
+        if previous is not None:
+            number += 1
+            yield _srt_cue(number, previous, entry.get("ts", 0), start)
+        previous = entry
+    if previous is not None:
+        yield _srt_cue(number + 1, previous, None, start)
+
+
+def _srt_cue(number, entry, next_ts, start):
+    begin = max(0.0, entry.get("ts", 0) - start)
+    end = begin + MAX_CUE_SECONDS
+    if next_ts is not None:
+        end = min(end, max(0.0, next_ts - start))
+    end = max(end, begin + MIN_CUE_SECONDS)
+    return f"{number}\n{_srt_time(begin)} --> {_srt_time(end)}\n{_speaker(entry)}: {entry.get('text', '')}\n\n"
+
+
+_WRITERS = {"ndjson": _ndjson, "csv": _csv, "srt": _srt, "txt": _txt}
+
+
+def export_chunks(entries, fmt):
+    """
+    Serialize transcript entries one at a time
+
+    Args:
+        entries: Iterable of transcript entries in time order (consumed lazily)
+        fmt: One of FORMATS
+
+    Returns:
+        Generator of text chunks
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format: {fmt} (use {', '.join(FORMATS)})")
+    return _WRITERS[fmt](entries)
+
+
+def gzip_chunks(chunks, level=GZIP_LEVEL):
+    """Gzip a stream of text chunks without buffering the whole document"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def snapshot(entries):
+    """Entries of a live list as it is now; later appends are not included"""
+    for i in range(len(entries)):
+        yield entries[i]
@@ -0,0 +1,265 @@
+# transcript_search.py - SQLite FTS5 full-text search over live and archived transcripts
+import os
+import re
+import html
+import time
+import queue
+import sqlite3
+import logging
+import threading
+
+from meeting_archive import ARCHIVE_DIR, list_meetings, load_meeting_meta, iter_transcript
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SEARCH_DB = os.environ.get("SEARCH_DB", os.path.join(ARCHIVE_DIR, "search.db"))
+SEARCH_ENABLED = os.environ.get("TRANSCRIPT_SEARCH", "true").lower() in ("1", "true", "yes")
+WRITE_BATCH_SIZE = 500        # rows per insert transaction
+MAX_RESULTS = 100
+SNIPPET_TOKENS = 12
+LIVE_MEETING = ""             # meeting id of entries from meetings still in progress
+
+# Highlight markers outside anything users type; results are HTML-escaped
+# and the markers turned into <mark> tags afterwards
+_MARK_START, _MARK_END = "\ue000", "\ue001"
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5(
+    text, speaker, room UNINDEXED, meeting UNINDEXED, sid UNINDEXED, ts UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS indexed_meetings (
+    meeting_id TEXT PRIMARY KEY,
+    room TEXT,
+    indexed_at REAL
+);
+"""
+
+
+def match_query(q):
+    """
+    Turn user input into an FTS5 query
+
+    Words must all match; "quoted text" matches as a phrase and a trailing
+    * makes a word a prefix. Operators and column filters are not passed
+    through.
+
+    Raises:
+        ValueError: If the query has no words
+    """
+    parts = []
+    for phrase, token in _QUERY_TOKEN.findall(q or ""):
+        if phrase:
+            words = _WORD.findall(phrase)
+            if words:
+                parts.append('"' + " ".join(words) + '"')
+        else:
+            for word in _WORD.findall(token):
+                parts.append(f'"{word}"')
+            if token.endswith("*") and parts and parts[-1].endswith('"'):
+                parts[-1] += "*"
+    if not parts:
+        raise ValueError("Search query has no words")
+    return " ".join(parts)
+
+
+def _entry_row(room, meeting_id, entry):
+    return (entry.get("text", ""), entry.get("speaker", ""), room, meeting_id,
+            entry.get("sid") or "", entry.get("ts", 0))
+
+
+class TranscriptIndex:
+    """
+    Full-text index of transcript entries.
+
+    Handlers only enqueue rows; one writer thread batches them into
+    transactions, so indexing never blocks the event loop. Entries of
+    meetings in progress are indexed under LIVE_MEETING and moved to the
+    meeting's archive id when it finishes. Archived meetings that are not
+    yet indexed are picked up by backfill(). Reads use one connection per
+    thread and WAL mode lets them run alongside the writer.
+    """
+
+    def __init__(self, path=SEARCH_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self.stats = {"indexed": 0, "queries": 0, "batches": 0}
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.commit()
+        self._writer = threading.Thread(target=self._write_loop, args=(conn,), daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # Writes
+
+    def add(self, room, entry, meeting_id=LIVE_MEETING):
+        """Queue one transcript entry for indexing"""
+        self._queue.put(("row", _entry_row(room, meeting_id, entry)))
+
+    def assign_meeting(self, room, meeting_id):
+        """A room's meeting finished: file its live entries under the archive id"""
+        def assign(conn):
+            conn.execute("UPDATE entries SET meeting = ? WHERE room = ? AND meeting = ?",
+                         (meeting_id, room, LIVE_MEETING))
+            conn.execute("INSERT OR REPLACE INTO indexed_meetings VALUES (?, ?, ?)",
+                         (meeting_id, room, time.time()))
+        self._queue.put(("call", assign, None))
+
+    def replace_meeting(self, meeting_id, room, entries, wait=True):
+        """Re-index an archived meeting (e.g. after batch re-transcription)"""
+        rows = [_entry_row(room, meeting_id, entry) for entry in entries]
+
+        def replace(conn):
+            conn.execute("DELETE FROM entries WHERE meeting = ?", (meeting_id,))
+            conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO indexed_meetings VALUES (?, ?, ?)",
+                         (meeting_id, room, time.time()))
+            self.stats["indexed"] += len(rows)
+        self._call(replace, wait)
+
+    def backfill(self, wait=False):
+        """Index archived meetings that are not in the index yet"""
+        def index_archive(conn):
+            known = {row[0] for row in conn.execute("SELECT meeting_id FROM indexed_meetings")}
+            for meeting_id in list_meetings():
+                if meeting_id in known:
+                    continue
+                room = (load_meeting_meta(meeting_id) or {}).get("room", "")
+                rows = [_entry_row(room, meeting_id, entry) for entry in iter_transcript(meeting_id)]
+                conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("INSERT INTO indexed_meetings VALUES (?, ?, ?)", (meeting_id, room, time.time()))
+                conn.commit()
+                self.stats["indexed"] += len(rows)
+                logger.info(f"Indexed archived meeting {meeting_id} ({len(rows)} entries)")
+        self._call(index_archive, wait)
+
+    def flush(self):
+        """Block until everything queued so far is written"""
+        self._call(lambda conn: None, wait=True)
+
+    def _call(self, fn, wait):
+        done = threading.Event() if wait else None
+        self._queue.put(("call", fn, done))
+        if done is not None:
+            done.wait()
+
+    def _write_loop(self, conn):
+        while True:
+            item = self._queue.get()
+            rows = []
+            while item is not None and item[0] == "row":
+                rows.append(item[1])
+                if len(rows) >= WRITE_BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            if rows:
+                try:
+                    conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+                    conn.commit()
+                    self.stats["indexed"] += len(rows)
+                    self.stats["batches"] += 1
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Search index write error: {e}")
+            if item is not None and item[0] == "call":
+                try:
+                    item[1](conn)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Search index write error: {e}")
+                finally:
+                    if item[2] is not None:
+                        item[2].set()
+
+    # Reads
+
+    def search(self, q, room=None, speaker=None, since=None, until=None, limit=20):
+        """
+        Entries matching a query, best first
+
+        Args:
+            q: Search text (see match_query)
+            room: Only this room
+            speaker: Only this speaker name (case-insensitive)
+            since, until: Entry timestamp bounds
+            limit: Maximum results (capped at MAX_RESULTS)
+
+        Returns:
+            List of result dictionaries with an HTML-escaped snippet whose
+            matches are wrapped in <mark> tags
+        """
+        sql = [f"""SELECT room, meeting, sid, speaker, ts,
+                          snippet(entries, 0, ?, ?, '…', {SNIPPET_TOKENS}), bm25(entries)
+                   FROM entries WHERE entries MATCH ?"""]
+        params = [_MARK_START, _MARK_END, match_query(q)]
+        if room:
+            sql.append("AND room = ?")
+            params.append(room)
+        if speaker:
+            sql.append("AND speaker = ? COLLATE NOCASE")
+            params.append(speaker)
+        if since is not None:
+            sql.append("AND ts >= ?")
+            params.append(since)
+        if until is not None:
+            sql.append("AND ts <= ?")
+            params.append(until)
+        sql.append("ORDER BY rank LIMIT ?")
+        params.append(max(1, min(int(limit), MAX_RESULTS)))
+
+        rows = self._reader().execute(" ".join(sql), params).fetchall()
+        self.stats["queries"] += 1
+        return [{
+            "room": room,
+            "meeting_id": meeting or None,
+            "live": meeting == LIVE_MEETING,
+            "sid": sid or None,
+            "speaker": speaker,
+            "ts": ts,
+            "snippet": html.escape(snippet).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>"),
+            "score": -score
+        } for room, meeting, sid, speaker, ts, snippet, score in rows]
+
+    def get_stats(self):
+        return dict(self.stats, pending=self._queue.qsize())
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """The process-wide index (None when search is disabled or FTS5 is unavailable)"""
+    global _index
+    if not SEARCH_ENABLED:
+        return None
+    with _index_lock:
+        if _index is None:
+            try:
+                _index = TranscriptIndex()
+            except sqlite3.Error as e:
+                logger.error(f"Transcript search unavailable: {e}")
+                return None
+        return _index
@@ -0,0 +1,204 @@
+# transcript_stats.py - Incremental transcript statistics and TF-IDF topics
+import os
+import re
+import json
+import math
+import logging
+import tempfile
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+CORPUS_PATH = os.environ.get("TOPIC_CORPUS_PATH", os.path.join(os.environ.get("ARCHIVE_DIR", "archive"), "corpus.json"))
+TOPIC_CANDIDATES = 50      # most frequent terms re-ranked by TF-IDF
+WORDS_PER_MINUTE = 150
+
+# Same filtering as summarizer.extract_key_topics
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are',
+    'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it',
+    'we', 'they', 'me', 'him', 'her', 'us', 'them'
+})
+PUNCTUATION = '.,!?;:"()[]{}'
+BIGRAM_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def topic_terms(text):
+    """Topic words of a text: lowercased, punctuation stripped, longer than 3, no stop words"""
+    terms = []
+    for word in text.lower().split():
+        word = word.strip(PUNCTUATION)
+        if len(word) > 3 and word not in STOP_WORDS:
+            terms.append(word)
+    return terms
+
+
+def bigrams(text):
+    """Adjacent word pairs where neither word is a stop word"""
+    words = BIGRAM_PATTERN.findall(text.lower())
+    return [f"{a} {b}" for a, b in zip(words, words[1:])
+            if a not in STOP_WORDS and b not in STOP_WORDS and len(a) > 2 and len(b) > 2]
+
+
+class FrequencyIndex:
+    """
+    Counter with O(1) increments and top-k reads.
+
+    Terms are also kept in per-count buckets, so the most frequent terms
+    are read by walking buckets down from the highest count instead of
+    sorting the whole vocabulary.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.buckets = [{}]    # count -> insertion-ordered set of terms
+        self.max_count = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, term):
+        count = self.counts[term]
+        if count:
+            del self.buckets[count][term]
+        count += 1
+        self.counts[term] = count
+        if count == len(self.buckets):
+            self.buckets.append({})
+        self.buckets[count][term] = None
+        self.max_count = max(self.max_count, count)
+
+    def top(self, k):
+        """Up to k (term, count) pairs, most frequent first"""
+        result = []
+        count = self.max_count
+        while count > 0 and len(result) < k:
+            for term in self.buckets[count]:
+                result.append((term, count))
+                if len(result) == k:
+                    break
+            count -= 1
+        return result
+
+
+class BackgroundCorpus:
+    """
+    Document frequencies of topic terms across archived meetings, used as
+    the IDF side of topic weighting. Each finished meeting adds one
+    document; the counts persist in a small JSON file.
+    """
+
+    def __init__(self, path=CORPUS_PATH):
+        self.path = path
+        self.documents = 0
+        self.df = Counter()
+        self._lock = threading.Lock()
+        if path and os.path.isfile(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self.documents = data.get("documents", 0)
+                self.df.update(data.get("df", {}))
+            except Exception as e:
+                logger.error(f"Could not load topic corpus {path}: {e}")
+
+    def idf(self, term):
+        return math.log((1 + self.documents) / (1 + self.df.get(term, 0))) + 1
+
+    def add_document(self, terms):
+        """Count a finished meeting's distinct terms and save the corpus"""
+        with self._lock:
+            self.documents += 1
+            self.df.update(set(terms))
+            if self.path:
+                self._save()
+
+    def _save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"documents": self.documents, "df": self.df}, f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+
+class TranscriptStats:
+    """
+    Word, sentence, term and phrase counts of a room's transcript, updated
+    as entries are appended.
+
+    Counts match joining every entry's text with spaces and analysing the
+    whole text, as get_summary_stats does, without ever building it.
+    """
+
+    def __init__(self, corpus=None):
+        self.corpus = corpus
+        self.reset()
+
+    def reset(self):
+        """Forget every count (the transcript was cleared)"""
+        self.entries = 0
+        self.word_count = 0
+        self.closed_sentences = 0     # '.'-separated segments already terminated
+        self.open_sentence = False    # text after the last '.' is non-empty
+        self.terms = FrequencyIndex()
+        self.phrases = FrequencyIndex()
+
+    def add(self, text):
+        """Update the counts with one transcript entry's text"""
+        self.entries += 1
+        self.word_count += len(text.split())
+
+        parts = text.split(".")
+        if len(parts) == 1:
+            self.open_sentence = self.open_sentence or bool(parts[0].strip())
+        else:
+            self.closed_sentences += int(self.open_sentence or bool(parts[0].strip()))
+            self.closed_sentences += sum(1 for part in parts[1:-1] if part.strip())
+            self.open_sentence = bool(parts[-1].strip())
+
+        for term in topic_terms(text):
+            self.terms.add(term)
+        for phrase in bigrams(text):
+            self.phrases.add(phrase)
+
+    @property
+    def sentence_count(self):
+        return self.closed_sentences + int(self.open_sentence)
+
+    def _weighted(self, index, k):
+        candidates = index.top(max(k, TOPIC_CANDIDATES) if self.corpus else k)
+        if self.corpus is None or not self.corpus.documents:
+            return candidates[:k]
+        scored = [(term, count * self.corpus.idf(term)) for term, count in candidates]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:k]
+
+    def top_topics(self, k=5):
+        """Up to k topic words, TF-IDF weighted against the corpus when it has documents"""
+        return [term for term, _ in self._weighted(self.terms, k)]
+
+    def top_phrases(self, k=5):
+        """Up to k two-word phrases, weighted like top_topics"""
+        return [phrase for phrase, _ in self._weighted(self.phrases, k)]
+
+    def document_terms(self):
+        """Distinct terms and phrases, for adding this meeting to the corpus"""
+        return list(self.terms.counts) + list(self.phrases.counts)
+
+    def summary(self, max_topics=5):
+        """Dictionary in the shape of summarizer.get_summary_stats, plus key phrases"""
+        return {
+            "word_count": self.word_count,
+            "sentence_count": self.sentence_count,
+            "estimated_duration": self.word_count / WORDS_PER_MINUTE,
+            "key_topics": self.top_topics(max_topics),
+            "key_phrases": self.top_phrases(max_topics)
+        }
@@ -1,42 +1,40 @@
 # transcription.py - Enhanced transcription with multiple backends
-import os
 import time
 import queue
-import uuid
 import threading
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 import base64
 
-# Try to import optional dependencies
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-try:
-    import speech_recognition as sr
-    SPEECH_RECOGNITION_AVAILABLE = True
-except ImportError:
-    SPEECH_RECOGNITION_AVAILABLE = False
+from voice_activity import SpeechSegmenter, SAMPLE_RATE as VAD_SAMPLE_RATE
+from backend_clients import get_backend_client_stats
+from meeting_recorder import record_audio
+from records import TranscriptEntry
+from transcript_search import get_index as get_search_index
+from analytics import fleet
+from transcription_backends import (
+    get_backend,
+    select_backend_name,
+    available_backends,
+    OPENAI_AVAILABLE
+)
 
 # Configuration
-rooms = defaultdict(lambda: {"transcript": [], "chunk_queue": queue.Queue()})
+rooms = defaultdict(lambda: {
+    "transcript": [],
+    "chunk_queue": queue.Queue(),
+    "latency": {"final": deque(maxlen=200), "partial": deque(maxlen=200)}
+})
 audio_workers = {}
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+vad_stats = {"segments": 0, "speech_seconds": 0.0}
+PARTIAL_INTERVAL_SECONDS = 1.0  # min new audio in an open segment between interim decodes
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 def get_transcription_backend():
-    """Determine which transcription backend to use"""
-    if OPENAI_API_KEY and OPENAI_AVAILABLE:
-        return "openai"
-    elif SPEECH_RECOGNITION_AVAILABLE:
-        return "speech_recognition"
-    else:
-        return "mock"
+    """Determine which transcription backend to use (see transcription_backends)"""
+    return select_backend_name()
 
 def handle_audio_chunk(room, b64, ts=None, seq=None, from_sid=None):
     """Add base64 audio chunk into the queue for transcription"""
@@ -44,15 +42,20 @@ def handle_audio_chunk(room, b64, ts=None, seq=None, from_sid=None):
         return
     try:
         raw = base64.b64decode(b64)
-        rooms[room]["chunk_queue"].put((ts or time.time(), seq or 0, raw, from_sid))
+        rooms[room]["chunk_queue"].put((ts or time.time(), seq or 0, raw, from_sid, time.time()))
     except Exception as e:
         logger.error(f"Error handling audio chunk: {e}")
 
 def audio_worker_for_room(room, socketio):
-    """Background worker for transcription"""
+    """Background worker for transcription
+
+    Audio is run through a per-speaker VAD so only speech reaches the backend,
+    and segments are cut at natural pauses instead of fixed windows.
+    """
     q = rooms[room]["chunk_queue"]
-    buffer, last_flush = [], time.time()
-    FLUSH_SECONDS = 3
+    segmenters, last_audio, cadence, partial_marks = {}, {}, {}, {}
+    POLL_SECONDS = 0.25
+    FLUSH_SECONDS = 3  # minimum wait before closing a segment whose stream went quiet
     backend = get_transcription_backend()
 
     logger.info(f"Starting audio worker for room {room} with backend: {backend}")
@@ -60,143 +63,128 @@ def audio_worker_for_room(room, socketio):
     while True:
         try:
             try:
-                item = q.get(timeout=FLUSH_SECONDS)
-                buffer.append(item)
+                item = q.get(timeout=POLL_SECONDS)
             except queue.Empty:
-                pass
+                item = None
 
             now = time.time()
-            if buffer and (now - last_flush >= FLUSH_SECONDS):
-                buffer.sort(key=lambda x: (x[0], x[1]))
-
-                # Group by speaker (from_sid) to process separately
-                speaker_buffers = {}
-                for ts, seq, audio_data, from_sid in buffer:
-                    if from_sid not in speaker_buffers:
-                        speaker_buffers[from_sid] = []
-                    speaker_buffers[from_sid].append(audio_data)
-
-                # Process each speaker's audio separately
-                for from_sid, audio_chunks in speaker_buffers.items():
-                    combined = b''.join(audio_chunks)
-
-                    # Only process if we have substantial audio data
-                    if len(combined) > 1024:  # At least 1KB of audio
-                        text = transcribe_audio_data(combined, backend)
-                        if text and text.strip():
-                            entry = {
-                                "ts": int(now),
-                                "text": text.strip(),
-                                "backend": backend,
-                                "sid": from_sid,
-                                "speaker": f"User {from_sid[:8]}" if from_sid else "Unknown"
-                            }
-                            rooms[room]["transcript"].append(entry)
-                            socketio.emit('transcript-update', {"room": room, "entry": entry}, room=room)
-                            logger.info(f"Transcribed from {from_sid}: {text[:50]}...")
-
-                buffer, last_flush = [], now
+            if item:
+                ts, seq, audio_data, from_sid, received_at = item
+                segmenter = segmenters.get(from_sid)
+                if segmenter is None:
+                    segmenter = segmenters[from_sid] = SpeechSegmenter()
+                if from_sid in last_audio:
+                    # Track the uploader's send interval so idle flushes don't cut mid-word
+                    gap = received_at - last_audio[from_sid]
+                    cadence[from_sid] = 0.8 * cadence.get(from_sid, gap) + 0.2 * gap
+                last_audio[from_sid] = received_at
+                record_audio(room, from_sid, audio_data, received_at)
+                for segment in segmenter.push(audio_data):
+                    transcribe_segment(room, socketio, from_sid, segment, backend, received_at)
+
+                # Interim hypothesis for the segment still being spoken
+                if get_backend(backend).supports_partials and segmenter.has_pending:
+                    index, decoded = partial_marks.get(from_sid, (None, 0.0))
+                    first = index != segmenter.segments_opened
+                    if first:
+                        decoded = 0.0
+                    if segmenter.pending_seconds - decoded >= PARTIAL_INTERVAL_SECONDS:
+                        partial_marks[from_sid] = (segmenter.segments_opened, segmenter.pending_seconds)
+                        emit_partial_transcript(room, socketio, from_sid, segmenter, backend, first)
+
+            # Endpoint speakers whose audio stopped arriving mid-segment
+            for sid, segmenter in segmenters.items():
+                idle_limit = max(FLUSH_SECONDS, 1.5 * cadence.get(sid, 0))
+                if segmenter.has_pending and now - last_audio[sid] >= idle_limit:
+                    segment = segmenter.flush()
+                    if segment:
+                        transcribe_segment(room, socketio, sid, segment, backend, last_audio[sid])
 
         except Exception as e:
             logger.error(f"Audio worker error: {e}")
             time.sleep(1)
 
-def transcribe_audio_data(audio_data, backend="mock"):
-    """Transcribe audio data using the specified backend"""
-    try:
-        if backend == "openai" and OPENAI_AVAILABLE:
-            return transcribe_with_openai(audio_data)
-        elif backend == "speech_recognition" and SPEECH_RECOGNITION_AVAILABLE:
-            return transcribe_with_speech_recognition(audio_data)
-        else:
-            return transcribe_mock(audio_data)
-    except Exception as e:
-        logger.error(f"Transcription error with {backend}: {e}")
-        return None
-
-def transcribe_with_openai(audio_data):
-    """Transcribe using OpenAI Whisper API"""
-    try:
-        # Save audio data to temporary file
-        uid = uuid.uuid4().hex
-        temp_path = f"/tmp/audio_{uid}.wav"
-
-        with open(temp_path, "wb") as f:
-            f.write(audio_data)
-
-        # Use OpenAI Whisper
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        with open(temp_path, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="text"
-            )
-
-        # Clean up
-        try:
-            os.remove(temp_path)
-        except:
-            pass
+def segment_id_for(from_sid, index):
+    """Stable id shared by a segment's partial and final transcript events"""
+    return f"{from_sid}:{index}"
 
-        return transcript.strip() if transcript else None
+def emit_partial_transcript(room, socketio, from_sid, segmenter, backend, first=False):
+    """Decode the open segment so far and broadcast it as an interim caption"""
+    text = None
+    for text, _ in stream_transcription(segmenter.pending_audio(), backend):
+        pass
+    if not text or not text.strip():
+        return
 
+    now = time.time()
+    if first and segmenter.segment_started_at:
+        rooms[room]["latency"]["partial"].append(now - segmenter.segment_started_at)
+    socketio.emit('transcript-partial', {
+        "room": room,
+        "segment_id": segment_id_for(from_sid, segmenter.segments_opened),
+        "text": text.strip(),
+        "ts": int(now),
+        "sid": from_sid,
+        "speaker": f"User {from_sid[:8]}" if from_sid else "Unknown"
+    }, room=room)
+
+def transcribe_segment(room, socketio, from_sid, segment, backend, speech_end_at=None):
+    """
+    Transcribe one speech segment and broadcast the transcript entry
+
+    Streaming backends also emit interim hypotheses as transcript-partial
+    events; the final transcript-update carries the same segment_id so
+    clients can replace the interim caption.
+    """
+    vad_stats["segments"] += 1
+    vad_stats["speech_seconds"] += len(segment.audio) / 2 / VAD_SAMPLE_RATE
+    segment_id = segment_id_for(from_sid, segment.index)
+    speaker = f"User {from_sid[:8]}" if from_sid else "Unknown"
+
+    text = None
+    for text, is_final in stream_transcription(segment.audio, backend):
+        if not is_final and text and text.strip():
+            socketio.emit('transcript-partial', {
+                "room": room,
+                "segment_id": segment_id,
+                "text": text.strip(),
+                "ts": int(time.time()),
+                "sid": from_sid,
+                "speaker": speaker
+            }, room=room)
+
+    if text and text.strip():
+        entry = TranscriptEntry(int(time.time()), text.strip(), from_sid, speaker,
+                                backend=backend, segment_id=segment_id)
+        rooms[room]["transcript"].append(entry)
+        search_index = get_search_index()
+        if search_index is not None:
+            search_index.add(room, entry)
+        socketio.emit('transcript-update', {"room": room, "entry": entry.to_dict()}, room=room)
+        if speech_end_at:
+            rooms[room]["latency"]["final"].append(time.time() - speech_end_at)
+            fleet.record("caption_latency", time.time() - speech_end_at)
+        logger.info(f"Transcribed from {from_sid}: {text[:50]}...")
+
+def stream_transcription(audio_data, backend="mock"):
+    """
+    Yield (text, is_final) hypotheses for a segment
+
+    Backends without partial results yield a single final hypothesis.
+    """
+    try:
+        yield from get_backend(backend).stream(audio_data)
     except Exception as e:
-        logger.error(f"OpenAI transcription error: {e}")
-        return None
+        logger.error(f"Streaming transcription error with {backend}: {e}")
 
-def transcribe_with_speech_recognition(audio_data):
-    """Transcribe using SpeechRecognition library"""
+def transcribe_audio_data(audio_data, backend="mock"):
+    """Transcribe audio data using the specified backend"""
     try:
-        # This is a simplified implementation
-        # In practice, you'd need to convert the audio format properly
-        r = sr.Recognizer()
-
-        # Save audio data to temporary file
-        uid = uuid.uuid4().hex
-        temp_path = f"/tmp/audio_{uid}.wav"
-
-        with open(temp_path, "wb") as f:
-            f.write(audio_data)
-
-        # Load audio file
-        with sr.AudioFile(temp_path) as source:
-            audio = r.record(source)
-
-        # Recognize speech using Google Speech Recognition
-        text = r.recognize_google(audio)
-
-        # Clean up
-        try:
-            os.remove(temp_path)
-        except:
-            pass
-
-        return text.strip() if text else None
-
-    except sr.UnknownValueError:
-        # Speech was unintelligible
-        return None
-    except sr.RequestError as e:
-        logger.error(f"Speech recognition service error: {e}")
-        return None
+        return get_backend(backend).transcribe(audio_data)
     except Exception as e:
-        logger.error(f"Speech recognition error: {e}")
+        logger.error(f"Transcription error with {backend}: {e}")
         return None
 
-def transcribe_mock(audio_data):
-    """Mock transcription for testing"""
-    # Simulate processing time
-    time.sleep(0.1)
-
-    # Return mock text based on audio data size
-    if len(audio_data) > 5000:
-        return "This is a longer speech segment detected by the mock transcription service."
-    elif len(audio_data) > 2000:
-        return "Speech detected by mock transcription."
-    else:
-        return "Brief audio detected."
-
 def transcribe_audio_file(path):
     """Legacy function for backward compatibility"""
     backend = get_transcription_backend()
@@ -237,13 +225,44 @@ def clear_room_transcript(room):
     rooms[room]["transcript"] = []
     logger.info(f"Cleared transcript for room: {room}")
 
+def get_caption_latency(room):
+    """
+    Summarize caption latency for a room
+
+    Final latency runs from the last speech audio reaching the server to the
+    final transcript-update; partial latency runs from segment start to the
+    first interim caption.
+    """
+    def summarize(samples):
+        if not samples:
+            return {"count": 0, "mean": None, "p50": None, "p95": None}
+        ordered = sorted(samples)
+        return {
+            "count": len(ordered),
+            "mean": round(sum(ordered) / len(ordered), 3),
+            "p50": round(ordered[len(ordered) // 2], 3),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3)
+        }
+
+    latency = rooms[room]["latency"]
+    return {
+        "final": summarize(latency["final"]),
+        "partial": summarize(latency["partial"])
+    }
+
 def get_transcription_stats():
     """Get statistics about transcription service"""
     backend = get_transcription_backend()
     return {
         "backend": backend,
         "openai_available": OPENAI_AVAILABLE,
-        "speech_recognition_available": SPEECH_RECOGNITION_AVAILABLE,
+        "speech_recognition_available": "speech_recognition" in available_backends(),
         "active_rooms": len(audio_workers),
+        "speech_segments": vad_stats["segments"],
+        "speech_seconds": round(vad_stats["speech_seconds"], 1),
+        "available_backends": available_backends(),
+        "streaming": get_backend(backend).supports_partials,
+        "caption_latency": {room: get_caption_latency(room) for room in list(audio_workers)},
+        "backend_clients": get_backend_client_stats(),
         "total_rooms": len(rooms)
     }
@@ -0,0 +1,251 @@
+# transcription_backends.py - Pluggable transcription backend registry
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+from voice_activity import SAMPLE_RATE
+from backend_clients import get_backend_client, OPENAI_AVAILABLE, OPENAI_API_KEY, GOOGLE_SPEECH_KEY
+
+# Try to import optional dependencies
+try:
+    from transformers import pipeline as hf_pipeline
+    LOCAL_ENGINE_AVAILABLE = True
+except ImportError:
+    LOCAL_ENGINE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+TRANSCRIPTION_BACKEND = os.environ.get("TRANSCRIPTION_BACKEND")  # force a backend by name
+LOCAL_ASR_MODEL = os.environ.get("LOCAL_ASR_MODEL", "openai/whisper-tiny.en")
+LOCAL_ASR_MAX_BATCH = int(os.environ.get("LOCAL_ASR_MAX_BATCH", 8))
+LOCAL_ASR_BATCH_WAIT_MS = int(os.environ.get("LOCAL_ASR_BATCH_WAIT_MS", 50))
+LOCAL_ASR_SAMPLE_RATE = 16000
+BACKEND_RETRY_SECONDS = 60  # after a backend fails to start, use the mock this long
+
+_registry = {}
+_instances = {}
+_failures = {}   # name -> time the backend last failed to start
+_instances_lock = threading.Lock()
+_warned = set()
+
+
+def register_backend(cls):
+    """Class decorator adding a backend to the registry under cls.name"""
+    _registry[cls.name] = cls
+    return cls
+
+
+class TranscriptionBackend:
+    """
+    Common interface for transcription backends.
+
+    transcribe() handles one segment of 16-bit mono PCM; stream() yields
+    (text, is_final) hypotheses and transcribe_batch() handles several
+    segments at once. Backends override whichever they do natively.
+    """
+
+    name = None
+    supports_partials = False
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    def transcribe(self, audio_data):
+        raise NotImplementedError
+
+    def stream(self, audio_data):
+        yield self.transcribe(audio_data), True
+
+    def transcribe_batch(self, segments):
+        return [self.transcribe(audio_data) for audio_data in segments]
+
+
+@register_backend
+class OpenAIBackend(TranscriptionBackend):
+    """OpenAI Whisper API"""
+
+    name = "openai"
+
+    @classmethod
+    def is_available(cls):
+        return bool(OPENAI_API_KEY) and OPENAI_AVAILABLE
+
+    def transcribe(self, audio_data):
+        return get_backend_client("openai").transcribe(audio_data)
+
+
+@register_backend
+class GoogleSpeechBackend(TranscriptionBackend):
+    """Google web speech API (as used by SpeechRecognition)"""
+
+    name = "speech_recognition"
+
+    @classmethod
+    def is_available(cls):
+        return bool(GOOGLE_SPEECH_KEY)
+
+    def transcribe(self, audio_data):
+        return get_backend_client("speech_recognition").transcribe(audio_data)
+
+
+@register_backend
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    Offline CPU engine. The model is loaded once per process and a single
+    engine thread batches segments from every room into one inference call.
+    """
+
+    name = "local"
+
+    @classmethod
+    def is_available(cls):
+        return LOCAL_ENGINE_AVAILABLE
+
+    def __init__(self, model=LOCAL_ASR_MODEL, max_batch=LOCAL_ASR_MAX_BATCH,
+                 batch_wait_ms=LOCAL_ASR_BATCH_WAIT_MS):
+        logger.info(f"Loading local ASR model {model}")
+        self.pipe = hf_pipeline("automatic-speech-recognition", model=model, device=-1)
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait_ms / 1000
+        self.requests = queue.Queue()
+        self.batches = 0
+        threading.Thread(target=self._engine_loop, daemon=True).start()
+
+    def transcribe(self, audio_data):
+        return self.transcribe_batch([audio_data])[0]
+
+    def transcribe_batch(self, segments):
+        futures = []
+        for audio_data in segments:
+            future = Future()
+            self.requests.put((audio_data, future))
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def _engine_loop(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.time() + self.batch_wait
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.requests.get(timeout=max(0, deadline - time.time())))
+                except queue.Empty:
+                    break
+
+            inputs = [{"raw": _pcm_to_float(audio_data), "sampling_rate": LOCAL_ASR_SAMPLE_RATE}
+                      for audio_data, _ in batch]
+            try:
+                outputs = self.pipe(inputs, batch_size=len(inputs))
+                self.batches += 1
+                for (_, future), output in zip(batch, outputs):
+                    text = (output.get("text") or "").strip()
+                    future.set_result(text or None)
+            except Exception as e:
+                logger.error(f"Local ASR batch error: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+
+
+def _pcm_to_float(audio_data, sample_rate=SAMPLE_RATE):
+    """16-bit PCM to float32 at the model's sample rate (linear resampling)"""
+    usable = len(audio_data) - (len(audio_data) % 2)
+    samples = np.frombuffer(audio_data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+    if sample_rate == LOCAL_ASR_SAMPLE_RATE or samples.size < 2:
+        return samples
+    duration = samples.size / sample_rate
+    target = np.linspace(0, duration, int(duration * LOCAL_ASR_SAMPLE_RATE), endpoint=False)
+    source = np.arange(samples.size) / sample_rate
+    return np.interp(target, source, samples).astype(np.float32)
+
+
+@register_backend
+class MockBackend(TranscriptionBackend):
+    """Deterministic stand-in for tests and for running without any engine"""
+
+    name = "mock"
+    supports_partials = True
+
+    def transcribe(self, audio_data):
+        # Simulate processing time
+        time.sleep(0.1)
+
+        # Return mock text based on audio data size
+        if len(audio_data) > 5000:
+            return "This is a longer speech segment detected by the mock transcription service."
+        elif len(audio_data) > 2000:
+            return "Speech detected by mock transcription."
+        else:
+            return "Brief audio detected."
+
+    def stream(self, audio_data):
+        if len(audio_data) > 5000:
+            yield "This is a longer speech segment", False
+        yield self.transcribe(audio_data), True
+
+
+# Auto-selection order when TRANSCRIPTION_BACKEND is not set; the local engine
+# is left out because loading a model is too heavy to do implicitly
+AUTO_SELECT_ORDER = ["openai", "speech_recognition", "mock"]
+
+
+def available_backends():
+    """Names of registered backends usable in this process"""
+    return [name for name, cls in _registry.items() if cls.is_available()]
+
+
+def select_backend_name():
+    """Pick the configured backend, falling back to the first available one"""
+    if TRANSCRIPTION_BACKEND:
+        cls = _registry.get(TRANSCRIPTION_BACKEND)
+        if cls and cls.is_available():
+            return TRANSCRIPTION_BACKEND
+        if TRANSCRIPTION_BACKEND not in _warned:
+            _warned.add(TRANSCRIPTION_BACKEND)
+            logger.warning(f"Transcription backend '{TRANSCRIPTION_BACKEND}' not available, auto-selecting")
+    for name in AUTO_SELECT_ORDER:
+        cls = _registry.get(name)
+        if cls and cls.is_available():
+            break
+    else:
+        name = "mock"
+    if name == "mock" and "mock" not in _warned:
+        _warned.add("mock")
+        logger.warning("No transcription engine configured (set OPENAI_API_KEY or GOOGLE_SPEECH_KEY, "
+                       "or TRANSCRIPTION_BACKEND=local); live captions use the mock backend")
+    return name
+
+
+def get_backend(name):
+    """
+    Return the process-wide instance of a backend
+
+    Unknown or unavailable names get the mock. So does a backend that
+    failed to start (e.g. its model would not load) within the last
+    BACKEND_RETRY_SECONDS, rather than every segment retrying the load.
+    """
+    cls = _registry.get(name)
+    if cls is None or not cls.is_available():
+        name, cls = "mock", _registry["mock"]
+    backend = _instances.get(name)
+    if backend is not None:
+        return backend
+    with _instances_lock:
+        backend = _instances.get(name)
+        if backend is None and time.time() - _failures.get(name, float("-inf")) >= BACKEND_RETRY_SECONDS:
+            try:
+                backend = _instances[name] = cls()
+                _failures.pop(name, None)
+            except Exception as e:
+                if name == "mock":
+                    raise
+                _failures[name] = time.time()
+                logger.error(f"Transcription backend '{name}' failed to start, using mock for "
+                             f"{BACKEND_RETRY_SECONDS}s: {e}")
+    return backend if backend is not None else get_backend("mock")
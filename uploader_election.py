@@ -0,0 +1,102 @@
+# uploader_election.py - One designated audio uploader per speaker
+# In a mesh call every client receives every speaker, so without election each
+# speaker would be uploaded and transcribed N-1 times.
+
+
+def _link_rank(room_data, sid):
+    """Sort key for a candidate's network link, best first"""
+    stats = room_data["network_stats"].get(sid)
+    if not stats:
+        # Unknown links rank after any measured one
+        return (1, 0.0, 0.0, 0.0)
+    return (
+        0,
+        float(stats.get("packet_loss", 0) or 0),
+        float(stats.get("rtt", 0) or 0),
+        -float(stats.get("bandwidth", 0) or 0)
+    )
+
+
+def _best_candidate(room_data, speaker, candidates):
+    """Prefer the speaker's own client, otherwise the best network link"""
+    if not candidates:
+        return None
+    if speaker in candidates:
+        return speaker
+    return min(candidates, key=lambda sid: (_link_rank(room_data, sid), sid))
+
+
+def register_audio_upload(room_data, speaker, uploader):
+    """
+    Record an audio chunk for a speaker and decide whether to keep it
+
+    The election is rerun whenever a new client starts sending a speaker's
+    audio, so the speaker's own client, or else a better-ranked link,
+    takes over from the current uploader.
+
+    Args:
+        room_data: Room data dictionary
+        speaker: ID of the participant whose audio this is
+        uploader: ID of the client that sent the chunk
+
+    Returns:
+        Tuple of (accepted, notices) where notices is a list of
+        (sid, payload) 'audio-uploader' messages to send
+    """
+    uploaders = room_data["audio_uploaders"]
+    entry = uploaders.get(speaker)
+    if entry is None:
+        entry = uploaders[speaker] = {"uploader": None, "candidates": set(), "stopped": set()}
+    is_new = uploader not in entry["candidates"]
+    entry["candidates"].add(uploader)
+
+    notices = []
+    current = entry["uploader"]
+
+    if current is None or is_new:
+        best = _best_candidate(room_data, speaker, entry["candidates"])
+        if current is not None and best != current:
+            notices.append((current, {"speaker": speaker, "upload": False}))
+            entry["stopped"].add(current)
+            if best != uploader:
+                # A client told to stop earlier now has the better link
+                entry["stopped"].discard(best)
+                notices.append((best, {"speaker": speaker, "upload": True}))
+        entry["uploader"] = current = best
+
+    if uploader == current:
+        entry["stopped"].discard(uploader)
+        return True, notices
+
+    if uploader not in entry["stopped"]:
+        entry["stopped"].add(uploader)
+        notices.append((uploader, {"speaker": speaker, "upload": False}))
+    return False, notices
+
+
+def release_audio_uploader(room_data, sid):
+    """
+    Remove a departing participant and fail over any speakers it uploaded
+
+    Args:
+        room_data: Room data dictionary
+        sid: ID of the participant that left
+
+    Returns:
+        List of (sid, payload) 'audio-uploader' messages to send
+    """
+    uploaders = room_data["audio_uploaders"]
+    uploaders.pop(sid, None)
+
+    notices = []
+    for speaker, entry in uploaders.items():
+        entry["candidates"].discard(sid)
+        entry["stopped"].discard(sid)
+        if entry["uploader"] != sid:
+            continue
+        entry["uploader"] = _best_candidate(room_data, speaker, entry["candidates"])
+        if entry["uploader"] is not None:
+            entry["stopped"].discard(entry["uploader"])
+            notices.append((entry["uploader"], {"speaker": speaker, "upload": True}))
+    return notices
+
@@ -0,0 +1,201 @@
+# voice_activity.py - Energy/zero-crossing voice activity detection and pause endpointing
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Audio format produced by static/main.js: mono 16-bit PCM, downsampled 4x from 48 kHz
+SAMPLE_RATE = int(os.environ.get("VAD_SAMPLE_RATE", 12000))
+FRAME_MS = 30
+
+# Detection thresholds (int16 RMS scale; the browser skips buffers below ~330)
+ENERGY_THRESHOLD = float(os.environ.get("VAD_ENERGY_THRESHOLD", 400))
+ZCR_THRESHOLD = 0.25  # fraction of sign changes per sample for unvoiced speech (s, f, sh)
+
+# Endpointing
+HANGOVER_MS = 300         # keep this much audio after the last speech frame
+MIN_SPEECH_MS = 200       # segments with less detected speech are dropped as clicks/noise
+MAX_SEGMENT_SECONDS = float(os.environ.get("VAD_MAX_SEGMENT_SECONDS", 8))  # latency cap
+
+# A completed speech segment: per-speaker sequence number, PCM bytes, wall-clock
+# open time and position in the speaker's stream (samples since the first push)
+SpeechSegment = namedtuple("SpeechSegment", ["index", "audio", "started_at", "offset"])
+
+
+def frame_features(frames):
+    """
+    Compute per-frame RMS energy and zero-crossing rate
+
+    Args:
+        frames: int16 array of shape (n_frames, frame_len)
+
+    Returns:
+        Tuple of (rms, zcr) float arrays of length n_frames
+    """
+    x = frames.astype(np.float32)
+    rms = np.sqrt(np.mean(x * x, axis=1))
+    signs = np.signbit(frames)
+    crossings = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+    zcr = crossings / max(1, frames.shape[1] - 1)
+    return rms, zcr
+
+
+def classify_frames(frames, energy_threshold=ENERGY_THRESHOLD, zcr_threshold=ZCR_THRESHOLD):
+    """
+    Classify frames as speech or silence
+
+    Voiced speech is caught by energy alone; quieter unvoiced consonants are
+    caught by a lower energy bar combined with a high zero-crossing rate.
+
+    Returns:
+        Boolean array, True for speech frames
+    """
+    rms, zcr = frame_features(frames)
+    voiced = rms >= energy_threshold
+    unvoiced = (rms >= energy_threshold * 0.5) & (zcr >= zcr_threshold)
+    return voiced | unvoiced
+
+
+class SpeechSegmenter:
+    """
+    Streaming VAD for a single speaker.
+
+    Raw PCM is pushed in arbitrary sized chunks; silent frames are dropped and
+    completed speech segments are returned when a pause longer than the
+    hangover is seen, or when a segment reaches the max-latency cap.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS,
+                 energy_threshold=ENERGY_THRESHOLD, zcr_threshold=ZCR_THRESHOLD,
+                 hangover_ms=HANGOVER_MS, min_speech_ms=MIN_SPEECH_MS,
+                 max_segment_seconds=MAX_SEGMENT_SECONDS):
+        self.sample_rate = sample_rate
+        self.frame_len = max(1, int(sample_rate * frame_ms / 1000))
+        self.energy_threshold = energy_threshold
+        self.zcr_threshold = zcr_threshold
+        self.hangover_frames = int(hangover_ms / frame_ms)
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.max_segment_frames = max(1, int(max_segment_seconds * 1000 / frame_ms))
+
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._segment = []          # list of int16 frame blocks
+        self._segment_frames = 0
+        self._speech_frames = 0
+        self._since_speech = self.hangover_frames + 1
+        self.segment_started_at = None
+        self.segments_opened = 0
+        self._segment_start_frame = 0
+        self._frames_total = 0
+
+        # Counters for stats reporting
+        self.frames_seen = 0
+        self.frames_dropped = 0
+
+    @property
+    def has_pending(self):
+        """Whether a speech segment is currently open"""
+        return self._segment_frames > 0
+
+    @property
+    def pending_seconds(self):
+        """Duration of audio held in the open segment"""
+        return self._segment_frames * self.frame_len / self.sample_rate
+
+    def pending_audio(self):
+        """PCM bytes of the open segment so far, for interim decoding"""
+        if not self._segment_frames:
+            return b""
+        return np.concatenate(self._segment).tobytes()
+
+    def push(self, pcm_bytes):
+        """
+        Feed raw PCM bytes and collect any completed speech segments
+
+        Args:
+            pcm_bytes: Little-endian 16-bit mono PCM
+
+        Returns:
+            List of SpeechSegment tuples, one per completed segment
+        """
+        usable = len(pcm_bytes) - (len(pcm_bytes) % 2)
+        samples = np.frombuffer(pcm_bytes[:usable], dtype="<i2")
+        if self._remainder.size:
+            samples = np.concatenate((self._remainder, samples))
+
+        n_frames = samples.size // self.frame_len
+        self._remainder = samples[n_frames * self.frame_len:].copy()
+        if n_frames == 0:
+            return []
+
+        frames = samples[:n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+        speech = classify_frames(frames, self.energy_threshold, self.zcr_threshold)
+        active = self._apply_hangover(speech)
+        self.frames_seen += n_frames
+
+        # Walk runs of active/inactive frames; there are only a handful per chunk
+        completed = []
+        boundaries = np.flatnonzero(np.diff(active.astype(np.int8))) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [n_frames]))
+        for start, end in zip(starts, ends):
+            if active[start]:
+                completed.extend(self._append(frames[start:end], speech[start:end],
+                                              self._frames_total + int(start)))
+            else:
+                self.frames_dropped += end - start
+                segment = self.flush()
+                if segment:
+                    completed.append(segment)
+        self._frames_total += n_frames
+        return completed
+
+    def flush(self):
+        """
+        Close the open segment
+
+        Returns:
+            SpeechSegment, or None if the segment held too little speech
+        """
+        if not self._segment_frames:
+            return None
+        segment = None
+        if self._speech_frames >= self.min_speech_frames:
+            audio = np.concatenate(self._segment).tobytes()
+            segment = SpeechSegment(self.segments_opened, audio, self.segment_started_at,
+                                    self._segment_start_frame * self.frame_len)
+        else:
+            self.frames_dropped += self._segment_frames
+        self._segment = []
+        self._segment_frames = 0
+        self._speech_frames = 0
+        self.segment_started_at = None
+        return segment
+
+    def _apply_hangover(self, speech):
+        """Extend speech decisions forward by the hangover, carrying state across chunks"""
+        idx = np.arange(speech.size)
+        previous_last = -1 - self._since_speech
+        last_speech = np.maximum.accumulate(np.where(speech, idx, previous_last))
+        self._since_speech = int(speech.size - 1 - last_speech[-1])
+        return (idx - last_speech) <= self.hangover_frames
+
+    def _append(self, frames, speech, first_frame):
+        """Add active frames to the open segment, cutting at the max-latency cap"""
+        completed = []
+        offset = 0
+        while offset < len(frames):
+            if not self._segment_frames:
+                self.segment_started_at = time.time()
+                self.segments_opened += 1
+                self._segment_start_frame = first_frame + offset
+            take = min(len(frames) - offset, self.max_segment_frames - self._segment_frames)
+            self._segment.append(frames[offset:offset + take].ravel())
+            self._segment_frames += take
+            self._speech_frames += int(np.count_nonzero(speech[offset:offset + take]))
+            offset += take
+            if self._segment_frames >= self.max_segment_frames:
+                segment = self.flush()
+                if segment:
+                    completed.append(segment)
+        return completed